@@ -6,23 +6,49 @@ then makes batch API calls only for missing data.
 
 import logging
 import time
+import numpy as np
 import pandas as pd
 import streamlit as st
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 
 from analysis.technical import calculate_all_indicators, generate_technical_signals
 from analysis.fundamental import analyze_fundamentals
-from analysis.scanner import OptimizedStockAnalyzer
 from data.db_integration import (
     get_all_cached_stocks, get_all_fundamentals,
-    get_cached_stock_data, cache_stock_data
+    get_cached_stock_data_bulk, cache_stock_data, get_recached_tickers
 )
 from data.stock_data import StockDataFetcher
 
 logger = logging.getLogger(__name__)
 
+# ticker -> (bar key, technical signals) from earlier bulk scans, so stocks
+# whose price data has not advanced since are not recomputed
+_SIGNALS_CACHE: Dict[str, Tuple[Tuple, Dict]] = {}
+# Start of the last scan that cleared _SIGNALS_CACHE of re-cached tickers
+_SIGNALS_CACHE_EPOCH = 0.0
+
+
+def _forget_recached_signals():
+    """
+    Drop the cached signals of tickers whose prices were re-cached since
+    the last scan: new prices can revise bars without moving the bar key
+    """
+    global _SIGNALS_CACHE_EPOCH
+    now = time.time()
+    if _SIGNALS_CACHE:
+        for ticker in get_recached_tickers(_SIGNALS_CACHE_EPOCH):
+            _SIGNALS_CACHE.pop(ticker, None)
+    _SIGNALS_CACHE_EPOCH = now
+
+
+def _technical_signals(stock_data: pd.DataFrame) -> Optional[Dict]:
+    """Process pool task: a stock's technical signals, None if they cannot be computed"""
+    try:
+        return generate_technical_signals(calculate_all_indicators(stock_data))
+    except Exception:
+        return None
+
 
 class PerformanceMonitor:
     """Track and log performance metrics"""
@@ -83,16 +109,14 @@ class BulkDatabaseLoader:
         all_cached_stocks = get_all_cached_stocks()
         logger.info(f"Found {len(all_cached_stocks)} stocks in cache")
 
-        # Step 2: Get all fundamentals in one query
+        # Step 2: Get the fundamentals in one query, only for the requested
+        # tickers when there are any
         logger.info("Loading all fundamentals...")
-        all_fundamentals = get_all_fundamentals()
+        all_fundamentals = get_all_fundamentals(target_tickers or None)
 
         # FIXED: Properly map fundamentals by ticker
-        self.fundamentals_by_ticker = {}
-        for f in all_fundamentals:
-            ticker = f.get('ticker')
-            if ticker:
-                self.fundamentals_by_ticker[ticker] = f
+        self.fundamentals_by_ticker = {
+            f['ticker']: f for f in all_fundamentals if f.get('ticker')}
 
         logger.info(f"Loaded {len(all_fundamentals)} fundamental records")
         logger.info(
@@ -128,13 +152,11 @@ class BulkDatabaseLoader:
         logger.info("Bulk loading stock data...")
         loaded_count = 0
 
+        # One bulk query instead of one per ticker; alphavantage first then yahoo
+        loaded = get_cached_stock_data_bulk(
+            available_tickers, '1d', '1y', ('alphavantage', 'yahoo'))
         for ticker in available_tickers:
-            # Try to get cached data (prioritize recent data)
-            stock_data = get_cached_stock_data(
-                ticker, '1d', '1y', 'alphavantage')
-            if stock_data is None or stock_data.empty:
-                stock_data = get_cached_stock_data(ticker, '1d', '1y', 'yahoo')
-
+            stock_data = loaded.get(ticker)
             if stock_data is not None and not stock_data.empty:
                 self.stock_data_by_ticker[ticker] = stock_data
                 loaded_count += 1
@@ -188,18 +210,28 @@ class OptimizedBulkScanner:
         self.db_loader = BulkDatabaseLoader()
         self.api_fetcher = BulkAPIFetcher(max_api_workers)
 
+    # Per-stock analysis calls the APIs (company names, missing P/E), so it
+    # runs on a few threads; kept low to respect API rate limits
+    ANALYSIS_WORKERS = 4
+
     def _get_company_name(self, ticker):
         """Get company name from API with session caching"""
+        # Initialize cache if needed
+        if 'company_names_cache' not in st.session_state:
+            st.session_state.company_names_cache = {}
+
+        # Return cached name if available
+        if ticker in st.session_state.company_names_cache:
+            return st.session_state.company_names_cache[ticker]
+
+        company_name = self._fetch_company_name(ticker)
+        st.session_state.company_names_cache[ticker] = company_name
+        return company_name
+
+    @staticmethod
+    def _fetch_company_name(ticker):
+        """Fetch a company name from the API, falling back to the ticker"""
         try:
-            # Initialize cache if needed
-            if 'company_names_cache' not in st.session_state:
-                st.session_state.company_names_cache = {}
-            
-            # Return cached name if available
-            if ticker in st.session_state.company_names_cache:
-                return st.session_state.company_names_cache[ticker]
-            
-            # Fetch from API
             import yfinance as yf
             ticker_obj = yf.Ticker(ticker)
             info = ticker_obj.info
@@ -208,16 +240,11 @@ class OptimizedBulkScanner:
                            info.get('companyName'))
             
             if company_name and company_name != ticker:
-                # Cache and return the result
-                st.session_state.company_names_cache[ticker] = company_name
                 return company_name
-            else:
-                st.session_state.company_names_cache[ticker] = ticker
-                return ticker
+            return ticker
                 
         except Exception as e:
             logger.warning(f"Could not fetch company name for {ticker}: {e}")
-            st.session_state.company_names_cache[ticker] = ticker
             return ticker
 
     def scan_stocks_optimized(self, target_tickers: List[str] = None,
@@ -232,6 +259,8 @@ class OptimizedBulkScanner:
             if progress_callback:
                 progress_callback(0.05, "🗃️ Loading all database data...")
 
+            _forget_recached_signals()
+
             load_stats = self.db_loader.bulk_load_all_data(target_tickers)
             loaded_tickers = load_stats['loaded_tickers']
             missing_tickers = load_stats['missing_tickers']
@@ -275,6 +304,9 @@ class OptimizedBulkScanner:
                         batch_data = self.api_fetcher.batch_fetch_missing_data(
                             batch)
                         all_stock_data.update(batch_data)
+                        # Fetched during this scan, so not yet cleared
+                        for ticker in batch_data:
+                            _SIGNALS_CACHE.pop(ticker, None)
                         # Small delay between batches
                         time.sleep(0.5)
                     except Exception as e:
@@ -318,155 +350,228 @@ class OptimizedBulkScanner:
             return results
 
         # Initialize a fresh data fetcher for P/E data
-        from data.stock_data import StockDataFetcher
         fresh_fetcher = StockDataFetcher()
 
-        # Use smaller batches for better error handling
-        batch_size = 10  # Smaller batches for stability
-        batches = [tickers[i:i + batch_size]
-                for i in range(0, len(tickers), batch_size)]
-
-        processed_count = 0
-
-        for batch_idx, batch in enumerate(batches):
-            if progress_callback:
-                base_progress = 0.75
-                batch_progress = (processed_count / len(tickers)) * 0.24
-                progress_callback(base_progress + batch_progress,
-                                f"⚡ Processing batch {batch_idx + 1}/{len(batches)}")
-
-            # Process each stock in the batch
-            for ticker in batch:
-                try:
-                    # Get stock data
-                    stock_data = all_stock_data.get(ticker)
-
-                    if stock_data is None or stock_data.empty:
-                        # Include stocks with missing price data
-                        results.append({
-                            'ticker': ticker,
-                            'name': self._get_company_name(ticker),
-                            'last_price': 0,
-                            'tech_score': 0,
-                            'above_ma40': False,
-                            'above_ma4': False,
-                            'rsi_above_50': False,
-                            'near_52w_high': False,
-                            'is_profitable': False,
-                            'reasonable_pe': False,
-                            'fundamental_pass': False,
-                            'value_momentum_signal': "HOLD",
-                            'data_source': "none",
-                            'data_status': "missing",
-                            'pe_ratio': None,
-                            'profit_margin': None,
-                            'revenue_growth': None,
-                            'warning': "No price data available"
-                        })
-                        continue
-
-                    # Calculate technical indicators
-                    indicators = calculate_all_indicators(stock_data)
-                    signals = generate_technical_signals(indicators)
-
-                    # FIXED: Get fundamentals with proper P/E fetching
-                    fundamentals = self._get_fundamentals_with_pe(
-                        ticker, fresh_fetcher)
-
-                    # Calculate fundamental analysis
-                    fundamental_analysis = analyze_fundamentals(fundamentals or {})
-
-                    # Get current price
-                    current_price = stock_data['close'].iloc[-1]
-
-                    # Calculate tech score using the strategy's weighted method
-                    if not hasattr(self, '_strategy'):
-                        from analysis.strategy import ValueMomentumStrategy
-                        self._strategy = ValueMomentumStrategy()
-
-                    tech_score = self._strategy.calculate_tech_score(signals)
-                    signals['tech_score'] = tech_score  # Update signals with calculated score
-
-                    # Check fundamental pass
-                    fundamental_pass = fundamental_analysis['overall'].get(
-                        'value_momentum_pass', False)
-
-                    # Generate Value & Momentum signal (using strategy's logic)
-                    if tech_score >= 70 and fundamental_pass:
-                        value_momentum_signal = "BUY"
-                    elif tech_score < 40 or not signals.get('above_ma40', False):
-                        value_momentum_signal = "SELL"
-                    else:
-                        value_momentum_signal = "HOLD"
-
-                    # Determine data status
-                    has_pe = fundamentals and fundamentals.get(
-                        'pe_ratio') is not None
-                    data_status = "complete" if has_pe else "partial"
-                    data_source = "database+api" if has_pe else "database"
-
-                    # Create comprehensive result
-                    result = {
-                        'ticker': ticker,
-                        'name': self._get_company_name(ticker),
-                        'last_price': current_price,
-                        'pe_ratio': fundamentals.get('pe_ratio') if fundamentals else None,
-                        'profit_margin': fundamentals.get('profit_margin') if fundamentals else None,
-                        'revenue_growth': fundamentals.get('revenue_growth') if fundamentals else None,
-                        'tech_score': tech_score,
-                        'above_ma40': signals.get('above_ma40', False),
-                        'above_ma4': signals.get('above_ma4', False),
-                        'rsi_above_50': signals.get('rsi_above_50', False),
-                        'near_52w_high': signals.get('near_52w_high', False),
-                        'is_profitable': fundamental_analysis['overall'].get('is_profitable', False),
-                        'reasonable_pe': fundamental_analysis['overall'].get('reasonable_pe', True),
-                        'fundamental_pass': fundamental_pass,
-                        'value_momentum_signal': value_momentum_signal,
-                        'data_source': data_source,
-                        'data_status': data_status
-                    }
-
-                    results.append(result)
-
-                    # Log P/E success for debugging
-                    if fundamentals and fundamentals.get('pe_ratio'):
-                        logger.info(
-                            f"✅ P/E for {ticker}: {fundamentals.get('pe_ratio')}")
-                    else:
-                        logger.warning(f"❌ No P/E for {ticker}")
-
-                except Exception as e:
-                    logger.error(f"⚠️ Analysis failed for {ticker}: {e}")
-                    # Include error result instead of skipping
-                    results.append({
-                        'ticker': ticker,
-                        'name': self._get_company_name(ticker),
-                        'last_price': 0,
-                        'tech_score': 0,
-                        'value_momentum_signal': "HOLD",
-                        'above_ma40': False,
-                        'above_ma4': False,
-                        'data_source': "error",
-                        'data_status': "error",
-                        'pe_ratio': None,
-                        'profit_margin': None,
-                        'revenue_growth': None,
-                        'error': str(e)
-                    })
-
-                processed_count += 1
-
-        # Sort by tech score
-        results.sort(key=lambda x: x.get('tech_score', 0), reverse=True)
+        # Created up front so the worker threads share one instance
+        if not hasattr(self, '_strategy'):
+            from analysis.strategy import ValueMomentumStrategy
+            self._strategy = ValueMomentumStrategy()
+
+        # Worker threads have no Streamlit session, so they read a snapshot of
+        # the company name cache and new names are stored back afterwards
+        if 'company_names_cache' not in st.session_state:
+            st.session_state.company_names_cache = {}
+        company_names = dict(st.session_state.company_names_cache)
+
+        # The indicator math is CPU-bound, so it is done for all stocks up
+        # front; the threads below then only wait on the APIs
+        precomputed = self._precompute_signals(all_stock_data, tickers)
+
+        def _evaluate(ticker):
+            return self._evaluate_ticker(
+                ticker, all_stock_data.get(ticker), fresh_fetcher, company_names,
+                precomputed.get(ticker))
+
+        # Progress is reported every progress_every stocks from the
+        # completion count; no batch split is needed for that
+        progress_every = 10
+
+        # Columns used for ranking and statistics, filled as results arrive
+        # so the result dicts are not scanned again afterwards
+        tech_scores = np.zeros(len(tickers))
+        has_pe = np.zeros(len(tickers), dtype=bool)
+
+        with ThreadPoolExecutor(max_workers=self.ANALYSIS_WORKERS) as executor:
+            for processed_count, result in enumerate(executor.map(_evaluate, tickers)):
+                if progress_callback and processed_count % progress_every == 0:
+                    progress_callback(0.75 + (processed_count / len(tickers)) * 0.24,
+                                      f"⚡ Processed {processed_count}/{len(tickers)} stocks")
+                results.append(result)
+                tech_scores[processed_count] = result.get('tech_score', 0)
+                has_pe[processed_count] = result.get('pe_ratio') is not None
+
+        st.session_state.company_names_cache.update(zip(tickers, (r['name'] for r in results)))
+
+        # Sort by tech score, descending; ties keep their input order
+        order = np.argsort(-tech_scores, kind='stable')
+        results = [results[i] for i in order]
 
         # Log P/E statistics for debugging
-        pe_count = sum(1 for r in results if r.get('pe_ratio') is not None)
+        pe_count = int(has_pe.sum())
         logger.info(
             f"📊 P/E STATISTICS: {pe_count}/{len(results)} stocks have P/E data ({pe_count/len(results)*100:.1f}%)")
 
         return results
 
 
+    def _precompute_signals(self, all_stock_data, tickers) -> Dict[str, Dict]:
+        """
+        Technical signals of the tickers with price data
+
+        With Numba, all stocks are stacked into one price panel and the
+        signals and tech score the evaluation reads come from a single
+        compiled pass (see analysis.indicator_kernels). Otherwise large scans
+        compute them on the scanner's warm process pool, and scans smaller
+        than its threshold leave the signals to _evaluate_ticker. Either way
+        stocks whose last bar is unchanged since an earlier scan reuse that
+        scan's signals.
+        """
+        from analysis.indicator_kernels import compute_signals_for_frames
+        from analysis.scanner import PROCESS_POOL_MIN_TICKERS, _bar_key, _get_process_pool
+        from utils.numba_compat import NUMBA_AVAILABLE
+
+        precomputed = {}
+        pending = []
+        for ticker in tickers:
+            stock_data = all_stock_data.get(ticker)
+            if stock_data is None or stock_data.empty:
+                continue
+            key = _bar_key(stock_data)
+            cached_key, cached_signals = _SIGNALS_CACHE.get(ticker, (None, None))
+            if cached_key == key:
+                precomputed[ticker] = cached_signals
+            else:
+                pending.append((ticker, key))
+
+        if NUMBA_AVAILABLE:
+            signals = compute_signals_for_frames([all_stock_data[t] for t, _ in pending])
+        elif len(pending) >= PROCESS_POOL_MIN_TICKERS:
+            executor = _get_process_pool(self.ANALYSIS_WORKERS)
+            chunksize = max(1, len(pending) // (4 * self.ANALYSIS_WORKERS))
+            signals = executor.map(
+                _technical_signals, (all_stock_data[t] for t, _ in pending), chunksize=chunksize)
+        else:
+            signals = ()
+
+        for (ticker, key), ticker_signals in zip(pending, signals):
+            if ticker_signals is not None:
+                precomputed[ticker] = ticker_signals
+                _SIGNALS_CACHE[ticker] = (key, ticker_signals)
+        return precomputed
+
+    def _evaluate_ticker(self, ticker, stock_data, fresh_fetcher, company_names, signals=None):
+        """
+        Analyze one stock for _analyze_all_stocks; runs on a worker thread
+
+        signals are the stock's precomputed technical signals, if any.
+        """
+        company_name = company_names.get(ticker)
+        if company_name is None:
+            company_name = self._fetch_company_name(ticker)
+
+        try:
+            if stock_data is None or stock_data.empty:
+                # Include stocks with missing price data
+                return {
+                    'ticker': ticker,
+                    'name': company_name,
+                    'last_price': 0,
+                    'tech_score': 0,
+                    'above_ma40': False,
+                    'above_ma4': False,
+                    'rsi_above_50': False,
+                    'near_52w_high': False,
+                    'is_profitable': False,
+                    'reasonable_pe': False,
+                    'fundamental_pass': False,
+                    'value_momentum_signal': "HOLD",
+                    'data_source': "none",
+                    'data_status': "missing",
+                    'pe_ratio': None,
+                    'profit_margin': None,
+                    'revenue_growth': None,
+                    'warning': "No price data available"
+                }
+
+            # Calculate technical indicators
+            if signals is None:
+                indicators = calculate_all_indicators(stock_data)
+                signals = generate_technical_signals(indicators)
+
+            # FIXED: Get fundamentals with proper P/E fetching
+            fundamentals = self._get_fundamentals_with_pe(
+                ticker, fresh_fetcher) or {}
+            pe_ratio = fundamentals.get('pe_ratio')
+
+            # Calculate fundamental analysis
+            fundamental_analysis = analyze_fundamentals(fundamentals)
+            overall = fundamental_analysis.get('overall', {})
+
+            # Get current price
+            current_price = stock_data['close'].to_numpy()[-1]
+
+            # Calculate tech score using the strategy's weighted method
+            tech_score = self._strategy.calculate_tech_score(signals)
+            # Copied: precomputed signals are shared through _SIGNALS_CACHE
+            # with the other worker threads and later scans
+            signals = {**signals, 'tech_score': tech_score}
+
+            # Check fundamental pass
+            fundamental_pass = overall.get('value_momentum_pass', False)
+
+            # Generate Value & Momentum signal (using strategy's logic)
+            if tech_score >= 70 and fundamental_pass:
+                value_momentum_signal = "BUY"
+            elif tech_score < 40 or not signals.get('above_ma40', False):
+                value_momentum_signal = "SELL"
+            else:
+                value_momentum_signal = "HOLD"
+
+            # Determine data status
+            has_pe = pe_ratio is not None
+            data_status = "complete" if has_pe else "partial"
+            data_source = "database+api" if has_pe else "database"
+
+            # Create comprehensive result
+            result = {
+                'ticker': ticker,
+                'name': company_name,
+                'last_price': current_price,
+                'pe_ratio': pe_ratio,
+                'profit_margin': fundamentals.get('profit_margin'),
+                'revenue_growth': fundamentals.get('revenue_growth'),
+                'tech_score': tech_score,
+                'above_ma40': signals.get('above_ma40', False),
+                'above_ma4': signals.get('above_ma4', False),
+                'rsi_above_50': signals.get('rsi_above_50', False),
+                'near_52w_high': signals.get('near_52w_high', False),
+                'is_profitable': overall.get('is_profitable', False),
+                'reasonable_pe': overall.get('reasonable_pe', True),
+                'fundamental_pass': fundamental_pass,
+                'value_momentum_signal': value_momentum_signal,
+                'data_source': data_source,
+                'data_status': data_status
+            }
+
+            # Log P/E success for debugging
+            if pe_ratio:
+                logger.info(
+                    f"✅ P/E for {ticker}: {pe_ratio}")
+            else:
+                logger.warning(f"❌ No P/E for {ticker}")
+
+            return result
+
+        except Exception as e:
+            logger.error(f"⚠️ Analysis failed for {ticker}: {e}")
+            # Include error result instead of skipping
+            return {
+                'ticker': ticker,
+                'name': company_name,
+                'last_price': 0,
+                'tech_score': 0,
+                'value_momentum_signal': "HOLD",
+                'above_ma40': False,
+                'above_ma4': False,
+                'data_source': "error",
+                'data_status': "error",
+                'pe_ratio': None,
+                'profit_margin': None,
+                'revenue_growth': None,
+                'error': str(e)
+            }
+
+
     def _get_fundamentals_with_pe(self, ticker, fresh_fetcher):
         """FIXED: Get fundamentals with guaranteed P/E data fetching"""
         # First try cached data
@@ -520,56 +625,54 @@ class BulkAPIFetcher:
 
         total_processed = 0
 
-        for batch_idx, batch in enumerate(batches):
-            if progress_callback:
-                progress = total_processed / len(missing_tickers)
-                progress_callback(progress, f"⚡ API batch {batch_idx + 1}/{len(batches)}")
+        # One pool for the whole fetch, reused by every batch
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for batch_idx, batch in enumerate(batches):
+                if progress_callback:
+                    progress = total_processed / len(missing_tickers)
+                    progress_callback(progress, f"⚡ API batch {batch_idx + 1}/{len(batches)}")
 
-            # Process batch with more workers
-            batch_results = self._fetch_batch_parallel_fast(batch)
-            fetched_data.update(batch_results)
-            total_processed += len(batch)
+                # Process batch with more workers
+                batch_results = self._fetch_batch_parallel_fast(batch, executor)
+                fetched_data.update(batch_results)
+                total_processed += len(batch)
 
-            # SPEED OPTIMIZED: Minimal delay between batches
-            if batch_idx < len(batches) - 1:
-                time.sleep(0.1)  # Reduced from 1s to 0.1s
+                # SPEED OPTIMIZED: Minimal delay between batches
+                if batch_idx < len(batches) - 1:
+                    time.sleep(0.1)  # Reduced from 1s to 0.1s
 
         logger.info(f"⚡ API fetch complete: {len(fetched_data)}/{len(missing_tickers)} successful")
         return fetched_data
 
-    def _fetch_batch_parallel_fast(self, batch_tickers: List[str]) -> Dict[str, pd.DataFrame]:
-        """SPEED OPTIMIZED parallel fetching with timeout"""
+    def _fetch_batch_parallel_fast(self, batch_tickers: List[str],
+                                   executor: ThreadPoolExecutor) -> Dict[str, pd.DataFrame]:
+        """SPEED OPTIMIZED parallel fetching with timeout on a shared executor"""
         results = {}
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all fetch jobs with timeout
-            future_to_ticker = {
-                executor.submit(self._fetch_single_stock_fast, ticker): ticker
-                for ticker in batch_tickers
-            }
+        # map() keeps input order, so results pair up with their tickers;
+        # _fetch_single_stock_fast returns None instead of raising
+        fetched = executor.map(self._fetch_single_stock_fast, batch_tickers,
+                               timeout=30)  # 30s batch timeout
 
-            # Collect results with timeout
-            for future in as_completed(future_to_ticker, timeout=30):  # 30s batch timeout
-                ticker = future_to_ticker[future]
+        for ticker, stock_data in zip(batch_tickers, fetched):
+            if stock_data is not None and not stock_data.empty:
+                results[ticker] = stock_data
+                # Cache immediately
                 try:
-                    stock_data = future.result(timeout=5)  # 5s per stock timeout
-                    if stock_data is not None and not stock_data.empty:
-                        results[ticker] = stock_data
-                        # Cache immediately
-                        try:
-                            cache_stock_data(ticker, '1d', '1y', stock_data, 'yahoo')
-                        except:
-                            pass  # Don't let caching failures slow us down
-                except Exception as e:
-                    logger.debug(f"⚡ Skipped {ticker}: {e}")
+                    cache_stock_data(ticker, '1d', '1y', stock_data, 'yahoo')
+                except:
+                    pass  # Don't let caching failures slow us down
 
         return results
 
     def _fetch_single_stock_fast(self, ticker: str) -> Optional[pd.DataFrame]:
         """SPEED OPTIMIZED single stock fetch with minimal delay"""
         try:
-            # SPEED OPTIMIZED: No delay between individual requests
-            return self.data_fetcher.get_stock_data(ticker, '1d', '1y', attempt_fallback=True)
+            # SPEED OPTIMIZED: No delay between individual requests. The
+            # bulk database load already missed this ticker, so go straight
+            # to the APIs
+            return self.data_fetcher.get_stock_data(
+                ticker, '1d', '1y', attempt_fallback=True, check_cache=False)
         except Exception as e:
             logger.debug(f"⚡ Failed {ticker}: {e}")
             return None
@@ -686,7 +789,9 @@ class BulkAPIFetcher:
         
         for ticker in batch_tickers:
             try:
-                stock_data = self.data_fetcher.get_stock_data(ticker, '1d', '1y', attempt_fallback=True)
+                # Not in the cache (the bulk load missed it), so skip the lookup
+                stock_data = self.data_fetcher.get_stock_data(
+                    ticker, '1d', '1y', attempt_fallback=True, check_cache=False)
                 if stock_data is not None and not stock_data.empty:
                     results[ticker] = stock_data
                     # Cache immediately
@@ -0,0 +1,275 @@
+# analysis/criteria.py
+"""
+Custom scanner criteria (the "Custom Criteria" mode of the scanner UI).
+
+Criteria are applied to all scanned stocks at once: fundamental criteria
+are vectorized comparisons over one column of the scan results, and the
+technical ones a single bit test over each stock's packed signal flags.
+"""
+
+import operator
+from functools import reduce
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import DEFAULT_LONG_WINDOW, DEFAULT_MEDIUM_WINDOW, DEFAULT_SHORT_WINDOW
+from utils.numba_compat import NUMBA_AVAILABLE, njit
+
+# SMA periods offered by the scanner and the signal comparing price with it
+SMA_SIGNALS = {
+    DEFAULT_SHORT_WINDOW: 'price_above_sma_short',
+    DEFAULT_MEDIUM_WINDOW: 'price_above_sma_medium',
+    DEFAULT_LONG_WINDOW: 'price_above_sma_long',
+}
+
+# Criteria that hold when a technical signal is True
+FLAG_CRITERIA = {
+    'rsi_overbought': 'rsi_overbought',
+    'rsi_oversold': 'rsi_oversold',
+    'macd_bullish': 'macd_bullish_cross',
+    'macd_bearish': 'macd_bearish_cross',
+    'price_near_52w_high': 'near_52w_high',
+    'price_near_52w_low': 'near_52w_low',
+}
+
+# Criteria comparing a fundamental with the criterion's value
+NUMERIC_CRITERIA = {
+    'pe_below': ('pe_ratio', operator.lt),
+    'pe_above': ('pe_ratio', operator.gt),
+    'profit_margin_above': ('profit_margin', operator.gt),
+    'revenue_growth_above': ('revenue_growth', operator.gt),
+}
+
+# Operations of the compiled numeric criteria kernel
+OP_LT, OP_GT = range(2)
+_NUMERIC_OPS = {operator.lt: OP_LT, operator.gt: OP_GT}
+
+# Technical signals used by the criteria; the Value & Momentum kernel does
+# not compute all of them, so scans using these need the extra signals
+CRITERIA_SIGNALS = tuple(SMA_SIGNALS.values()) + tuple(FLAG_CRITERIA.values())
+
+# Bit of each signal in the flags packed by pack_signal_flags
+SIGNAL_BITS = {name: bit for bit, name in enumerate(dict.fromkeys(CRITERIA_SIGNALS))}
+
+
+def custom_criteria(criteria: Mapping) -> Dict:
+    """The criteria this module applies; anything else (e.g. strategy) is dropped"""
+    if not criteria:
+        return {}
+    return {name: value for name, value in criteria.items()
+            if name in FLAG_CRITERIA or name in NUMERIC_CRITERIA
+            or name in ('price_above_sma', 'price_below_sma')}
+
+
+def _fundamental_check(column: str, compare: Callable, threshold) -> Callable[[Mapping], bool]:
+    threshold = float(threshold)
+
+    def check(fundamentals: Mapping) -> bool:
+        actual = fundamentals.get(column) if fundamentals else None
+        return actual is not None and compare(float(actual), threshold)
+    return check
+
+
+def compile_fundamental_criteria(criteria: Mapping) -> List[Callable[[Mapping], bool]]:
+    """
+    The criteria that only compare fundamentals, as one check per criterion
+
+    The checks take a stock's fundamentals dict and can run before any
+    signals are computed. Same semantics as criteria_mask: a missing value
+    fails the criterion.
+    """
+    return [_fundamental_check(*NUMERIC_CRITERIA[name], value)
+            for name, value in custom_criteria(criteria).items() if name in NUMERIC_CRITERIA]
+
+
+def has_fundamental_criteria(criteria: Mapping) -> bool:
+    """True if any criterion only compares fundamentals"""
+    return any(name in NUMERIC_CRITERIA for name in custom_criteria(criteria))
+
+
+def fundamental_mask(fundamentals: pd.DataFrame, criteria: Mapping) -> np.ndarray:
+    """
+    Evaluate the fundamental criteria over a frame of fundamentals
+
+    Args:
+        fundamentals: one row per stock, e.g. BatchDataLoader.get_fundamentals_frame
+        criteria: criteria dict from the scanner UI
+
+    Returns:
+        np.ndarray: bool mask of the rows meeting every fundamental criterion;
+        missing or non-numeric values fail, as in criteria_mask
+    """
+    n = len(fundamentals)
+    mask = np.ones(n, dtype=bool)
+    for name, value in custom_criteria(criteria).items():
+        if name not in NUMERIC_CRITERIA:
+            continue
+        column, compare = NUMERIC_CRITERIA[name]
+        if column not in fundamentals.columns:
+            return np.zeros(n, dtype=bool)
+        values = pd.to_numeric(fundamentals[column], errors='coerce').to_numpy(
+            dtype=float, na_value=np.nan)
+        mask &= compare(values, float(value))
+    return mask
+
+
+def needs_full_signals(criteria: Mapping) -> bool:
+    """True if the criteria test technical signals beyond the Value & Momentum ones"""
+    return any(name not in NUMERIC_CRITERIA for name in custom_criteria(criteria))
+
+
+def criteria_columns(criteria: Mapping) -> List[str]:
+    """Result columns read by criteria_mask for these criteria"""
+    columns = []
+    for name, value in custom_criteria(criteria).items():
+        if name in NUMERIC_CRITERIA:
+            columns.append(NUMERIC_CRITERIA[name][0])
+        elif name in FLAG_CRITERIA:
+            columns.append(FLAG_CRITERIA[name])
+        elif value in SMA_SIGNALS:
+            columns.append(SMA_SIGNALS[value])
+    return list(dict.fromkeys(columns))
+
+
+def _as_float(values: Iterable, n: int) -> np.ndarray:
+    return np.fromiter((np.nan if value is None else value for value in values), dtype=float, count=n)
+
+
+def pack_signal_flags(columns: Mapping[str, list], n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pack the signal columns present into per-stock uint32 bit patterns
+
+    Returns:
+        tuple: (known, value). Bit SIGNAL_BITS[name] of known is set where
+        the signal is not None, and of value where it is True.
+    """
+    known = np.zeros(n, dtype=np.uint32)
+    value = np.zeros(n, dtype=np.uint32)
+    for name, bit in SIGNAL_BITS.items():
+        if name not in columns:
+            continue
+        flags = columns[name]
+        known |= np.fromiter((flag is not None for flag in flags), dtype=bool, count=n).astype(
+            np.uint32) << np.uint32(bit)
+        value |= np.fromiter((flag is not None and bool(flag) for flag in flags), dtype=bool,
+                             count=n).astype(np.uint32) << np.uint32(bit)
+    return known, value
+
+
+def _flag_bits(criteria: Mapping) -> Optional[Tuple[int, int]]:
+    """
+    The technical criteria as (required, forbidden) bits: required signals
+    must be True, forbidden ones known and False. None if they match nothing.
+    """
+    required = forbidden = 0
+    for name, value in custom_criteria(criteria).items():
+        if name in NUMERIC_CRITERIA:
+            continue
+        if name in FLAG_CRITERIA:
+            required |= 1 << SIGNAL_BITS[FLAG_CRITERIA[name]]
+        elif value not in SMA_SIGNALS:
+            # An SMA period without a signal matches nothing
+            return None
+        elif name == 'price_above_sma':
+            required |= 1 << SIGNAL_BITS[SMA_SIGNALS[value]]
+        else:
+            forbidden |= 1 << SIGNAL_BITS[SMA_SIGNALS[value]]
+    return required, forbidden
+
+
+def _flag_mask(columns: Mapping[str, list], n: int, criteria: Mapping) -> np.ndarray:
+    """Mask of the stocks meeting every technical criterion, from packed flags"""
+    bits = _flag_bits(criteria)
+    if bits is None:
+        return np.zeros(n, dtype=bool)
+    required, forbidden = bits
+    if not required and not forbidden:
+        return np.ones(n, dtype=bool)
+
+    known, value = pack_signal_flags(columns, n)
+    required = np.uint32(required)
+    forbidden = np.uint32(forbidden)
+    return ((value & required) == required) & ((known & forbidden) == forbidden) & (
+        (value & forbidden) == 0)
+
+
+def _encode(criteria: Mapping):
+    """Numeric criteria as (column, op code, threshold) triples for the kernel"""
+    encoded = []
+    for name, value in custom_criteria(criteria).items():
+        if name in NUMERIC_CRITERIA:
+            column, compare = NUMERIC_CRITERIA[name]
+            encoded.append((column, _NUMERIC_OPS[compare], float(value)))
+    return encoded
+
+
+@njit(cache=True)
+def _apply_criteria(values, op_codes, thresholds):
+    """
+    AND of the encoded numeric criteria for every stock
+
+    values[k] holds criterion k's column, with missing values as NaN (which
+    fail every comparison).
+    """
+    n_criteria, n = values.shape
+    out = np.ones(n, dtype=np.bool_)
+    for i in range(n):
+        for k in range(n_criteria):
+            value = values[k, i]
+            if op_codes[k] == OP_LT:
+                ok = value < thresholds[k]
+            else:
+                ok = value > thresholds[k]
+            if not ok:
+                out[i] = False
+                break
+    return out
+
+
+def _numeric_mask(columns: Mapping[str, list], n: int, criteria: Mapping) -> np.ndarray:
+    """
+    Mask of the stocks meeting every numeric criterion
+
+    With Numba the criteria are encoded once and evaluated by a compiled
+    kernel in a single pass; otherwise by one NumPy comparison each.
+    """
+    if not NUMBA_AVAILABLE:
+        masks = []
+        for name, value in custom_criteria(criteria).items():
+            if name in NUMERIC_CRITERIA:
+                column, compare = NUMERIC_CRITERIA[name]
+                masks.append(compare(_as_float(columns[column], n), float(value)))
+        return reduce(operator.and_, masks, np.ones(n, dtype=bool))
+
+    encoded = _encode(criteria)
+    if not encoded:
+        return np.ones(n, dtype=bool)
+
+    values = np.empty((len(encoded), n))
+    for k, (column, _, _) in enumerate(encoded):
+        values[k] = _as_float(columns[column], n)
+    op_codes = np.array([op for _, op, _ in encoded], dtype=np.int64)
+    thresholds = np.array([threshold for _, _, threshold in encoded], dtype=np.float64)
+    return _apply_criteria(values, op_codes, thresholds)
+
+
+def criteria_mask(columns: Mapping[str, list], n: int, criteria: Mapping) -> np.ndarray:
+    """
+    Evaluate the criteria for n stocks
+
+    Numeric criteria are compared column by column (see _numeric_mask); the
+    technical ones are tested together on the packed signal flags, as
+    (flags & required) == required for the signals that must hold.
+
+    Args:
+        columns: column name -> list of n values, for criteria_columns(criteria)
+        n: number of stocks
+        criteria: criteria dict from the scanner UI
+
+    Returns:
+        np.ndarray: bool mask of the stocks meeting every criterion. Missing
+        values (None) never meet a criterion.
+    """
+    return _numeric_mask(columns, n, criteria) & _flag_mask(columns, n, criteria)
@@ -92,7 +92,37 @@ def analyze_revenue_growth(revenue_growth):
             'description': f'Strong revenue growth ({revenue_growth:.2%})'
         }
 
-# Add this check to analyze_fundamentals function in analysis/fundamental.py
+def _as_float(value):
+    """Convert a fundamentals value to float, NaN when missing or not numeric"""
+    if value is None:
+        return float('nan')
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def _analyze_fund_numeric(pe, pm, rg):
+    """
+    Value & Momentum fundamental checks on plain floats (NaN = missing).
+
+    Plain Python on purpose: it runs once per stock, and a compiled call's
+    dispatch costs more than these four comparisons.
+
+    Every comparison against NaN is False, so a missing metric fails its
+    check exactly like a None did in the dict-based version.
+
+    Returns:
+        tuple: (is_profitable, reasonable_pe, revenue_growth_positive,
+                value_momentum_pass)
+    """
+    is_profitable = pm > 0
+    has_pe = pe > 0
+    reasonable_pe = has_pe and pe < 30  # P/E < 30 as per strategy
+    revenue_growth_positive = rg > 0
+    # Only check PE if it exists
+    value_momentum_pass = is_profitable and (reasonable_pe or not has_pe)
+    return is_profitable, reasonable_pe, revenue_growth_positive, value_momentum_pass
 
 
 def analyze_fundamentals(fundamentals):
@@ -118,25 +148,28 @@ def analyze_fundamentals(fundamentals):
 
     analysis = {}
 
+    # Look up each metric once; they are reused by every check below
+    pe_ratio = fundamentals.get('pe_ratio')
+    profit_margin = fundamentals.get('profit_margin')
+    revenue_growth = fundamentals.get('revenue_growth')
+
     # Analyze individual metrics with error handling
     try:
-        analysis['pe_ratio'] = analyze_pe_ratio(fundamentals.get('pe_ratio'))
+        analysis['pe_ratio'] = analyze_pe_ratio(pe_ratio)
     except Exception as e:
         print(f"Error analyzing PE ratio: {e}")
         analysis['pe_ratio'] = {'status': 'unknown',
                                 'description': 'Error analyzing P/E ratio'}
 
     try:
-        analysis['profit_margin'] = analyze_profit_margin(
-            fundamentals.get('profit_margin'))
+        analysis['profit_margin'] = analyze_profit_margin(profit_margin)
     except Exception as e:
         print(f"Error analyzing profit margin: {e}")
         analysis['profit_margin'] = {
             'status': 'unknown', 'description': 'Error analyzing profit margin'}
 
     try:
-        analysis['revenue_growth'] = analyze_revenue_growth(
-            fundamentals.get('revenue_growth'))
+        analysis['revenue_growth'] = analyze_revenue_growth(revenue_growth)
     except Exception as e:
         print(f"Error analyzing revenue growth: {e}")
         analysis['revenue_growth'] = {
@@ -147,28 +180,32 @@ def analyze_fundamentals(fundamentals):
     negative_factors = 0
     total_factors = 0
 
+    pe_status = analysis['pe_ratio']['status']
+    margin_status = analysis['profit_margin']['status']
+    growth_status = analysis['revenue_growth']['status']
+
     # Check P/E ratio
-    if analysis['pe_ratio']['status'] == 'undervalued':
+    if pe_status == 'undervalued':
         positive_factors += 1
-    elif analysis['pe_ratio']['status'] == 'overvalued':
+    elif pe_status == 'overvalued':
         negative_factors += 1
-    if analysis['pe_ratio']['status'] != 'unknown':
+    if pe_status != 'unknown':
         total_factors += 1
 
     # Check profit margin
-    if analysis['profit_margin']['status'] == 'good':
+    if margin_status == 'good':
         positive_factors += 1
-    elif analysis['profit_margin']['status'] in ['negative', 'low']:
+    elif margin_status in ('negative', 'low'):
         negative_factors += 1
-    if analysis['profit_margin']['status'] != 'unknown':
+    if margin_status != 'unknown':
         total_factors += 1
 
     # Check revenue growth
-    if analysis['revenue_growth']['status'] == 'growing':
+    if growth_status == 'growing':
         positive_factors += 1
-    elif analysis['revenue_growth']['status'] in ['declining', 'slow']:
+    elif growth_status in ('declining', 'slow'):
         negative_factors += 1
-    if analysis['revenue_growth']['status'] != 'unknown':
+    if growth_status != 'unknown':
         total_factors += 1
 
     # Calculate overall sentiment
@@ -188,33 +225,11 @@ def analyze_fundamentals(fundamentals):
             overall_status = 'neutral'
             overall_description = 'Mixed or neutral fundamental indicators'
 
-    # Value & Momentum Strategy Fundamental Checks
-    # 1. Profitability Check - safely handle None values
-    try:
-        profit_margin = fundamentals.get('profit_margin', 0)
-        is_profitable = profit_margin is not None and profit_margin > 0
-    except Exception:
-        is_profitable = False
-
-    # 2. Valuation Check - P/E ratio below threshold
-    try:
-        pe_ratio = fundamentals.get('pe_ratio', 0)
-        # P/E < 30 as per strategy
-        reasonable_pe = pe_ratio is not None and pe_ratio > 0 and pe_ratio < 30
-    except Exception:
-        reasonable_pe = False
-
-    # 3. Growth Check
-    try:
-        revenue_growth = fundamentals.get('revenue_growth', 0)
-        revenue_growth_positive = revenue_growth is not None and revenue_growth > 0
-    except Exception:
-        revenue_growth_positive = False
-
-    # Value & Momentum Strategy pass/fail for fundamental criteria
-    value_momentum_pass = is_profitable
-    if pe_ratio is not None and pe_ratio > 0:  # Only check PE if it exists
-        value_momentum_pass = value_momentum_pass and reasonable_pe
+    # Value & Momentum Strategy Fundamental Checks (profitability, P/E < 30,
+    # revenue growth) on plain floats
+    is_profitable, reasonable_pe, revenue_growth_positive, value_momentum_pass = (
+        _analyze_fund_numeric(_as_float(pe_ratio), _as_float(profit_margin),
+                              _as_float(revenue_growth)))
 
     analysis['overall'] = {
         'status': overall_status,
@@ -223,10 +238,10 @@ def analyze_fundamentals(fundamentals):
         'negative_factors': negative_factors,
         'total_factors': total_factors,
         # Value & Momentum Strategy additions
-        'is_profitable': is_profitable,
-        'reasonable_pe': reasonable_pe,
-        'revenue_growth_positive': revenue_growth_positive,
-        'value_momentum_pass': value_momentum_pass
+        'is_profitable': bool(is_profitable),
+        'reasonable_pe': bool(reasonable_pe),
+        'revenue_growth_positive': bool(revenue_growth_positive),
+        'value_momentum_pass': bool(value_momentum_pass)
     }
 
     return analysis
@@ -0,0 +1,518 @@
+# analysis/indicator_kernels.py
+"""
+Batch computation of the Value & Momentum technical signals.
+
+The scanner only needs the latest value of a handful of indicators per
+stock. Instead of running calculate_all_indicators/generate_technical_signals
+once per ticker, the price history of all tickers is stacked into fixed-width
+arrays and a single compiled kernel computes every ticker's signals and tech
+score in one pass. Results match the pandas path in analysis.technical and
+ValueMomentumStrategy.calculate_tech_score.
+
+The extra signals used by the scanner's custom criteria (SMA, RSI bands,
+MACD, 52-week low) are batched too, with pandas groupby over all tickers'
+prices concatenated, since the MACD EMAs need each ticker's full history.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import (
+    DEFAULT_LONG_WINDOW, DEFAULT_MACD_FAST, DEFAULT_MACD_SIGNAL, DEFAULT_MACD_SLOW,
+    DEFAULT_MEDIUM_WINDOW, DEFAULT_RSI_PERIOD, DEFAULT_SHORT_WINDOW
+)
+from utils.numba_compat import njit
+
+# Trading days kept per ticker; the 52-week high is the longest lookback
+WINDOW = 252
+
+# Same windows as calculate_all_indicators
+MA4_WINDOW = 20
+MA40_WINDOW = 200
+BREAKOUT_WINDOW = 20
+
+# Columns needed by the pandas path; frames without them are not stacked
+REQUIRED_COLUMNS = ('close', 'high', 'low', 'volume')
+
+# Columns of the signal matrix returned by compute_signals
+ABOVE_MA40, ABOVE_MA4, RSI_ABOVE_50, NEAR_52W_HIGH, BREAKOUT, TECH_SCORE = range(6)
+N_SIGNALS = 6
+
+# Encoding of the boolean signals in the float signal matrix
+FLAG_NONE = -1.0
+FLAG_FALSE = 0.0
+FLAG_TRUE = 1.0
+
+# Tech score weights, shared with ValueMomentumStrategy.calculate_tech_score;
+# bit j of a packed flag byte holds factor j
+TECH_WEIGHTS = (
+    ('above_ma40', 0.25),
+    ('above_ma4', 0.15),
+    ('rsi_above_50', 0.15),
+    ('higher_lows', 0.15),
+    ('near_52w_high', 0.20),
+    ('breakout', 0.10),
+)
+N_FACTORS = len(TECH_WEIGHTS)
+
+
+def _build_tech_score_table() -> np.ndarray:
+    """
+    Rounded tech score for every (known factors, true factors) bit pattern
+
+    Factors whose known bit is clear are skipped, like None signals;
+    calculate_tech_score looks its scores up here too, so the batch and
+    per-stock scores are identical.
+    """
+    size = 1 << N_FACTORS
+    table = np.zeros((size, size), dtype=np.int8)
+    for known in range(size):
+        for value in range(size):
+            score = 0
+            total_weight = 0
+            for bit, (_, weight) in enumerate(TECH_WEIGHTS):
+                if known >> bit & 1:
+                    score += weight * (100 if value >> bit & 1 else 0)
+                    total_weight += weight
+            table[known, value] = round(score / total_weight) if total_weight > 0 else 0
+    return table
+
+
+TECH_SCORE_TABLE = _build_tech_score_table()
+
+# Signals added by compute_criteria_signals_for_frames, with the SMA window
+# each price_above_sma_* signal compares against
+SMA_SIGNAL_WINDOWS = (
+    ('price_above_sma_short', DEFAULT_SHORT_WINDOW),
+    ('price_above_sma_medium', DEFAULT_MEDIUM_WINDOW),
+    ('price_above_sma_long', DEFAULT_LONG_WINDOW),
+)
+CRITERIA_SIGNAL_NAMES = tuple(name for name, _ in SMA_SIGNAL_WINDOWS) + (
+    'rsi_overbought', 'rsi_oversold', 'macd_bullish_cross', 'macd_bearish_cross', 'near_52w_low')
+
+_FLAG_COLUMNS = (
+    ('above_ma40', ABOVE_MA40),
+    ('above_ma4', ABOVE_MA4),
+    ('rsi_above_50', RSI_ABOVE_50),
+    ('near_52w_high', NEAR_52W_HIGH),
+    ('breakout', BREAKOUT),
+)
+
+
+def stack_columns(frames: List[pd.DataFrame], columns: Tuple[str, ...],
+                  out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stack the last WINDOW rows of the given columns of each frame
+
+    Args:
+        frames: price frames, one per ticker (None allowed)
+        columns: columns to stack
+        out: optional (len(columns), T, WINDOW) float64 array to fill in place
+
+    Returns:
+        tuple: (stacked, valid_len). stacked[c, i] holds column c of frame i
+        left-aligned; valid_len[i] is its number of rows, or -1 when the frame
+        cannot be stacked (missing or non-numeric columns) and must use the
+        pandas path.
+    """
+    n_frames = len(frames)
+    if out is None:
+        out = np.empty((len(columns), n_frames, WINDOW))
+    out.fill(np.nan)
+    valid_len = np.full(n_frames, -1, dtype=np.int64)
+
+    for i, frame in enumerate(frames):
+        if frame is None or not all(col in frame.columns for col in REQUIRED_COLUMNS):
+            continue
+        try:
+            values = [frame[col].to_numpy(dtype=np.float64, na_value=np.nan)[-WINDOW:]
+                      for col in columns]
+        except (TypeError, ValueError):
+            continue
+
+        n = len(values[0])
+        for c, column_values in enumerate(values):
+            out[c, i, :n] = column_values
+        valid_len[i] = n
+
+    return out, valid_len
+
+
+def build_stacked_arrays(frames: List[pd.DataFrame]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Stack the closes and highs of each frame into (T, WINDOW) float64 arrays
+
+    Returns:
+        tuple: (close, high, valid_len), see stack_columns
+    """
+    stacked, valid_len = stack_columns(frames, ('close', 'high'))
+    return stacked[0], stacked[1], valid_len
+
+
+@njit(cache=True)
+def _window_max(values, start, stop):
+    """Max of values[start:stop], NaN if any value is missing (rolling().max())"""
+    result = -np.inf
+    for j in range(start, stop):
+        if np.isnan(values[j]):
+            return np.nan
+        if values[j] > result:
+            result = values[j]
+    return result
+
+
+@njit(cache=True, nogil=True)
+def rolling_mean(values, window):
+    """
+    Series.rolling(window).mean() of a float64 array in one running-sum pass.
+
+    Follows pandas' own roll_mean step for step (Kahan-compensated add and
+    remove, NaNs skipped and counted out of the window, a run of equal
+    values returned exactly, sign clamping), so results are bit-identical.
+    """
+    n = len(values)
+    out = np.empty(n)
+    nobs = 0
+    neg_ct = 0
+    sum_x = 0.0
+    compensation_add = 0.0
+    compensation_remove = 0.0
+    same_run = 0
+    prev_value = values[0] if n else np.nan
+    for i in range(n):
+        if i >= window:
+            old = values[i - window]
+            if old == old:
+                nobs -= 1
+                y = -old - compensation_remove
+                t = sum_x + y
+                compensation_remove = t - sum_x - y
+                sum_x = t
+                if np.signbit(old):
+                    neg_ct -= 1
+        val = values[i]
+        if val == val:
+            nobs += 1
+            y = val - compensation_add
+            t = sum_x + y
+            compensation_add = t - sum_x - y
+            sum_x = t
+            if np.signbit(val):
+                neg_ct += 1
+            if val == prev_value:
+                same_run += 1
+            else:
+                same_run = 1
+            prev_value = val
+        if nobs >= window and nobs > 0:
+            result = sum_x / nobs
+            if same_run >= nobs:
+                result = prev_value
+            elif neg_ct == 0 and result < 0:
+                result = 0.0
+            elif neg_ct == nobs and result > 0:
+                result = 0.0
+            out[i] = result
+        else:
+            out[i] = np.nan
+    return out
+
+
+@njit(cache=True, nogil=True)
+def rolling_std(values, window):
+    """
+    Series.rolling(window).std() of a float64 array: NaN until the window
+    is full or while it holds a NaN, exactly 0 for a constant window, else
+    the sample standard deviation of the window.
+
+    Each window is summed directly (mean, then squared deviations) instead
+    of updating running sums, so there is no drift along the series; values
+    agree with pandas' online update to within its rounding error.
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    if window < 2:
+        return out
+    for i in range(window - 1, n):
+        start = i - window + 1
+        first = values[start]
+        total = 0.0
+        constant = True
+        for j in range(start, i + 1):
+            total += values[j]
+            if values[j] != first:
+                constant = False
+        if total != total:
+            continue
+        if constant:
+            out[i] = 0.0
+            continue
+        mean = total / window
+        squares = 0.0
+        for j in range(start, i + 1):
+            deviation = values[j] - mean
+            squares += deviation * deviation
+        out[i] = np.sqrt(squares / (window - 1))
+    return out
+
+
+@njit(cache=True, nogil=True)
+def ewm_mean(values, span):
+    """
+    Series.ewm(span=span, adjust=False).mean() of a float64 array without
+    missing values.
+
+    Follows pandas' own ewm recurrence (alpha from the center of mass, each
+    step renormalized by old + new weight, a value equal to the running
+    average kept as is), so results are bit-identical. Arrays with NaN gaps
+    are left to pandas, which weights gaps differently when alpha is 0.5.
+    """
+    out = np.empty(len(values))
+    if len(values) == 0:
+        return out
+    alpha = 1.0 / (1.0 + (span - 1) / 2.0)
+    old_wt = 1.0 - alpha
+    weighted = values[0]
+    out[0] = weighted
+    for i in range(1, len(values)):
+        cur = values[i]
+        if weighted != cur:
+            weighted = old_wt * weighted + alpha * cur
+            weighted /= old_wt + alpha
+        out[i] = weighted
+    return out
+
+
+@njit(cache=True)
+def _pack(flag, bit, known, value):
+    """Add a FLAG_* value to the (known, value) bit patterns"""
+    if flag != FLAG_NONE:
+        known |= 1 << bit
+        if flag == FLAG_TRUE:
+            value |= 1 << bit
+    return known, value
+
+
+@njit(cache=True)
+def _above_flag(price, average):
+    """price > average, or None when the average is not positive"""
+    if not average > 0:
+        return FLAG_NONE
+    return FLAG_TRUE if price > average else FLAG_FALSE
+
+
+# Not parallel=True: the scanner forks its process pool right after this
+# runs, and Numba's threading layers are not safe across fork (the parent
+# can hang at exit). A serial compiled pass is already well under the
+# cost of loading the data.
+@njit(cache=True)
+def compute_signals(close, high, valid_len):
+    """
+    Compute the Value & Momentum signals for every stacked ticker
+
+    Returns:
+        np.ndarray: (T, N_SIGNALS) matrix. Rows with fewer than
+        DEFAULT_LONG_WINDOW prices (no indicators in the pandas path) are NaN.
+    """
+    n_tickers = close.shape[0]
+    out = np.full((n_tickers, N_SIGNALS), np.nan)
+
+    for i in range(n_tickers):
+        n = valid_len[i]
+        if n < DEFAULT_LONG_WINDOW:
+            continue
+
+        c = close[i]
+        h = high[i]
+        price = c[n - 1]
+
+        # 1-2. Price against MA40 (200 days) and MA4 (20 days), from the
+        # running mean calculate_sma uses: a plain sum/n rounds a flat
+        # window's mean off its price and flips the comparison
+        above_ma40 = _above_flag(price, rolling_mean(c[:n], MA40_WINDOW)[n - 1])
+        above_ma4 = _above_flag(price, rolling_mean(c[:n], MA4_WINDOW)[n - 1])
+
+        # 3. RSI from simple averages of gains and losses
+        gain = 0.0
+        loss = 0.0
+        for j in range(n - DEFAULT_RSI_PERIOD, n):
+            delta = c[j] - c[j - 1]
+            if delta > 0:
+                gain += delta
+            elif delta < 0:
+                loss -= delta
+        avg_gain = gain / DEFAULT_RSI_PERIOD
+        avg_loss = loss / DEFAULT_RSI_PERIOD
+        if avg_loss == 0:
+            rsi = np.nan if avg_gain == 0 else 100.0
+        else:
+            rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+        if np.isnan(rsi):
+            rsi_above_50 = FLAG_NONE
+        else:
+            rsi_above_50 = FLAG_TRUE if rsi > 50 else FLAG_FALSE
+
+        # 4. Higher lows: the pandas path takes rolling(10).min() over the
+        # last 60 rows, whose leading NaNs are never monotonic, so with
+        # enough history it is always False
+
+        # 5. Within 10% of the 52-week high, proximity clamped to [0, 1]
+        high_52w = np.nan
+        for j in range(n):
+            if not np.isnan(h[j]) and (np.isnan(high_52w) or h[j] > high_52w):
+                high_52w = h[j]
+        proximity = (high_52w - price) / high_52w if high_52w > 0 else 1.0
+        if np.isnan(proximity) or proximity > 1:
+            proximity = 1.0
+        elif proximity < 0:
+            proximity = 0.0
+        near_52w_high = FLAG_TRUE if proximity < 0.10 else FLAG_FALSE
+
+        # 6. Close breaking above the previous 20-day high channel
+        prev_upper = _window_max(h, n - 1 - BREAKOUT_WINDOW, n - 1)
+        breakout = FLAG_TRUE if price > prev_upper and c[n - 2] <= prev_upper else FLAG_FALSE
+
+        out[i, ABOVE_MA40] = above_ma40
+        out[i, ABOVE_MA4] = above_ma4
+        out[i, RSI_ABOVE_50] = rsi_above_50
+        out[i, NEAR_52W_HIGH] = near_52w_high
+        out[i, BREAKOUT] = breakout
+
+        # Tech score looked up from the packed flags (bit order of
+        # TECH_WEIGHTS); higher_lows is always a known False
+        known, value = _pack(above_ma40, 0, 0, 0)
+        known, value = _pack(above_ma4, 1, known, value)
+        known, value = _pack(rsi_above_50, 2, known, value)
+        known, value = _pack(FLAG_FALSE, 3, known, value)
+        known, value = _pack(near_52w_high, 4, known, value)
+        known, value = _pack(breakout, 5, known, value)
+        out[i, TECH_SCORE] = TECH_SCORE_TABLE[known, value]
+
+    return out
+
+
+def signals_from_row(row: np.ndarray) -> Dict:
+    """
+    Convert one row of the signal matrix to the dict analyze_single_stock uses
+
+    A NaN row (too little history) becomes the empty signals dict the
+    pandas path produces, with a tech score of 0.
+    """
+    if np.isnan(row[TECH_SCORE]):
+        return {'tech_score': 0}
+
+    signals = {}
+    for name, column in _FLAG_COLUMNS:
+        flag = row[column]
+        signals[name] = None if flag == FLAG_NONE else bool(flag == FLAG_TRUE)
+    signals['higher_lows'] = False
+    signals['tech_score'] = int(row[TECH_SCORE])
+    return signals
+
+
+def compute_signals_for_frames(frames: List[pd.DataFrame]) -> List[Optional[Dict]]:
+    """
+    Compute signal dicts for a list of price frames in one kernel call
+
+    Returns:
+        list: one signals dict per frame, or None where the frame could not
+        be stacked and the pandas path has to be used instead
+    """
+    if not frames:
+        return []
+
+    close, high, valid_len = build_stacked_arrays(frames)
+    matrix = compute_signals(close, high, valid_len)
+    return [signals_from_row(matrix[i]) if valid_len[i] >= 0 else None
+            for i in range(len(frames))]
+
+
+def _flag(condition, known):
+    """Python bool of a condition, or None where the input was missing"""
+    return bool(condition) if known else None
+
+
+def compute_criteria_signals_for_frames(frames: List[pd.DataFrame]) -> List[Optional[Dict]]:
+    """
+    Compute the custom-criteria signals for many price frames at once
+
+    All frames' closes are concatenated and the SMAs, RSI and MACD computed
+    with one groupby per indicator, instead of calculate_all_indicators per
+    frame. Only each frame's last value is used; values match
+    generate_technical_signals.
+
+    Returns:
+        list: one dict of CRITERIA_SIGNAL_NAMES per frame (all None when the
+        frame is too short for indicators, like the pandas path), or None
+        where the frame could not be read and the pandas path has to be used
+    """
+    results: List[Optional[Dict]] = [None] * len(frames)
+    closes, deltas, lows, batch = [], [], [], []
+    for i, frame in enumerate(frames):
+        if frame is None or not all(col in frame.columns for col in REQUIRED_COLUMNS):
+            continue
+        if frame['close'].dtype.kind != 'f':
+            continue
+        try:
+            low = frame['low'].to_numpy(dtype=np.float64, na_value=np.nan)
+        except (TypeError, ValueError):
+            continue
+        close = frame['close'].to_numpy()
+        if len(close) < DEFAULT_LONG_WINDOW:
+            results[i] = dict.fromkeys(CRITERIA_SIGNAL_NAMES)
+            continue
+        closes.append(close.astype(np.float64))
+        # Differences in the frame's own dtype, as Series.diff() takes them
+        deltas.append(np.concatenate(([np.nan], np.diff(close))).astype(np.float64))
+        lows.append(low)
+        batch.append(i)
+
+    if not batch:
+        return results
+
+    lengths = np.array([len(close) for close in closes])
+    ends = np.cumsum(lengths) - 1
+    labels = np.repeat(np.arange(len(batch)), lengths)
+    close = pd.Series(np.concatenate(closes))
+    by_ticker = close.groupby(labels)
+    price = close.to_numpy()[ends]
+
+    def last(series):
+        # groupby rolling/ewm results come back in group order, which is
+        # the concatenation order
+        return series.to_numpy()[ends]
+
+    smas = {name: last(by_ticker.rolling(window).mean())
+            for name, window in SMA_SIGNAL_WINDOWS}
+
+    delta = pd.Series(np.concatenate(deltas))
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    avg_gain = last(gain.groupby(labels).rolling(DEFAULT_RSI_PERIOD).mean())
+    avg_loss = last(loss.groupby(labels).rolling(DEFAULT_RSI_PERIOD).mean())
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+
+    ema_fast = by_ticker.ewm(span=DEFAULT_MACD_FAST, adjust=False).mean()
+    ema_slow = by_ticker.ewm(span=DEFAULT_MACD_SLOW, adjust=False).mean()
+    macd_line = ema_fast - ema_slow
+    macd = last(macd_line)
+    macd_signal = last(macd_line.groupby(level=0).ewm(
+        span=DEFAULT_MACD_SIGNAL, adjust=False).mean())
+
+    for j, i in enumerate(batch):
+        year_low = lows[j][-WINDOW:]
+        low_52w = np.nan if np.isnan(year_low).all() else np.nanmin(year_low)
+        signals = {name: _flag(price[j] > smas[name][j], smas[name][j] > 0)
+                   for name, _ in SMA_SIGNAL_WINDOWS}
+        signals['rsi_overbought'] = _flag(rsi[j] > 70, not np.isnan(rsi[j]))
+        signals['rsi_oversold'] = _flag(rsi[j] < 30, not np.isnan(rsi[j]))
+        macd_known = not np.isnan(macd[j]) and not np.isnan(macd_signal[j])
+        signals['macd_bullish_cross'] = _flag(macd[j] > macd_signal[j], macd_known)
+        signals['macd_bearish_cross'] = _flag(macd[j] < macd_signal[j], macd_known)
+        signals['near_52w_low'] = bool(price[j] <= low_52w * 1.05)
+        results[i] = signals
+
+    return results
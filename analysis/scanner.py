@@ -1,275 +1,871 @@
 # Standard library imports
+import atexit
 import logging
+import os
+import queue
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from enum import IntEnum
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 # Third-party imports
 import numpy as np
 import pandas as pd
 
 # Local application imports
+from analysis.criteria import (
+    CRITERIA_SIGNALS, compile_fundamental_criteria, criteria_columns, criteria_mask,
+    custom_criteria, fundamental_mask, has_fundamental_criteria, needs_full_signals
+)
 from analysis.fundamental import analyze_fundamentals
+from analysis.indicator_kernels import (
+    compute_criteria_signals_for_frames, compute_signals_for_frames
+)
+from analysis.shared_prices import SharedPriceBlock
 from analysis.technical import calculate_all_indicators, generate_technical_signals
-from config import SCANNER_CRITERIA
-from data.db_manager import get_all_fundamentals, get_watchlist, get_cached_stock_data, get_all_cached_stocks
+from config import DB_PATH
+from data.db_manager import (
+    get_all_fundamentals, get_watchlist, get_cached_stock_data,
+    get_cached_stock_data_bulk, get_all_cached_stocks, get_cached_fundamentals,
+    get_recached_tickers
+)
+from data.supabase_client import get_supabase_db
+from utils.numba_compat import NUMBA_AVAILABLE
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('scanner')
 
 
+class Signal(IntEnum):
+    """Value & Momentum signal codes, ordered from weakest to strongest"""
+    SELL = 0
+    HOLD = 1
+    BUY = 2
+
+
+# Display strings for Signal codes; results and the UI use these strings
+_SIGNAL_STR = ('SELL', 'HOLD', 'BUY')
+
+
+def classify_signals(tech_scores, fundamental_pass, above_ma40) -> np.ndarray:
+    """
+    Vectorized Value & Momentum classification over arrays of stocks
+
+    Returns:
+        np.ndarray: int8 Signal codes, one per stock
+    """
+    tech_scores = np.asarray(tech_scores)
+    return np.where(
+        (tech_scores >= 70) & np.asarray(fundamental_pass, dtype=bool), Signal.BUY,
+        np.where((tech_scores < 40) | ~np.asarray(above_ma40, dtype=bool),
+                 Signal.SELL, Signal.HOLD)
+    ).astype(np.int8)
+
+
+class ScanRow(NamedTuple):
+    """
+    Flat result of analyzing one stock
+
+    Workers return these instead of dicts: they are cheaper to build and to
+    send back from pool processes, and the scan only turns the rows it keeps
+    into result dicts (to_dict).
+    """
+    ticker: str
+    last_price: Optional[float] = None
+    pe_ratio: Optional[float] = None
+    profit_margin: Optional[float] = None
+    revenue_growth: Optional[float] = None
+    tech_score: float = 0
+    above_ma40: Optional[bool] = None
+    above_ma4: Optional[bool] = None
+    rsi_above_50: Optional[bool] = None
+    near_52w_high: Optional[bool] = None
+    is_profitable: bool = False
+    reasonable_pe: bool = True
+    fundamental_pass: bool = False
+    value_momentum_signal: Optional[str] = None
+    error: Optional[str] = None
+    error_message: Optional[str] = None
+    # Below the Value & Momentum tech gate; fundamentals were skipped
+    filtered: bool = False
+    # Signals only read by custom criteria; not part of the result dict
+    price_above_sma_short: Optional[bool] = None
+    price_above_sma_medium: Optional[bool] = None
+    price_above_sma_long: Optional[bool] = None
+    rsi_overbought: Optional[bool] = None
+    rsi_oversold: Optional[bool] = None
+    macd_bullish_cross: Optional[bool] = None
+    macd_bearish_cross: Optional[bool] = None
+    near_52w_low: Optional[bool] = None
+
+    def to_dict(self) -> Dict:
+        """The result dict returned by the scanners"""
+        if self.error is not None:
+            return {
+                "ticker": self.ticker,
+                "error": self.error,
+                "error_message": self.error_message
+            }
+        if self.filtered:
+            return {'ticker': self.ticker, 'tech_score': self.tech_score, 'filtered': True}
+
+        return {
+            'ticker': self.ticker,
+            'last_price': self.last_price,
+            'pe_ratio': self.pe_ratio,
+            'profit_margin': self.profit_margin,
+            'revenue_growth': self.revenue_growth,
+            'tech_score': self.tech_score,
+            'above_ma40': self.above_ma40,
+            'above_ma4': self.above_ma4,
+            'rsi_above_50': self.rsi_above_50,
+            'near_52w_high': self.near_52w_high,
+            'is_profitable': self.is_profitable,
+            'reasonable_pe': self.reasonable_pe,
+            'fundamental_pass': self.fundamental_pass,
+            'value_momentum_signal': self.value_momentum_signal,
+            'data_source': "database"  # Since we're using preloaded data
+        }
+
+
+# Price columns kept by BatchDataLoader; anything else is dropped at load
+PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# Of those, the ones no indicator reads; only these are stored as float32,
+# since a downcast indicator input can flip the signals' ties
+DISPLAY_ONLY_COLUMNS = ('open',)
+
+
+def _bar_key(stock_data: pd.DataFrame) -> Tuple:
+    """Identify a price history by its length, last bar and last close"""
+    last_close = stock_data['close'].to_numpy()[-1] if 'close' in stock_data.columns else None
+    return len(stock_data), stock_data.index[-1], last_close
+
+
+# Tickers per bulk cache query when preloading large scans
+PRELOAD_CHUNK_SIZE = 500
+
+
 class BatchDataLoader:
     """
     Efficiently loads data for multiple stocks at once
     """
 
-    def __init__(self):
+    def __init__(self, indicator_cache: Optional[Dict[str, Tuple[Tuple, Dict]]] = None):
         self.fundamentals_cache = {}
         self.stock_data_cache = {}
-        self.loaded = False
+        self.last_close = {}
+        self.signals_cache = {}
+        # ticker -> _bar_key of the loaded data
+        self.bar_keys = {}
+        # ticker -> (bar key, signals); handed on to the next loader so
+        # tickers whose data has not advanced are not recomputed
+        self.indicator_cache = indicator_cache if indicator_cache is not None else {}
+        # Set in process-pool workers: price data read from shared memory
+        self.shared_prices = None
+        # Tickers whose price data has been queried, with or without a hit
+        self.loaded_tickers = set()
+        self.fundamentals_loaded = False
+        # fundamentals_cache as a frame indexed by ticker, built on first use
+        self._fundamentals_frame = None
 
     def preload_all_data(self, tickers: List[str]):
         """
         Preload all data needed for the scan in bulk operations
         This dramatically reduces database round trips
+
+        Tickers already preloaded by an earlier scan are not queried again.
         """
-        if self.loaded:
+        tickers = [t for t in dict.fromkeys(tickers) if t not in self.loaded_tickers]
+        if not tickers and self.fundamentals_loaded:
             return
 
         logger.info(f"Preloading data for {len(tickers)} stocks...")
         start_time = time.time()
 
-        # Load all fundamentals in one query
-        all_fundamentals = get_all_fundamentals()
-        self.fundamentals_cache = {f['ticker']: f for f in all_fundamentals}
-        logger.info(
-            f"Loaded {len(self.fundamentals_cache)} fundamental records")
+        # The fundamentals query runs on a helper thread while the stock
+        # data is loaded here, so the shorter of the two is hidden
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            fundamentals_future = None
+            if not self.fundamentals_loaded:
+                fundamentals_future = executor.submit(get_all_fundamentals)
 
-        # Load all cached stock data for the tickers we need
-        # This is more efficient than querying each ticker individually
-        for ticker in tickers:
-            # Try to get cached data (this could be optimized further with bulk queries)
-            stock_data = get_cached_stock_data(ticker, '1d', '1y', 'yahoo')
-            if stock_data is None or stock_data.empty:
-                stock_data = get_cached_stock_data(
-                    ticker, '1d', '1y', 'alphavantage')
+            self._load_stock_data(tickers)
 
-            if stock_data is not None and not stock_data.empty:
-                self.stock_data_cache[ticker] = stock_data
+            if fundamentals_future is not None:
+                all_fundamentals = fundamentals_future.result()
+                self.fundamentals_cache = {f['ticker']: f for f in all_fundamentals}
+                self._fundamentals_frame = None
+                self.fundamentals_loaded = True
+                logger.info(
+                    f"Loaded {len(self.fundamentals_cache)} fundamental records")
 
-        self.loaded = True
         load_time = time.time() - start_time
         logger.info(f"Data preloading completed in {load_time:.2f} seconds")
-        logger.info(
-            f"Cached stock data for {len(self.stock_data_cache)} tickers")
+        cached_count = sum(1 for df in self.stock_data_cache.values() if df is not None)
+        logger.info(f"Cached stock data for {cached_count} tickers")
+
+    def _load_stock_data(self, tickers: List[str]):
+        """
+        Load cached price data for tickers into stock_data_cache
+
+        Large loads are split into PRELOAD_CHUNK_SIZE chunks: a producer
+        thread queries the next chunk while this thread stores the previous
+        one and computes its signals.
+        """
+        if not tickers:
+            return
+
+        chunks = [tickers[i:i + PRELOAD_CHUNK_SIZE]
+                  for i in range(0, len(tickers), PRELOAD_CHUNK_SIZE)]
+        if len(chunks) == 1:
+            self._store_stock_data(tickers, self._query_stock_data(tickers))
+            return
+
+        ready = queue.Queue(maxsize=2)
+        stop = threading.Event()
+
+        def _producer():
+            try:
+                for chunk in chunks:
+                    if stop.is_set():
+                        break
+                    ready.put((chunk, self._query_stock_data(chunk)))
+            except Exception as e:
+                ready.put(e)
+            ready.put(None)  # End of stream
+
+        producer = threading.Thread(target=_producer, daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = ready.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                chunk, loaded = item
+                self._store_stock_data(chunk, loaded)
+                self.precompute_signals(chunk)
+        finally:
+            # Unblock the producer if we stopped early
+            stop.set()
+            while producer.is_alive():
+                try:
+                    ready.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+    @staticmethod
+    def _query_stock_data(tickers: List[str]) -> Dict[str, pd.DataFrame]:
+        """One bulk cache query; yahoo is preferred over alphavantage"""
+        return get_cached_stock_data_bulk(tickers, '1d', '1y', ('yahoo', 'alphavantage'))
+
+    def _store_stock_data(self, tickers: List[str], loaded: Dict[str, pd.DataFrame]):
+        """Store the frames of one bulk query, marking tickers without data"""
+        skipped = len(tickers) - len(loaded)
+        if skipped:
+            logger.info(f"No cached stock data for {skipped} tickers")
+
+        for ticker in tickers:
+            stock_data = loaded.get(ticker)
+
+            if stock_data is not None and not stock_data.empty:
+                self.bar_keys[ticker] = _bar_key(stock_data)
+                if 'close' in stock_data.columns:
+                    # Read once at load time so the analyzer avoids iloc
+                    self.last_close[ticker] = stock_data['close'].to_numpy()[-1]
+                self.stock_data_cache[ticker] = self._compact_frame(stock_data)
+            else:
+                # Marked so the analyzer short-circuits on it
+                self.stock_data_cache[ticker] = None
+
+        self.loaded_tickers.update(tickers)
+
+    @staticmethod
+    def _compact_frame(stock_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Keep only the OHLCV columns, with the display-only ones as float32
+
+        Trims the memory held per ticker for the lifetime of the shared
+        loader while the indicator inputs keep their full precision.
+        Non-numeric columns are left for the analyzer to reject.
+        """
+        columns = [col for col in PRICE_COLUMNS if col in stock_data.columns]
+        if not columns:
+            return stock_data
+
+        stock_data = stock_data[columns]
+        numeric = {col: 'float32' for col in DISPLAY_ONLY_COLUMNS
+                   if col in stock_data.columns
+                   and pd.api.types.is_numeric_dtype(stock_data[col])}
+        return stock_data.astype(numeric) if numeric else stock_data
 
     def get_stock_data(self, ticker: str) -> Optional[pd.DataFrame]:
         """Get cached stock data for a ticker"""
+        if self.shared_prices is not None and ticker in self.shared_prices:
+            return self.shared_prices.frame(ticker)
         return self.stock_data_cache.get(ticker)
 
+    def get_last_close(self, ticker: str) -> Optional[float]:
+        """Get the latest close price recorded when the data was loaded"""
+        return self.last_close.get(ticker)
+
+    def precompute_signals(self, tickers: List[str], full_signals: bool = False):
+        """
+        Compute technical signals for all loaded tickers in one kernel call
+
+        With full_signals, the custom-criteria signals are added in one
+        batched pass as well. Only used when Numba is available; otherwise,
+        and for frames the kernel cannot stack, the analyzer falls back to
+        the pandas path.
+        """
+        if not NUMBA_AVAILABLE:
+            return
+
+        tickers = [t for t in dict.fromkeys(tickers) if self.stock_data_cache.get(t) is not None]
+        pending = [t for t in tickers if self.get_signals(t) is None]
+        start_time = time.time()
+
+        if pending:
+            frames = [self.stock_data_cache[t] for t in pending]
+            for ticker, signals in zip(pending, compute_signals_for_frames(frames)):
+                if signals is not None:
+                    self.store_signals(ticker, signals)
+            logger.info(f"Computed signals for {len(pending)} stocks "
+                        f"in {time.time() - start_time:.2f} seconds")
+
+        if not full_signals:
+            return
+
+        partial = [t for t in tickers if self.get_signals(t) is not None
+                   and not all(name in self.signals_cache[t] for name in CRITERIA_SIGNALS)]
+        if not partial:
+            return
+
+        frames = [self.stock_data_cache[t] for t in partial]
+        for ticker, extra in zip(partial, compute_criteria_signals_for_frames(frames)):
+            if extra is not None:
+                self.store_signals(ticker, {**self.signals_cache[ticker], **extra})
+        logger.info(f"Computed criteria signals for {len(partial)} stocks "
+                    f"in {time.time() - start_time:.2f} seconds")
+
+    def get_signals(self, ticker: str) -> Optional[Dict]:
+        """
+        Get precomputed technical signals (including tech_score) for a ticker
+
+        Falls back to signals computed by an earlier loader when the
+        ticker's price data has not changed since.
+        """
+        signals = self.signals_cache.get(ticker)
+        if signals is None:
+            key = self.bar_keys.get(ticker)
+            cached_key, cached_signals = self.indicator_cache.get(ticker, (None, None))
+            if key is not None and cached_key == key:
+                signals = self.signals_cache[ticker] = cached_signals
+        return signals
+
+    def store_signals(self, ticker: str, signals: Dict):
+        """Record computed signals for this scan and for later loaders"""
+        self.signals_cache[ticker] = signals
+        key = self.bar_keys.get(ticker)
+        if key is not None:
+            self.indicator_cache[ticker] = (key, signals)
+
     def get_fundamentals(self, ticker: str) -> Optional[Dict]:
         """Get cached fundamentals for a ticker"""
         return self.fundamentals_cache.get(ticker)
 
+    def get_fundamentals_frame(self, tickers: List[str]) -> pd.DataFrame:
+        """Cached fundamentals of the tickers as a frame, one row per ticker in order"""
+        if self._fundamentals_frame is None:
+            self._fundamentals_frame = pd.DataFrame.from_dict(
+                self.fundamentals_cache, orient='index')
+        return self._fundamentals_frame.reindex(tickers)
+
+
+# Process-wide loader shared by all scanners so repeated scans reuse the
+# preloaded data. It is rebuilt after LOADER_TTL seconds or as soon as the
+# SQLite cache file has been written since it was built.
+LOADER_TTL = 300
+_LOADER_SINGLETON: Optional[BatchDataLoader] = None
+_LOADER_EPOCH = 0.0
+_LOADER_LOCK = threading.Lock()
+
+
+def _get_or_build_loader(ttl: int = LOADER_TTL) -> BatchDataLoader:
+    """Return the shared BatchDataLoader, rebuilding it when stale"""
+    global _LOADER_SINGLETON, _LOADER_EPOCH
+
+    with _LOADER_LOCK:
+        now = time.time()
+        try:
+            db_mtime = os.path.getmtime(DB_PATH)
+        except OSError:
+            db_mtime = 0.0
+
+        if (_LOADER_SINGLETON is None or now - _LOADER_EPOCH > ttl
+                or db_mtime > _LOADER_EPOCH):
+            indicator_cache = None
+            if _LOADER_SINGLETON is not None:
+                indicator_cache = _LOADER_SINGLETON.indicator_cache
+                # Re-cached prices can revise bars without moving the bar
+                # key, so those tickers' signals are recomputed
+                for ticker in get_recached_tickers(_LOADER_EPOCH):
+                    indicator_cache.pop(ticker, None)
+            _LOADER_SINGLETON = BatchDataLoader(indicator_cache)
+            _LOADER_EPOCH = now
+
+        return _LOADER_SINGLETON
+
+
+# Value & Momentum scans keep only stocks with at least this tech score
+VALUE_MOMENTUM_MIN_TECH_SCORE = 70
+
+
+# Seconds a watchlist read is reused by back-to-back scans
+WATCHLIST_TTL = 30
+
+
+@lru_cache(maxsize=1)
+def _cached_watchlist_tickers(ts_bucket: int) -> Tuple[str, ...]:
+    """Watchlist tickers, cached per WATCHLIST_TTL time bucket"""
+    return tuple(item['ticker'] for item in get_watchlist())
+
+
+def _watchlist_tickers() -> List[str]:
+    """Tickers in the watchlist, read at most once per WATCHLIST_TTL seconds"""
+    return list(_cached_watchlist_tickers(int(time.time() // WATCHLIST_TTL)))
+
+
+def _no_data_row(ticker: str) -> ScanRow:
+    """Error row for a ticker without cached price data"""
+    return ScanRow(ticker, error="No stock data available",
+                   error_message=f"No cached data found for {ticker}")
+
+
+def _min_tech_score(criteria: Dict = None) -> Optional[float]:
+    """Tech score below which the scan's filter drops a stock, if any"""
+    if criteria and criteria.get('strategy') == 'value_momentum':
+        return VALUE_MOMENTUM_MIN_TECH_SCORE
+    return None
+
+
+def _as_flag(value) -> Optional[bool]:
+    """Normalize a signal to a Python bool (or None); the UI checks `is True`"""
+    return None if value is None else bool(value)
+
 
 class OptimizedStockAnalyzer:
     """
     Single stock analyzer optimized for batch processing
     """
 
-    def __init__(self, data_loader: BatchDataLoader):
+    def __init__(self, data_loader: BatchDataLoader, criteria: Dict = None):
         self.data_loader = data_loader
+        self.criteria = criteria
+        # Stocks below this tech score are dropped by the scan's filter, so
+        # their fundamentals are not analyzed
+        self.min_tech_score = _min_tech_score(criteria)
+        # Custom technical criteria read signals the batch kernel does not
+        # compute, so those scans take the pandas path
+        self.full_signals = needs_full_signals(criteria)
+        # Fundamental criteria are checked first, before any signal work
+        self.fundamental_checks = compile_fundamental_criteria(criteria)
 
     def analyze_single_stock(self, ticker: str) -> Dict:
         """
         Analyze a single stock using preloaded data
         This eliminates database calls during the analysis phase
         """
+        return self.analyze_row(ticker).to_dict()
+
+    def analyze_row(self, ticker: str) -> ScanRow:
+        """analyze_single_stock, returning the flat ScanRow used by the scans"""
         try:
             # Get preloaded data (no database calls here!)
             stock_data = self.data_loader.get_stock_data(ticker)
-            fundamentals = self.data_loader.get_fundamentals(ticker)
+            fundamentals = self.data_loader.get_fundamentals(ticker) or {}
 
             if stock_data is None or stock_data.empty:
-                return {
-                    "ticker": ticker,
-                    "error": "No stock data available",
-                    "error_message": f"No cached data found for {ticker}"
-                }
+                return _no_data_row(ticker)
+
+            # A stock failing a fundamental criterion is dropped by the
+            # scan's filter whatever its signals, so skip computing them
+            if not all(check(fundamentals) for check in self.fundamental_checks):
+                return ScanRow(ticker, filtered=True)
+
+            # Technical signals come precomputed from the batch kernel when
+            # available; otherwise calculate them here (no I/O)
+            signals = self.data_loader.get_signals(ticker)
+            if self.full_signals and signals is not None and not all(
+                    name in signals for name in CRITERIA_SIGNALS):
+                # Kernel signals only carry the Value & Momentum flags
+                signals = None
+            if signals is not None:
+                tech_score = signals['tech_score']
+            else:
+                indicators = calculate_all_indicators(stock_data)
+                signals = generate_technical_signals(indicators)
 
-            # Calculate technical indicators (computational work, no I/O)
-            indicators = calculate_all_indicators(stock_data)
-            signals = generate_technical_signals(indicators)
+                # Use strategy instance for consistent scoring
+                if not hasattr(self, '_strategy'):
+                    from analysis.strategy import ValueMomentumStrategy
+                    self._strategy = ValueMomentumStrategy()
 
-            # Analyze fundamentals (computational work, no I/O)
-            fundamental_analysis = analyze_fundamentals(fundamentals or {})
+                # Recalculate tech score using strategy's method
+                tech_score = self._strategy.calculate_tech_score(signals)
+                signals['tech_score'] = tech_score
+                self.data_loader.store_signals(ticker, signals)
 
-            # Use strategy instance for consistent scoring
-            if not hasattr(self, '_strategy'):
-                from analysis.strategy import ValueMomentumStrategy
-                self._strategy = ValueMomentumStrategy()
+            if self.min_tech_score is not None and tech_score < self.min_tech_score:
+                return ScanRow(ticker, tech_score=tech_score, filtered=True)
 
-            # Recalculate tech score using strategy's method
-            tech_score = self._strategy.calculate_tech_score(signals)
-            signals['tech_score'] = tech_score
+            # Analyze fundamentals (computational work, no I/O)
+            fundamental_analysis = analyze_fundamentals(fundamentals)
+            overall = fundamental_analysis.get('overall', {})
 
             # Build result (all data operations are in-memory)
-            current_price = stock_data['close'].iloc[-1]
+            current_price = self.data_loader.get_last_close(ticker)
+            if current_price is None:
+                current_price = stock_data['close'].to_numpy()[-1]
 
             # Value & Momentum Strategy logic
-            fundamental_pass = fundamental_analysis['overall'].get(
-                'value_momentum_pass', False)
+            fundamental_pass = overall.get('value_momentum_pass', False)
 
-            if tech_score >= 70 and fundamental_pass:
-                value_momentum_signal = "BUY"
+            if tech_score >= VALUE_MOMENTUM_MIN_TECH_SCORE and fundamental_pass:
+                signal = Signal.BUY
             elif tech_score < 40 or not signals.get('above_ma40', False):
-                value_momentum_signal = "SELL"
+                signal = Signal.SELL
             else:
-                value_momentum_signal = "HOLD"
-
-            return {
-                'ticker': ticker,
-                'last_price': current_price,
-                'pe_ratio': fundamentals.get('pe_ratio') if fundamentals else None,
-                'profit_margin': fundamentals.get('profit_margin') if fundamentals else None,
-                'revenue_growth': fundamentals.get('revenue_growth') if fundamentals else None,
-                'tech_score': tech_score,
-                'above_ma40': signals.get('above_ma40', False),
-                'above_ma4': signals.get('above_ma4', False),
-                'rsi_above_50': signals.get('rsi_above_50', False),
-                'near_52w_high': signals.get('near_52w_high', False),
-                'is_profitable': fundamental_analysis['overall'].get('is_profitable', False),
-                'reasonable_pe': fundamental_analysis['overall'].get('reasonable_pe', True),
-                'fundamental_pass': fundamental_pass,
-                'value_momentum_signal': value_momentum_signal,
-                'data_source': "database"  # Since we're using preloaded data
-            }
+                signal = Signal.HOLD
+
+            return ScanRow(
+                ticker,
+                last_price=current_price,
+                pe_ratio=fundamentals.get('pe_ratio'),
+                profit_margin=fundamentals.get('profit_margin'),
+                revenue_growth=fundamentals.get('revenue_growth'),
+                tech_score=tech_score,
+                above_ma40=_as_flag(signals.get('above_ma40', False)),
+                above_ma4=_as_flag(signals.get('above_ma4', False)),
+                rsi_above_50=_as_flag(signals.get('rsi_above_50', False)),
+                near_52w_high=_as_flag(signals.get('near_52w_high', False)),
+                is_profitable=overall.get('is_profitable', False),
+                reasonable_pe=overall.get('reasonable_pe', True),
+                fundamental_pass=fundamental_pass,
+                value_momentum_signal=_SIGNAL_STR[signal],
+                price_above_sma_short=_as_flag(signals.get('price_above_sma_short')),
+                price_above_sma_medium=_as_flag(signals.get('price_above_sma_medium')),
+                price_above_sma_long=_as_flag(signals.get('price_above_sma_long')),
+                rsi_overbought=_as_flag(signals.get('rsi_overbought')),
+                rsi_oversold=_as_flag(signals.get('rsi_oversold')),
+                macd_bullish_cross=_as_flag(signals.get('macd_bullish_cross')),
+                macd_bearish_cross=_as_flag(signals.get('macd_bearish_cross')),
+                near_52w_low=_as_flag(signals.get('near_52w_low')),
+            )
 
         except Exception as e:
             logger.error(f"Error analyzing {ticker}: {e}")
-            return {
-                "ticker": ticker,
-                "error": str(e),
-                "error_message": f"Analysis failed: {str(e)}"
-            }
+            return ScanRow(ticker, error=str(e), error_message=f"Analysis failed: {str(e)}")
 
 
-class ParallelStockScanner:
+# Below this many tickers the process start-up cost outweighs the parallel
+# speed-up, so small scans stay on threads
+PROCESS_POOL_MIN_TICKERS = 100
+
+# Process pool kept warm between scans, see _get_process_pool
+_PROCESS_POOL: Optional[ProcessPoolExecutor] = None
+_PROCESS_POOL_WORKERS = 0
+_PROCESS_POOL_LOCK = threading.Lock()
+
+# Per-process loader in pool workers, reused by every task it runs
+_WORKER_LOADER: Optional[BatchDataLoader] = None
+
+
+def _warm_worker():
     """
-    High-performance scanner using parallel processing and bulk data loading
+    Process pool initializer, run once per worker process
+
+    Workers outlive a scan, so this module's imports (NumPy, pandas, the
+    indicator code) are paid for once per process rather than once per scan.
     """
+    global _WORKER_LOADER
 
-    def __init__(self, max_workers: int = 4):
-        self.max_workers = max_workers
-        self.data_loader = BatchDataLoader()
+    _WORKER_LOADER = BatchDataLoader()
+    _WORKER_LOADER.fundamentals_loaded = True
 
-    def scan_stocks_parallel(self, tickers: List[str], criteria: Dict = None,
-                             progress_callback=None) -> List[Dict]:
-        """
-        Scan stocks using parallel processing with optimized data loading
-        
-        Performance improvements:
-        1. Bulk data preloading eliminates database round trips
-        2. Parallel processing utilizes multiple CPU cores
-        3. Memory-efficient processing of large stock lists
-        """
-        if not tickers:
-            return []
 
-        logger.info(
-            f"Starting parallel scan of {len(tickers)} stocks with {self.max_workers} workers")
-        total_start_time = time.time()
+def _shutdown_process_pool():
+    """Stop the warm pool's workers (registered with atexit)"""
+    global _PROCESS_POOL
 
-        # Step 1: Preload all data in bulk (major performance gain)
-        self.data_loader.preload_all_data(tickers)
+    with _PROCESS_POOL_LOCK:
+        if _PROCESS_POOL is not None:
+            _PROCESS_POOL.shutdown()
+            _PROCESS_POOL = None
 
-        # Step 2: Process stocks in parallel batches
-        results = []
-        batch_size = max(10, len(tickers) // self.max_workers)
 
-        # Split tickers into batches for better progress tracking
-        ticker_batches = [tickers[i:i + batch_size]
-                          for i in range(0, len(tickers), batch_size)]
+def _get_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Return the shared process pool, creating it on first use"""
+    global _PROCESS_POOL, _PROCESS_POOL_WORKERS
 
-        processed_count = 0
+    with _PROCESS_POOL_LOCK:
+        if _PROCESS_POOL is not None and _PROCESS_POOL_WORKERS != max_workers:
+            _PROCESS_POOL.shutdown()
+            _PROCESS_POOL = None
 
-        for batch_idx, batch_tickers in enumerate(ticker_batches):
-            if progress_callback:
-                progress = processed_count / len(tickers)
-                progress_callback(
-                    progress, f"Processing batch {batch_idx + 1}/{len(ticker_batches)}")
+        if _PROCESS_POOL is None:
+            _PROCESS_POOL = ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_warm_worker)
+            _PROCESS_POOL_WORKERS = max_workers
 
-            # Process this batch in parallel
-            batch_results = self._process_batch_parallel(batch_tickers)
-            results.extend(batch_results)
+        return _PROCESS_POOL
 
-            processed_count += len(batch_tickers)
 
-        # Step 3: Apply criteria filtering if specified
-        if criteria and criteria.get('strategy') == 'value_momentum':
-            # Filter for Value & Momentum Strategy
-            filtered_results = []
-            for result in results:
-                if result.get('error'):
-                    continue
+atexit.register(_shutdown_process_pool)
 
-                # Include stocks that meet Value & Momentum criteria
-                tech_score = result.get('tech_score', 0)
-                fundamental_pass = result.get('fundamental_pass', False)
 
-                if tech_score >= 70 and fundamental_pass:
-                    filtered_results.append(result)
+def _analyze_chunk(task: Tuple) -> List[ScanRow]:
+    """
+    Process pool task: analyze a chunk of tickers in a warm worker
 
-            results = filtered_results
+    The task carries the shared price block handle and only this chunk's
+    frames (those not in the block), fundamentals, closes and signals. The
+    worker keeps the block attached until a task for a new scan arrives.
+    """
+    (shared_prices_handle, tickers, stock_data_cache, fundamentals_cache,
+     last_close, signals_cache, criteria) = task
 
-        # Step 4: Sort by tech score
-        results.sort(key=lambda x: x.get('tech_score', 0), reverse=True)
+    loader = _WORKER_LOADER
+    name = shared_prices_handle[0]
+    if loader.shared_prices is None or loader.shared_prices.name != name:
+        if loader.shared_prices is not None:
+            loader.shared_prices.release()
+        loader.shared_prices = SharedPriceBlock.attach(shared_prices_handle)
 
-        total_time = time.time() - total_start_time
-        logger.info(f"Parallel scan completed in {total_time:.2f} seconds")
-        logger.info(
-            f"Average time per stock: {total_time/len(tickers):.3f} seconds")
+    loader.stock_data_cache = stock_data_cache
+    loader.fundamentals_cache = fundamentals_cache
+    loader.last_close = last_close
+    loader.signals_cache = signals_cache
 
-        if progress_callback:
-            progress_callback(
-                1.0, f"Scan complete! Processed {len(tickers)} stocks in {total_time:.1f}s")
+    analyzer = OptimizedStockAnalyzer(loader, criteria)
+    return [analyzer.analyze_row(ticker) for ticker in tickers]
 
+
+def _analyze_tickers(data_loader: BatchDataLoader, tickers: List[str], max_workers: int,
+                     progress_callback=None, criteria: Dict = None) -> List[ScanRow]:
+    """
+    Analyze preloaded tickers in parallel, returning rows in input order
+
+    With Value & Momentum criteria, stocks failing the tech score gate come
+    back as rows marked filtered; those whose precomputed score already
+    fails it are not dispatched.
+
+    The analysis is CPU-bound, so large scans run on a warm process pool
+    whose workers read the preloaded prices from one shared memory block;
+    tickers are sent in chunks to amortize the per-task dispatch overhead.
+    Tickers without price data get their error row here and are not
+    dispatched at all.
+    """
+    has_data = [data_loader.stock_data_cache.get(t) is not None for t in tickers]
+    if not all(has_data):
+        with_data = [t for t, ok in zip(tickers, has_data) if ok]
+        analyzed = iter(_analyze_tickers(
+            data_loader, with_data, max_workers, progress_callback, criteria))
+        return [next(analyzed) if ok else _no_data_row(t) for t, ok in zip(tickers, has_data)]
+
+    total = len(tickers)
+    chunksize = max(1, total // (4 * max_workers))
+    # Report progress about every 1% of completed stocks, independently of
+    # how the work is chunked
+    progress_step = max(1, total // 100)
+
+    # One compiled pass over all tickers before dispatching the workers
+    data_loader.precompute_signals(tickers, needs_full_signals(criteria))
+
+    min_tech_score = _min_tech_score(criteria)
+    if min_tech_score is not None:
+        gated = {}
+        for t in tickers:
+            signals = data_loader.get_signals(t)
+            if signals is not None and signals['tech_score'] < min_tech_score:
+                gated[t] = ScanRow(t, tech_score=signals['tech_score'], filtered=True)
+        if gated:
+            passed = [t for t in tickers if t not in gated]
+            analyzed = iter(_analyze_tickers(
+                data_loader, passed, max_workers, progress_callback, criteria))
+            return [gated[t] if t in gated else next(analyzed) for t in tickers]
+
+    if len(tickers) < PROCESS_POOL_MIN_TICKERS:
+        results = [None] * total
+        analyzer = OptimizedStockAnalyzer(data_loader, criteria)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for i, result in enumerate(
+                    executor.map(analyzer.analyze_row, tickers, chunksize=chunksize)):
+                results[i] = result
+                done = i + 1
+                if progress_callback and done % progress_step == 0:
+                    progress_callback(done / total, f"Analyzed {done}/{total} stocks")
         return results
 
-    def _process_batch_parallel(self, batch_tickers: List[str]) -> List[Dict]:
-        """
-        Process a batch of tickers in parallel
-        """
-        results = []
+    # Prices go through shared memory; each task pickles only the frames
+    # that could not be stacked and the small per-ticker dicts of its chunk
+    frames = {t: data_loader.stock_data_cache.get(t) for t in tickers}
+    shared_prices = SharedPriceBlock.create(frames)
+    handle = shared_prices.handle()
+
+    def _task(chunk):
+        return (
+            handle,
+            chunk,
+            {t: frames[t] for t in chunk if t not in shared_prices},
+            {t: data_loader.fundamentals_cache[t] for t in chunk
+             if t in data_loader.fundamentals_cache},
+            {t: data_loader.last_close[t] for t in chunk if t in data_loader.last_close},
+            {t: data_loader.signals_cache[t] for t in chunk if t in data_loader.signals_cache},
+            criteria,
+        )
+
+    chunks = [tickers[i:i + chunksize] for i in range(0, len(tickers), chunksize)]
+    try:
+        executor = _get_process_pool(max_workers)
+        futures = [executor.submit(_analyze_chunk, _task(chunk)) for chunk in chunks]
+
+        # Progress follows chunks as they complete, in any order
+        done = 0
+        for future in as_completed(futures):
+            reported = done // progress_step
+            done += len(future.result())
+            if progress_callback and done // progress_step > reported:
+                progress_callback(done / total, f"Analyzed {done}/{total} stocks")
+
+        results = [row for future in futures for row in future.result()]
+    finally:
+        shared_prices.release()
+
+    return results
+
+
+def _filter_and_rank(rows: List[ScanRow], criteria: Dict = None,
+                     top_k: Optional[int] = None) -> List[Dict]:
+    """
+    Apply the strategy filter and sort results by tech score, descending
 
-        # Use ThreadPoolExecutor for I/O bound tasks (though most I/O is eliminated by preloading)
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Create analyzer instances for each worker
-            analyzer = OptimizedStockAnalyzer(self.data_loader)
+    The mask and ordering are computed on NumPy columns of the rows; only
+    the rows kept are turned into result dicts. Ties keep their input order.
+    With top_k, only the best top_k rows are selected (argpartition) and
+    sorted, giving the same rows as the head of the full ranking.
+    """
+    n = len(rows)
+    tech_scores = np.fromiter((r.tech_score for r in rows), dtype=float, count=n)
+    keep = np.ones(n, dtype=bool)
+
+    if criteria and criteria.get('strategy') == 'value_momentum':
+        # Include stocks that meet Value & Momentum criteria: the analyzer's
+        # BUY signal is exactly that test, and errored or filtered rows
+        # carry no signal
+        keep = np.fromiter(
+            (r.value_momentum_signal == 'BUY' for r in rows), dtype=bool, count=n)
+    elif custom_criteria(criteria):
+        # Custom criteria: one vectorized comparison per criterion
+        columns = {name: [getattr(r, name) for r in rows]
+                   for name in criteria_columns(criteria)}
+        keep = criteria_mask(columns, n, criteria)
+
+    indices = np.flatnonzero(keep)
+    if top_k is not None and top_k < len(indices):
+        if top_k <= 0:
+            return []
+        scores = tech_scores[indices]
+        kth_score = -np.partition(-scores, top_k - 1)[top_k - 1]
+        # Everything above the k-th score, then ties in input order
+        above = np.flatnonzero(scores > kth_score)
+        ties = np.flatnonzero(scores == kth_score)[:top_k - len(above)]
+        indices = indices[np.sort(np.concatenate([above, ties]))]
 
-            # Submit all jobs
-            future_to_ticker = {
-                executor.submit(analyzer.analyze_single_stock, ticker): ticker
-                for ticker in batch_tickers
-            }
+    order = indices[np.argsort(-tech_scores[indices], kind='stable')]
+    return [rows[i].to_dict() for i in order]
 
-            # Collect results as they complete
-            for future in as_completed(future_to_ticker):
-                ticker = future_to_ticker[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                except Exception as e:
-                    logger.error(f"Error processing {ticker}: {e}")
-                    results.append({
-                        "ticker": ticker,
-                        "error": str(e),
-                        "error_message": f"Processing failed: {str(e)}"
-                    })
 
-        return results
+def _run_parallel_scan(data_loader: BatchDataLoader, tickers: List[str], max_workers: int,
+                       criteria: Dict = None, progress_callback=None,
+                       top_k: Optional[int] = None) -> List[Dict]:
+    """
+    Preload, analyze, filter and rank tickers; the body of both scanner classes' scans
+
+    Args:
+        data_loader: loader to preload the tickers into
+        tickers: stock tickers to scan
+        max_workers: number of parallel workers
+        criteria: scanning criteria
+        progress_callback: function called with (fraction, message) updates
+        top_k: if set, only return the top_k results by tech score
+
+    Returns:
+        list: result dicts of the stocks meeting the criteria, best first
+    """
+    if not tickers:
+        return []
+
+    logger.info(f"Starting parallel scan of {len(tickers)} stocks with {max_workers} workers")
+    total_start_time = time.time()
+
+    # Step 1: Preload all data in bulk (major performance gain)
+    data_loader.preload_all_data(tickers)
+
+    # Stocks failing a fundamental criterion are dropped by the filter
+    # anyway, so they are excluded up front with one mask over all stocks
+    scan_tickers = tickers
+    if has_fundamental_criteria(criteria):
+        keep = fundamental_mask(data_loader.get_fundamentals_frame(tickers), criteria)
+        scan_tickers = [t for t, k in zip(tickers, keep) if k]
+        logger.info(f"{len(scan_tickers)} of {len(tickers)} stocks pass the fundamental criteria")
+
+    # Step 2: Analyze all stocks on a single executor
+    rows = _analyze_tickers(data_loader, scan_tickers, max_workers, progress_callback, criteria)
+
+    # Step 3 & 4: Apply criteria filtering and sort by tech score
+    results = _filter_and_rank(rows, criteria, top_k)
+
+    total_time = time.time() - total_start_time
+    logger.info(f"Parallel scan completed in {total_time:.2f} seconds")
+    logger.info(f"Average time per stock: {total_time/len(tickers):.3f} seconds")
+
+    if progress_callback:
+        progress_callback(
+            1.0, f"Scan complete! Processed {len(tickers)} stocks in {total_time:.1f}s")
+
+    return results
+
+
+class ParallelStockScanner:
+    """
+    High-performance scanner using parallel processing and bulk data loading
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self.data_loader = _get_or_build_loader()
+
+    def scan_stocks_parallel(self, tickers: List[str], criteria: Dict = None,
+                             progress_callback=None, top_k: Optional[int] = None) -> List[Dict]:
+        """
+        Scan stocks using parallel processing with optimized data loading
+
+        With top_k, only the top_k results by tech score are returned.
+        
+        Performance improvements:
+        1. Bulk data preloading eliminates database round trips
+        2. Parallel processing utilizes multiple CPU cores
+        3. Memory-efficient processing of large stock lists
+        """
+        self.data_loader = _get_or_build_loader()
+        return _run_parallel_scan(
+            self.data_loader, tickers, self.max_workers, criteria, progress_callback, top_k)
 
 
 # This function has been replaced by the unified StockScanner class
@@ -294,10 +890,7 @@ def optimized_value_momentum_scan(only_watchlist=False, max_workers=4) -> List[D
     scanner = StockScanner(max_workers=max_workers)
     
     # Determine stock list if only scanning watchlist
-    stock_list = None
-    if only_watchlist:
-        watchlist = get_watchlist()
-        stock_list = [item['ticker'] for item in watchlist]
+    stock_list = _watchlist_tickers() if only_watchlist else None
     
     # Use the unified scanner with Value & Momentum strategy
     return scanner.scan({'strategy': 'value_momentum'}, stock_list)
@@ -323,15 +916,17 @@ def value_momentum_scan(only_watchlist=False):
     scanner = StockScanner(max_workers=4)
     
     # Determine stock list if only scanning watchlist
-    stock_list = None
-    if only_watchlist:
-        watchlist = get_watchlist()
-        stock_list = [item['ticker'] for item in watchlist]
+    stock_list = _watchlist_tickers() if only_watchlist else None
     
     # Use the unified scanner with Value & Momentum strategy
     return scanner.scan({'strategy': 'value_momentum'}, stock_list)
 
 
+# Threads for StockScanner.get_stock_data's SQLite reads, which run while
+# it waits on Supabase; threads are only started on first use
+_DB_READ_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='db-read')
+
+
 class StockScanner:
     """
     Unified stock scanner with high performance and database flexibility
@@ -359,14 +954,15 @@ class StockScanner:
         self.max_workers = max_workers
         self.use_supabase = use_supabase
         self.use_sqlite = use_sqlite
-        self.data_loader = BatchDataLoader()
+        self.data_loader = _get_or_build_loader()
         
         # Ensure at least one database is enabled
         if not use_supabase and not use_sqlite:
             self.use_sqlite = True
             logger.warning("No database specified, defaulting to SQLite")
 
-    def scan(self, criteria=None, stock_list=None, progress_callback=None, database_only=False):
+    def scan(self, criteria=None, stock_list=None, progress_callback=None, database_only=False,
+             top_k=None):
         """
         Unified entry point for all stock scanning operations
         
@@ -375,16 +971,13 @@ class StockScanner:
             stock_list (list): List of stock tickers to scan, or None to scan all available
             progress_callback (callable): Function to call with progress updates
             database_only (bool): If True, only use cached database data
+            top_k (int): If set, only return the top_k results by tech score
             
         Returns:
             list: List of analysis results for each stock
         """
-        # Handle Value & Momentum strategy specifically
-        if criteria and criteria.get('strategy') == 'value_momentum':
-            only_watchlist = stock_list is not None and len(stock_list) > 0 and hasattr(stock_list, '__iter__')
-            return self._scan_value_momentum(only_watchlist, progress_callback)
-            
-        # Get list of stocks to scan
+        # Get list of stocks to scan (Value & Momentum scans included: the
+        # strategy is applied by the analyzer and filter like any criteria)
         stocks_to_scan = self._get_stocks_to_scan(stock_list)
         
         if not stocks_to_scan:
@@ -392,7 +985,7 @@ class StockScanner:
             return []
             
         # Perform the scan using parallel processing
-        return self._scan_stocks_parallel(stocks_to_scan, criteria, progress_callback)
+        return self._scan_stocks_parallel(stocks_to_scan, criteria, progress_callback, top_k)
 
     def _get_stocks_to_scan(self, stock_list=None):
         """
@@ -419,7 +1012,6 @@ class StockScanner:
         # Get stocks from Supabase if enabled
         if self.use_supabase:
             try:
-                from data.supabase_client import get_supabase_db
                 supabase_db = get_supabase_db()
 
                 if supabase_db.is_connected():
@@ -431,7 +1023,7 @@ class StockScanner:
 
         return list(stocks_to_scan)
 
-    def get_stock_data(self, ticker, timeframe='1d', period='1y'):
+    def get_stock_data(self, ticker, timeframe='1d', period='1y', fundamentals_cache=None):
         """
         Get stock data from configured database sources
         
@@ -439,6 +1031,9 @@ class StockScanner:
             ticker (str): Stock ticker symbol
             timeframe (str): Data timeframe (e.g., '1d', '1wk')
             period (str): Data period (e.g., '1y', '2y')
+            fundamentals_cache (dict): Prefetched fundamentals by ticker (e.g.
+                from get_all_fundamentals); when given, fundamentals are read
+                from it instead of queried per ticker
             
         Returns:
             tuple: (stock_data, fundamentals, source)
@@ -446,18 +1041,30 @@ class StockScanner:
         stock_data = None
         fundamentals = None
         data_source = None
+        if fundamentals_cache is not None:
+            fundamentals = fundamentals_cache.get(ticker)
+
+        # With both sources enabled, the SQLite reads start now so they
+        # overlap the Supabase round trips; they are only used for what
+        # Supabase does not have
+        sqlite_stock_data = sqlite_fundamentals = None
+        if self.use_supabase and self.use_sqlite:
+            sqlite_stock_data = _DB_READ_POOL.submit(
+                get_cached_stock_data, ticker, timeframe, period, 'yahoo')
+            if fundamentals_cache is None:
+                sqlite_fundamentals = _DB_READ_POOL.submit(get_cached_fundamentals, ticker)
 
         # Try Supabase first if enabled
         if self.use_supabase:
             try:
-                from data.supabase_client import get_supabase_db
                 supabase_db = get_supabase_db()
 
                 if supabase_db.is_connected():
                     # Get data only from cache, without triggering API calls
                     stock_data = supabase_db.get_cached_stock_data(
                         ticker, timeframe, period, 'yahoo')
-                    fundamentals = supabase_db.get_cached_fundamentals(ticker)
+                    if fundamentals_cache is None:
+                        fundamentals = supabase_db.get_cached_fundamentals(ticker)
 
                     if stock_data is not None or fundamentals is not None:
                         data_source = "supabase"
@@ -465,56 +1072,25 @@ class StockScanner:
                 logger.warning(f"Error accessing Supabase: {e}")
 
         # If data is missing, try SQLite if enabled
-        if (stock_data is None or fundamentals is None) and self.use_sqlite:
+        missing_fundamentals = fundamentals is None and fundamentals_cache is None
+        if (stock_data is None or missing_fundamentals) and self.use_sqlite:
             # Only get what's missing
             if stock_data is None:
                 # Get data only from cache, without triggering API calls
-                stock_data = get_cached_stock_data(
-                    ticker, timeframe, period, 'yahoo')
+                stock_data = (sqlite_stock_data.result() if sqlite_stock_data is not None
+                              else get_cached_stock_data(ticker, timeframe, period, 'yahoo'))
 
-            if fundamentals is None:
+            if missing_fundamentals:
                 # Get fundamentals directly for this ticker
-                from data.db_manager import get_cached_fundamentals
-                fundamentals = get_cached_fundamentals(ticker)
+                fundamentals = (sqlite_fundamentals.result() if sqlite_fundamentals is not None
+                                else get_cached_fundamentals(ticker))
 
             if stock_data is not None or fundamentals is not None:
                 data_source = "sqlite" if data_source is None else "combined"
 
         return stock_data, fundamentals, data_source
 
-    def _scan_value_momentum(self, only_watchlist=False, progress_callback=None):
-        """
-        Specialized scan for Value & Momentum Strategy
-        
-        Args:
-            only_watchlist (bool): If True, only scan stocks in the watchlist
-            progress_callback (callable): Function to call with progress updates
-            
-        Returns:
-            list: List of stocks meeting the Value & Momentum criteria
-        """
-        logger.info("Starting Value & Momentum scan")
-
-        # Get list of stocks to scan
-        if only_watchlist:
-            watchlist = get_watchlist()
-            stocks_to_scan = [item['ticker'] for item in watchlist]
-            logger.info(f"Scanning watchlist: {len(stocks_to_scan)} stocks")
-        else:
-            stocks_to_scan = self._get_stocks_to_scan()
-            logger.info(f"Scanning all database stocks: {len(stocks_to_scan)} stocks")
-
-        if not stocks_to_scan:
-            logger.warning("No stocks to scan")
-            return []
-
-        # Define Value & Momentum criteria
-        criteria = {'strategy': 'value_momentum'}
-
-        # Perform scan using parallel processing
-        return self._scan_stocks_parallel(stocks_to_scan, criteria, progress_callback)
-
-    def _scan_stocks_parallel(self, tickers, criteria=None, progress_callback=None):
+    def _scan_stocks_parallel(self, tickers, criteria=None, progress_callback=None, top_k=None):
         """
         Scan stocks using parallel processing with optimized data loading
         
@@ -522,109 +1098,14 @@ class StockScanner:
             tickers (list): List of stock tickers to scan
             criteria (dict): Dictionary of scanning criteria
             progress_callback (callable): Function to call with progress updates
+            top_k (int): If set, only return the top_k results by tech score
             
         Returns:
             list: List of analysis results for each stock
         """
-        if not tickers:
-            return []
-
-        logger.info(f"Starting parallel scan of {len(tickers)} stocks with {self.max_workers} workers")
-        total_start_time = time.time()
-
-        # Step 1: Preload all data in bulk (major performance gain)
-        self.data_loader.preload_all_data(tickers)
-
-        # Step 2: Process stocks in parallel batches
-        results = []
-        batch_size = max(10, len(tickers) // self.max_workers)
-
-        # Split tickers into batches for better progress tracking
-        ticker_batches = [tickers[i:i + batch_size]
-                          for i in range(0, len(tickers), batch_size)]
-
-        processed_count = 0
-
-        for batch_idx, batch_tickers in enumerate(ticker_batches):
-            if progress_callback:
-                progress = processed_count / len(tickers)
-                progress_callback(
-                    progress, f"Processing batch {batch_idx + 1}/{len(ticker_batches)}")
-
-            # Process this batch in parallel
-            batch_results = self._process_batch_parallel(batch_tickers)
-            results.extend(batch_results)
-
-            processed_count += len(batch_tickers)
-
-        # Step 3: Apply criteria filtering if specified
-        if criteria and criteria.get('strategy') == 'value_momentum':
-            # Filter for Value & Momentum Strategy
-            filtered_results = []
-            for result in results:
-                if result.get('error'):
-                    continue
-
-                # Include stocks that meet Value & Momentum criteria
-                tech_score = result.get('tech_score', 0)
-                fundamental_pass = result.get('fundamental_pass', False)
-
-                if tech_score >= 70 and fundamental_pass:
-                    filtered_results.append(result)
-
-            results = filtered_results
-
-        # Step 4: Sort by tech score
-        results.sort(key=lambda x: x.get('tech_score', 0), reverse=True)
-
-        total_time = time.time() - total_start_time
-        logger.info(f"Parallel scan completed in {total_time:.2f} seconds")
-        logger.info(f"Average time per stock: {total_time/len(tickers):.3f} seconds")
-
-        if progress_callback:
-            progress_callback(
-                1.0, f"Scan complete! Processed {len(tickers)} stocks in {total_time:.1f}s")
-
-        return results
-
-    def _process_batch_parallel(self, batch_tickers):
-        """
-        Process a batch of tickers in parallel
-        
-        Args:
-            batch_tickers (list): List of stock tickers to process
-            
-        Returns:
-            list: List of analysis results for each stock in the batch
-        """
-        results = []
-
-        # Use ThreadPoolExecutor for I/O bound tasks
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Create analyzer instance
-            analyzer = OptimizedStockAnalyzer(self.data_loader)
-
-            # Submit all jobs
-            future_to_ticker = {
-                executor.submit(analyzer.analyze_single_stock, ticker): ticker
-                for ticker in batch_tickers
-            }
-
-            # Collect results as they complete
-            for future in as_completed(future_to_ticker):
-                ticker = future_to_ticker[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                except Exception as e:
-                    logger.error(f"Error processing {ticker}: {e}")
-                    results.append({
-                        "ticker": ticker,
-                        "error": str(e),
-                        "error_message": f"Processing failed: {str(e)}"
-                    })
-
-        return results
+        self.data_loader = _get_or_build_loader()
+        return _run_parallel_scan(
+            self.data_loader, tickers, self.max_workers, criteria, progress_callback, top_k)
 
 
 def scan_stocks(criteria, only_watchlist=False):
@@ -642,10 +1123,7 @@ def scan_stocks(criteria, only_watchlist=False):
     scanner = StockScanner(max_workers=4)
     
     # Determine stock list if only scanning watchlist
-    stock_list = None
-    if only_watchlist:
-        watchlist = get_watchlist()
-        stock_list = [item['ticker'] for item in watchlist]
+    stock_list = _watchlist_tickers() if only_watchlist else None
     
     # Use the unified scanner interface
     return scanner.scan(criteria, stock_list)
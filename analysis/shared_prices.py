@@ -0,0 +1,80 @@
+# analysis/shared_prices.py
+"""
+Preloaded price data in shared memory for process-pool scans.
+
+Pickling every ticker's DataFrame into each pool worker costs time and one
+copy of the data per worker. Instead the scanner stacks the price columns of
+all tickers into a single shared memory block once; workers attach to it by
+name and rebuild a ticker's frame from a view of its row.
+"""
+
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from analysis.indicator_kernels import REQUIRED_COLUMNS, WINDOW, stack_columns
+
+
+class SharedPriceBlock:
+    """
+    Last WINDOW rows of REQUIRED_COLUMNS for many tickers in shared memory
+
+    Only tickers whose frames could be stacked are included; anything else
+    (no data, missing or non-numeric columns) has to be passed separately.
+    """
+
+    def __init__(self, shm: SharedMemory, ticker_to_row: Dict[str, int],
+                 valid_len: np.ndarray, owner: bool):
+        self._shm = shm
+        self._owner = owner
+        self.ticker_to_row = ticker_to_row
+        self.valid_len = valid_len
+        self.prices = np.ndarray((len(REQUIRED_COLUMNS), len(valid_len), WINDOW),
+                                 dtype=np.float64, buffer=shm.buf)
+
+    @classmethod
+    def create(cls, frames: Dict[str, Optional[pd.DataFrame]]) -> 'SharedPriceBlock':
+        """Allocate a block and copy the given frames into it"""
+        tickers = [ticker for ticker, frame in frames.items() if frame is not None]
+        shape = (len(REQUIRED_COLUMNS), len(tickers), WINDOW)
+        shm = SharedMemory(create=True, size=max(1, int(np.prod(shape)) * 8))
+
+        prices = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        _, valid_len = stack_columns([frames[t] for t in tickers], REQUIRED_COLUMNS, out=prices)
+        ticker_to_row = {t: row for row, t in enumerate(tickers) if valid_len[row] >= 0}
+        return cls(shm, ticker_to_row, valid_len, owner=True)
+
+    @classmethod
+    def attach(cls, handle: Tuple) -> 'SharedPriceBlock':
+        """Attach to a block created in another process from its handle()"""
+        name, ticker_to_row, valid_len = handle
+        shm = SharedMemory(name=name)
+        return cls(shm, ticker_to_row, valid_len, owner=False)
+
+    @property
+    def name(self) -> str:
+        """Name of the underlying shared memory block"""
+        return self._shm.name
+
+    def handle(self) -> Tuple:
+        """Small picklable description used by attach()"""
+        return self.name, self.ticker_to_row, self.valid_len
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self.ticker_to_row
+
+    def frame(self, ticker: str) -> pd.DataFrame:
+        """Rebuild a ticker's price frame from its row in the block"""
+        row = self.ticker_to_row[ticker]
+        n = self.valid_len[row]
+        return pd.DataFrame({column: self.prices[c, row, :n]
+                             for c, column in enumerate(REQUIRED_COLUMNS)})
+
+    def release(self):
+        """Close this process's mapping; the creator also unlinks the block"""
+        self.prices = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
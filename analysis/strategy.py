@@ -2,28 +2,130 @@
 import json
 import logging
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from operator import itemgetter
 
 # Third-party imports
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import streamlit as st
+from numpy.lib.stride_tricks import sliding_window_view
 
 # Local application imports
+from analysis.indicator_kernels import TECH_SCORE_TABLE, TECH_WEIGHTS
 from data.db_integration import (
     get_cached_stock_data, get_cached_fundamentals,
     cache_stock_data, cache_fundamentals,
-    store_analysis_result
+    store_analysis_results_bulk
 )
 from data.stock_data import StockDataFetcher
+from utils.numba_compat import njit
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 
+# Minimum spacing between API fetches, shared by all batch_analyze threads
+API_CALL_INTERVAL = 0.1
+_API_THROTTLE_LOCK = threading.Lock()
+_last_api_call = 0.0
+
+
+def _throttle_api_call():
+    """Wait until at least API_CALL_INTERVAL has passed since the last API fetch"""
+    global _last_api_call
+    with _API_THROTTLE_LOCK:
+        wait = _last_api_call + API_CALL_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _last_api_call = time.monotonic()
+
+
+@njit(cache=True)
+def _rsi_smooth(deltas, rsi, up, down, window):
+    """Wilder-smooth the RSI from index window+1 onwards, in place"""
+    for i in range(window + 1, len(rsi)):
+        delta = deltas[i - 1]  # Adjust index
+
+        if delta > 0:
+            upval = delta
+            downval = 0.0
+        else:
+            upval = 0.0
+            downval = -delta
+
+        # Use EMA for calculating averages
+        up = (up * (window - 1) + upval) / window
+        down = (down * (window - 1) + downval) / window
+
+        # Avoid division by zero
+        if down != 0:
+            rs = up / down
+        else:
+            rs = 999.0
+        rsi[i] = 100. - (100. / (1. + rs))
+    return rsi
+
+
+# Columns of historical_data drawn by plot_analysis
+HISTORY_PLOT_COLUMNS = ('close', 'MA4', 'MA40', 'RSI')
+
+
+def _compact_history(processed_hist):
+    """
+    Keep only the plotted columns of a processed history, as one NumPy
+    array per column (dates plus float32 values) instead of a DataFrame.
+    """
+    history = {'date': processed_hist.index.to_numpy()}
+    for column in HISTORY_PLOT_COLUMNS:
+        if column in processed_hist.columns:
+            history[column] = processed_hist[column].to_numpy(dtype=np.float32)
+    return history
+
+
+def _history_arrays(historical_data):
+    """Plot columns of a DataFrame or compact history as arrays, None if empty"""
+    if historical_data is None:
+        return None
+    if isinstance(historical_data, pd.DataFrame):
+        if historical_data.empty:
+            return None
+        historical_data = {'date': historical_data.index.to_numpy(),
+                           **{column: historical_data[column].to_numpy()
+                              for column in HISTORY_PLOT_COLUMNS
+                              if column in historical_data.columns}}
+    return historical_data if len(historical_data['date']) else None
+
+
+def _sma(values, window):
+    """
+    Simple moving average of a float array from one cumulative sum, NaN for
+    the first window - 1 positions like rolling(window).mean().
+    """
+    sums = np.empty(values.size + 1)
+    sums[0] = 0.0
+    np.cumsum(values, out=sums[1:])
+    sma = np.full(values.size, np.nan)
+    if values.size >= window:
+        sma[window - 1:] = (sums[window:] - sums[:-window]) / window
+    return sma
+
+
+# Ratio metrics of the fundamental analysis: each available value is kept
+# in the result and adds its points to the fundamental score when it passes
+FUNDAMENTAL_RATIO_RULES = (
+    ('debt_to_equity', lambda v: v < 1.5, 20),     # Healthy debt levels
+    ('return_on_equity', lambda v: v > 0.15, 20),  # Good ROE (> 15%)
+    ('price_to_book', lambda v: 0 < v < 3, 10),    # Value play
+)
+
 
 class ValueMomentumStrategy:
+    # Threads used by batch_analyze; each analysis mostly waits on the
+    # database or the APIs
+    BATCH_WORKERS = 8
+
     def __init__(self):
         """Initialize the Value Momentum Strategy with database-first approach"""
         # Configuration parameters
@@ -63,47 +165,40 @@ class ValueMomentumStrategy:
             return np.ones_like(prices) * 100
 
         rs = up / down
-        rsi = np.zeros_like(prices)
+        rsi = np.zeros_like(prices, dtype=np.float64)
         rsi[:window+1] = 100. - (100. / (1. + rs))
 
         # Calculate RSI for the rest of the price data
-        for i in range(window+1, len(prices)):
-            delta = deltas[i-1]  # Adjust index
-
-            if delta > 0:
-                upval = delta
-                downval = 0
-            else:
-                upval = 0
-                downval = -delta
-
-            # Use EMA for calculating averages
-            up = (up * (window - 1) + upval) / window
-            down = (down * (window - 1) + downval) / window
-
-            rs = up / down if down != 0 else 999  # Avoid division by zero
-            rsi[i] = 100. - (100. / (1. + rs))
-
-        return rsi
+        return _rsi_smooth(np.ascontiguousarray(deltas, dtype=np.float64),
+                           rsi, float(up), float(down), window)
 
     def _calculate_higher_lows(self, data, lookback=10):
         """Helper function to identify higher lows"""
         if 'low' not in data.columns or data.empty:
             return pd.Series(np.zeros(len(data)))
 
-        highs_lows = pd.DataFrame()
-        highs_lows['min'] = data['low'].rolling(
-            window=lookback, center=True).min()
+        rolling_min = data['low'].rolling(
+            window=lookback, center=True).min().to_numpy(dtype=float)
 
-        # Simple heuristic to identify higher lows
+        # Simple heuristic to identify higher lows: position i is flagged
+        # when the rolling lows over [i - lookback, i) strictly increase
         higher_lows = np.zeros(len(data))
-
-        for i in range(lookback*2, len(data)):
-            min_values = highs_lows['min'].iloc[i-lookback:i].dropna()
-            if len(min_values) >= 2:  # Ensure we have enough data
-                diffs = min_values.diff().dropna()
-                if len(diffs) > 0 and (diffs > 0).all():
-                    higher_lows[i] = 1
+        if len(data) <= lookback * 2:
+            return pd.Series(higher_lows, index=data.index)
+
+        # windows[k] covers rolling_min[k + lookback:k + 2 * lookback], i.e.
+        # the lookback values before position i = k + 2 * lookback
+        windows = sliding_window_view(rolling_min, lookback)[lookback:len(data) - lookback]
+
+        # Windows with gaps compare only their available values: forward-fill
+        # each window so every value is compared with the last one before it
+        valid = ~np.isnan(windows)
+        last_valid = np.where(valid, np.arange(lookback), 0)
+        np.maximum.accumulate(last_valid, axis=1, out=last_valid)
+        previous = np.take_along_axis(windows, last_valid, axis=1)[:, :-1]
+        compared = valid[:, 1:] & ~np.isnan(previous)
+        rising = np.where(compared, windows[:, 1:] > previous, True).all(axis=1)
+        higher_lows[lookback * 2:][rising & (valid.sum(axis=1) >= 2)] = 1
 
         return pd.Series(higher_lows, index=data.index)
 
@@ -131,7 +226,7 @@ class ValueMomentumStrategy:
             name, stock_info = self._get_stock_info(ticker, fundamentals)
 
             # Step 3: Calculate price
-            price = stock_data['close'].iloc[-1] if not stock_data.empty else 0
+            price = stock_data['close'].to_numpy()[-1]
 
             # Step 4: Calculate signals and scores using BATCH ANALYSIS METHOD
             # Calculate technical indicators first
@@ -163,7 +258,7 @@ class ValueMomentumStrategy:
             fund_check = fundamental_pass
 
             # Step 6: Process historical data to add indicators
-            processed_hist = self._process_historical_data(stock_data)
+            processed_hist = self._process_historical_data(stock_data, indicators)
 
             # Step 7: Create results dictionary (ALIGNED WITH BATCH ANALYSIS)
             result = {
@@ -217,6 +312,7 @@ class ValueMomentumStrategy:
         # Only fetch from API if bulk loader found nothing
         if stock_data is None or stock_data.empty:
             self.logger.info(f"No cached data for {ticker}, fetching from APIs")
+            _throttle_api_call()
             stock_data = self.data_fetcher.get_stock_data(
                 ticker, '1d', '1y', attempt_fallback=True)
             data_source = "api"
@@ -236,89 +332,41 @@ class ValueMomentumStrategy:
             self.logger.warning(f"Could not get stock info for {ticker}: {e}")
             return ticker, {'name': ticker}
             
-    def _process_historical_data(self, stock_data):
-        """Process historical data to add technical indicators"""
-        # Make a copy to avoid modifying original data
-        processed_hist = stock_data.copy()
-        
-        # Add moving averages
-        processed_hist['MA4'] = processed_hist['close'].rolling(
-            window=20).mean()  # 20 trading days ≈ 4 weeks
-        processed_hist['MA40'] = processed_hist['close'].rolling(
-            window=200).mean()  # 200 trading days ≈ 40 weeks
-            
-        # Add RSI
-        processed_hist['RSI'] = self.calculate_rsi(
-            processed_hist['close'].values, window=self.rsi_period)
-            
-        return processed_hist
-
-    def _calculate_technical_indicators(self, hist):
-        """Calculate technical indicators from historical price data"""
-        # Make a copy of the dataframe to avoid warnings
-        data = hist.copy()
-
-        # Check for empty dataframes
-        if data.empty:
-            return {
-                "above_ma40": False,
-                "above_ma4": False,
-                "rsi_above_50": False,
-                "higher_lows": False,
-                "near_52w_high": False,
-                "breakout": False
-            }
+    def _process_historical_data(self, stock_data, indicators=None):
+        """
+        Process historical data to add technical indicators.
 
-        # Ensure we have enough data
-        if len(hist) < max(self.ma_long, 52):  # Need at least 40 weeks (or as specified for MA40)
-            return {
-                "above_ma40": False,
-                "above_ma4": False,
-                "rsi_above_50": False,
-                "higher_lows": False,
-                "near_52w_high": False,
-                "breakout": False
-            }
+        The 20- and 200-day moving averages are taken from indicators (the
+        output of calculate_all_indicators for the same data) when present
+        instead of being rolled over the close column again; otherwise they
+        come from one cumulative sum (_sma).
+        """
+        indicators = indicators or {}
+        close = stock_data['close']
+        close_values = close.to_numpy(dtype=np.float64)
+
+        def moving_average(key, window):
+            if indicators.get(key) is not None:
+                return indicators[key]
+            # A NaN would carry through the running sum of _sma, while
+            # rolling() recovers once it leaves the window
+            if np.isnan(close_values).any():
+                return close.rolling(window=window).mean()
+            return _sma(close_values, window)
+
+        # Add moving averages and RSI to a shallow copy: the price columns
+        # are shared with stock_data, only the new columns are allocated.
+        # They are computed in float64 but only drawn by plot_analysis, so
+        # they are stored as float32; no signal is derived from them
+        processed_hist = stock_data.copy(deep=False)
+        processed_hist['MA4'] = np.asarray(
+            moving_average('ma4', 20), dtype=np.float32)  # 20 trading days ≈ 4 weeks
+        processed_hist['MA40'] = np.asarray(
+            moving_average('ma40', 200), dtype=np.float32)  # 200 trading days ≈ 40 weeks
+        processed_hist['RSI'] = self.calculate_rsi(
+            close_values, window=self.rsi_period).astype(np.float32)
 
-        # Calculate moving averages
-        data['MA4'] = data['close'].rolling(
-            window=20).mean()  # 20 trading days ≈ 4 weeks
-        data['MA40'] = data['close'].rolling(
-            window=200).mean()  # 200 trading days ≈ 40 weeks
-
-        # Calculate RSI with our improved function
-        data['RSI'] = self.calculate_rsi(
-            data['close'].values, window=self.rsi_period)
-
-        # Calculate higher lows (using new function)
-        data['higher_lows'] = self._calculate_higher_lows(data)
-
-        # 52-week highest level
-        data['52w_high'] = data['high'].rolling(
-            window=252).max()  # 252 trading days ≈ 52 weeks
-        # Within 2% of highest level
-        data['at_52w_high'] = (
-            data['close'] >= data['52w_high'] * self.near_high_threshold)
-
-        # Consolidation phase breakout (simple implementation)
-        data['volatility'] = data['close'].pct_change().rolling(window=12).std()
-        data['breakout'] = (data['volatility'].shift(4) < data['volatility']) & (
-            data['close'] > data['close'].shift(4))
-
-        # Get the latest data point
-        latest = data.iloc[-1]
-
-        # Return technical indicators as a dictionary
-        return {
-            "above_ma40": latest['close'] > latest['MA40'] if not np.isnan(latest['MA40']) else False,
-            "above_ma4": latest['close'] > latest['MA4'] if not np.isnan(latest['MA4']) else False,
-            "rsi_above_50": latest['RSI'] > self.rsi_threshold if not np.isnan(latest['RSI']) else False,
-            # Add actual RSI value
-            "rsi": float(latest['RSI']) if not np.isnan(latest['RSI']) else None,
-            "higher_lows": bool(latest['higher_lows']),
-            "near_52w_high": bool(latest['at_52w_high']),
-            "breakout": bool(latest['breakout'])
-        }
+        return processed_hist
 
     def _calculate_fundamental_indicators(self, fundamentals, stock_info):
         """Enhanced fundamental analysis with additional metrics"""
@@ -338,17 +386,18 @@ class ValueMomentumStrategy:
             "fundamental_score": 0
         }
 
+        fundamentals = fundamentals or {}
         try:
             # Check if company is profitable
-            profit_margin = fundamentals.get('profit_margin') if fundamentals else None
+            profit_margin = fundamentals.get('profit_margin')
             results["is_profitable"] = profit_margin is not None and profit_margin > 0
 
             # Get P/E ratio
-            pe_ratio = fundamentals.get('pe_ratio') if fundamentals else None
+            pe_ratio = fundamentals.get('pe_ratio')
             results["pe_ratio"] = pe_ratio
 
             # Get revenue growth
-            revenue_growth = fundamentals.get('revenue_growth') if fundamentals else None
+            revenue_growth = fundamentals.get('revenue_growth')
             if revenue_growth is not None and pd.notna(revenue_growth):
                 results["revenue_growth"] = revenue_growth
 
@@ -356,29 +405,13 @@ class ValueMomentumStrategy:
             if profit_margin is not None and pd.notna(profit_margin):
                 results["profit_margin"] = profit_margin
 
-            # NEW: Add debt analysis
-            debt_to_equity = fundamentals.get('debt_to_equity') if fundamentals else None
-            if debt_to_equity is not None:
-                results["debt_to_equity"] = debt_to_equity
-                # Healthy debt levels (< 1.5)
-                if debt_to_equity < 1.5:
-                    results["fundamental_score"] += 20
-            
-            # NEW: Add ROE analysis
-            roe = fundamentals.get('return_on_equity') if fundamentals else None
-            if roe is not None:
-                results["return_on_equity"] = roe
-                # Good ROE (> 15%)
-                if roe > 0.15:
-                    results["fundamental_score"] += 20
-            
-            # NEW: Add P/B analysis
-            pb_ratio = fundamentals.get('price_to_book') if fundamentals else None
-            if pb_ratio is not None:
-                results["price_to_book"] = pb_ratio
-                # Value play (P/B < 3)
-                if pb_ratio < 3 and pb_ratio > 0:
-                    results["fundamental_score"] += 10
+            # Debt, ROE and P/B analysis
+            for key, passes, points in FUNDAMENTAL_RATIO_RULES:
+                value = fundamentals.get(key)
+                if value is not None:
+                    results[key] = value
+                    if passes(value):
+                        results["fundamental_score"] += points
 
             # Get earnings trend data
             try:
@@ -398,12 +431,10 @@ class ValueMomentumStrategy:
             has_growth = results["revenue_growth"] is not None and results["revenue_growth"] > 0
 
             # Enhanced fundamental scoring
-            if results["is_profitable"]:
-                results["fundamental_score"] += 30
-            if results["reasonable_pe"]:
-                results["fundamental_score"] += 20
-            if has_growth:
-                results["fundamental_score"] += 10
+            results["fundamental_score"] += sum(
+                points for passed, points in (
+                    (profitable, 30), (reasonable_pe, 20), (has_growth, 10))
+                if passed)
 
             # Pass the fundamental check if profitable and reasonable P/E
             results["fundamental_check"] = profitable and reasonable_pe
@@ -416,34 +447,21 @@ class ValueMomentumStrategy:
 
     def calculate_tech_score(self, tech_analysis):
         """Calculate a technical score from 0-100 based on technical indicators"""
-        # Define the weight of each technical factor
-        weights = {
-            'above_ma40': 0.25,     # Primary trend
-            'above_ma4': 0.15,      # Short-term momentum
-            'rsi_above_50': 0.15,   # RSI momentum
-            'higher_lows': 0.15,    # Price structure
-            'near_52w_high': 0.20,  # Relative strength
-            'breakout': 0.10        # Volatility expansion
-        }
-
-        # Calculate weighted score
-        score = 0
-        total_weight = 0
-
-        for factor, weight in weights.items():
-            if factor in tech_analysis:
-                value = tech_analysis[factor]
-                if value is not None:  # Only consider valid values
-                    score += weight * (100 if value else 0)
-                    total_weight += weight
-
-        # Normalize score if we have valid factors
-        if total_weight > 0:
-            score = score / total_weight
-        else:
-            score = 0
-
-        return round(score)
+        # Each technical factor and its weight (primary trend, short-term
+        # momentum, RSI momentum, price structure, relative strength and
+        # volatility expansion) are listed in TECH_WEIGHTS. Only valid values
+        # count: pack which factors are present and which are true, and look
+        # the normalized, rounded score up in the precomputed table
+        known = 0
+        value = 0
+        for bit, (factor, _) in enumerate(TECH_WEIGHTS):
+            flag = tech_analysis.get(factor)
+            if flag is not None:
+                known |= 1 << bit
+                if flag:
+                    value |= 1 << bit
+
+        return int(TECH_SCORE_TABLE[known, value])
 
     def analyze_stocks_bulk(self, tickers: list, progress_callback=None) -> list:
         """
@@ -480,33 +498,57 @@ class ValueMomentumStrategy:
         """
         Analyze multiple stocks and return a list of analysis results.
         Also stores results in the database.
-        """
-        results = []
 
-        for i, ticker in enumerate(tickers):
-            # Update progress
-            if progress_callback:
-                progress = (i / len(tickers))
-                progress_callback(progress, f"Analyzing {ticker}...")
-
-            # Analyze stock
-            result = self.analyze_stock(ticker)
-            results.append(result)
-
-            # Save to database if analysis was successful
-            if "error" not in result or result["error"] is None:
-                try:
-                    store_analysis_result(ticker, result)
-                except Exception as e:
-                    self.logger.warning(
-                        f"Could not store analysis result for {ticker}: {e}")
-
-            # Small delay to prevent rate limiting
-            time.sleep(0.1)
+        Unlike analyze_stock, the historical_data of each result only holds
+        the plotted columns (see _compact_history).
+        """
+        # Load prices and fundamentals of the whole batch in one go; the
+        # worker threads then only read from the loader
+        if tickers:
+            self.preload_data_bulk(tickers)
+
+        # Report progress about every 1% of the tickers rather than for each
+        # one, since every update re-renders the Streamlit UI
+        progress_step = max(1, len(tickers) // 100)
+
+        # Results keep the input order so ties in the sort below do not
+        # depend on which thread finished first
+        results = [None] * len(tickers)
+
+        with ThreadPoolExecutor(max_workers=self.BATCH_WORKERS) as executor:
+            futures = {executor.submit(self.analyze_stock, ticker): i
+                       for i, ticker in enumerate(tickers)}
+
+            for done, future in enumerate(as_completed(futures)):
+                i = futures[future]
+                ticker = tickers[i]
+                result = future.result()
+                # The batch keeps every result in memory, so only the
+                # plotted history columns are kept, as compact arrays
+                if isinstance(result.get('historical_data'), pd.DataFrame):
+                    result['historical_data'] = _compact_history(result['historical_data'])
+                results[i] = result
+
+                # Update progress
+                if progress_callback and done % progress_step == 0:
+                    progress = (done / len(tickers))
+                    progress_callback(progress, f"Analyzed {ticker}...")
+
+        # Save successful analyses to the database in one transaction
+        to_store = [(ticker, result) for ticker, result in zip(tickers, results)
+                    if "error" not in result or result["error"] is None]
+        if to_store:
+            try:
+                store_analysis_results_bulk(to_store)
+            except Exception as e:
+                self.logger.warning(f"Could not store analysis results: {e}")
 
-        # Sort by tech score (descending)
-        results.sort(key=lambda x: x.get('tech_score', 0)
-                     if x.get('error') is None else -1, reverse=True)
+        # Sort by tech score (descending), failed analyses last; every
+        # successful result carries a tech score
+        analyzed = [r for r in results if r.get('error') is None]
+        failed = [r for r in results if r.get('error') is not None]
+        analyzed.sort(key=itemgetter('tech_score'), reverse=True)
+        results = analyzed + failed
 
         # Final update
         if progress_callback:
@@ -525,31 +567,34 @@ class ValueMomentumStrategy:
         - Matplotlib figure
         """
         # Check if we have valid historical data
-        if "historical_data" not in analysis or analysis["historical_data"] is None or analysis["historical_data"].empty:
+        data = _history_arrays(analysis.get("historical_data"))
+        if data is None:
             return None
 
-        # Get historical data
-        data = analysis["historical_data"]
+        dates = data['date']
+
+        # Imported here so headless batch runs never load matplotlib
+        import matplotlib.pyplot as plt
 
         # Create figure and subplots
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8), height_ratios=[
             3, 1], sharex=True, gridspec_kw={'hspace': 0.05})
 
         # Plot main price chart with moving averages
-        ax1.plot(data.index, data['close'],
+        ax1.plot(dates, data['close'],
                  label='Price', color='black', linewidth=1.5)
 
-        if 'MA4' in data.columns and not data['MA4'].isna().all():
+        if 'MA4' in data and not np.isnan(data['MA4']).all():
             ax1.plot(
-                data.index, data['MA4'], label=f'MA4 (Short)', color='blue', linewidth=1)
+                dates, data['MA4'], label=f'MA4 (Short)', color='blue', linewidth=1)
 
-        if 'MA40' in data.columns and not data['MA40'].isna().all():
+        if 'MA40' in data and not np.isnan(data['MA40']).all():
             ax1.plot(
-                data.index, data['MA40'], label=f'MA40 (Primary)', color='red', linewidth=1)
+                dates, data['MA40'], label=f'MA40 (Primary)', color='red', linewidth=1)
 
         # Add key technical markers
-        last_date = data.index[-1]
-        last_price = data['close'].iloc[-1]
+        last_date = dates[-1]
+        last_price = data['close'][-1]
 
         # Add buy/sell annotation
         signal_color = 'green' if analysis['buy_signal'] else 'red' if analysis['sell_signal'] else 'orange'
@@ -572,8 +617,8 @@ class ValueMomentumStrategy:
         ax1.grid(True, alpha=0.3)
 
         # Plot RSI
-        if 'RSI' in data.columns and not data['RSI'].isna().all():
-            ax2.plot(data.index, data['RSI'],
+        if 'RSI' in data and not np.isnan(data['RSI']).all():
+            ax2.plot(dates, data['RSI'],
                      label='RSI', color='purple', linewidth=1)
             ax2.axhline(y=70, color='red', linestyle='--', alpha=0.5)
             ax2.axhline(y=50, color='black', linestyle='--', alpha=0.5)
@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from config import (
     DEFAULT_SHORT_WINDOW,
     DEFAULT_MEDIUM_WINDOW,
@@ -9,17 +10,94 @@ from config import (
     DEFAULT_MACD_SLOW,
     DEFAULT_MACD_SIGNAL
 )
+from analysis.indicator_kernels import ewm_mean, rolling_mean, rolling_std
+from utils.numba_compat import NUMBA_AVAILABLE
+
+def _rolling_max(values, window):
+    """Rolling max of an array, NaN-padded like Series.rolling(window).max()"""
+    values = np.asarray(values, dtype=float)
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1:] = sliding_window_view(values, window).max(axis=1)
+    return out
+
+def _rolling_min(values, window):
+    """Rolling min of an array, NaN-padded like Series.rolling(window).min()"""
+    values = np.asarray(values, dtype=float)
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1:] = sliding_window_view(values, window).min(axis=1)
+    return out
+
+def _window_max(values, end, window):
+    """Max of the window ending before position end, NaN if it is incomplete
+    (the rolling(window).max() value at end - 1)"""
+    return values[end - window:end].max() if window <= end <= len(values) else np.nan
+
+def _window_min(values, end, window):
+    """Min of the window ending before position end, NaN if it is incomplete
+    (the rolling(window).min() value at end - 1)"""
+    return values[end - window:end].min() if window <= end <= len(values) else np.nan
+
+def _kernel_values(prices):
+    """
+    A price Series as a NumPy array when the compiled rolling kernels can
+    stand in for pandas rolling(), else None (no Numba, or not a plain
+    float column)
+    """
+    if NUMBA_AVAILABLE and isinstance(prices.dtype, np.dtype) and prices.dtype.kind == 'f':
+        return prices.to_numpy()
+    return None
+
+def _kernel_close(data):
+    """_kernel_values of the close column"""
+    return _kernel_values(data['close'])
 
 def calculate_sma(data, window):
     """Calculate Simple Moving Average."""
+    values = _kernel_close(data)
+    if values is not None:
+        return pd.Series(rolling_mean(values.astype(np.float64), window),
+                         index=data.index, name='close')
     return data['close'].rolling(window=window).mean()
 
+def _kernel_close_no_gaps(data):
+    """_kernel_close for the EWM kernel, which only takes complete columns"""
+    values = _kernel_close(data)
+    if values is None or np.isnan(values).any():
+        return None
+    return values.astype(np.float64)
+
 def calculate_ema(data, window):
     """Calculate Exponential Moving Average."""
+    values = _kernel_close_no_gaps(data)
+    if values is not None:
+        return pd.Series(ewm_mean(values, window), index=data.index, name='close')
     return data['close'].ewm(span=window, adjust=False).mean()
 
+def _rsi_array(values, period):
+    """The steps of calculate_rsi on a _kernel_close array"""
+    # Differences are taken in the column's own dtype, as Series.diff()
+    # takes them
+    delta = np.full(len(values), np.nan)
+    delta[1:] = np.diff(values)
+    # Branchless gain/loss split without mask arrays. fmax/fmin turn NaN
+    # differences into 0 like where() does, and the losses keep the -0.0
+    # of -delta.where(delta < 0, 0), which the rolling mean's sign checks see
+    gain = np.fmax(delta, 0.0)
+    loss = np.fmin(delta, 0.0)
+    np.negative(loss, out=loss)
+    avg_gain = rolling_mean(gain, period)
+    avg_loss = rolling_mean(loss, period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
 def calculate_rsi(data, period=DEFAULT_RSI_PERIOD):
     """Calculate Relative Strength Index."""
+    values = _kernel_close(data)
+    if values is not None:
+        return pd.Series(_rsi_array(values, period), index=data.index, name='close')
+
     delta = data['close'].diff()
     
     # Get gains and losses
@@ -38,8 +116,24 @@ def calculate_rsi(data, period=DEFAULT_RSI_PERIOD):
     
     return rsi
 
+def _macd_arrays(values, fast_period, slow_period, signal_period):
+    """The steps of calculate_macd on a _kernel_close_no_gaps array"""
+    macd_line = ewm_mean(values, fast_period) - ewm_mean(values, slow_period)
+    signal_line = ewm_mean(macd_line, signal_period)
+    return {
+        'macd': macd_line,
+        'signal': signal_line,
+        'histogram': macd_line - signal_line
+    }
+
 def calculate_macd(data, fast_period=DEFAULT_MACD_FAST, slow_period=DEFAULT_MACD_SLOW, signal_period=DEFAULT_MACD_SIGNAL):
     """Calculate MACD (Moving Average Convergence Divergence)."""
+    values = _kernel_close_no_gaps(data)
+    if values is not None:
+        # Same steps as below on arrays, one DataFrame at the end
+        return pd.DataFrame(_macd_arrays(values, fast_period, slow_period, signal_period),
+                            index=data.index)
+
     # Calculate the fast and slow EMAs
     ema_fast = data['close'].ewm(span=fast_period, adjust=False).mean()
     ema_slow = data['close'].ewm(span=slow_period, adjust=False).mean()
@@ -59,12 +153,30 @@ def calculate_macd(data, fast_period=DEFAULT_MACD_FAST, slow_period=DEFAULT_MACD
         'histogram': histogram
     })
 
+def _bollinger_arrays(values, window, num_std):
+    """The steps of calculate_bollinger_bands on a float64 array"""
+    sma = rolling_mean(values, window)
+    # The band width is computed once for both bands
+    width = rolling_std(values, window)
+    width *= num_std
+    return {
+        'upper': sma + width,
+        'middle': sma,
+        'lower': sma - width
+    }
+
 def calculate_bollinger_bands(data, window=20, num_std=2):
     """Calculate Bollinger Bands for volatility analysis"""
     if isinstance(data, pd.DataFrame):
         prices = data['close']
     else:
         prices = data
+
+    values = _kernel_values(prices)
+    if values is not None:
+        return {band: pd.Series(band_values, index=prices.index, name=prices.name)
+                for band, band_values in _bollinger_arrays(
+                    values.astype(np.float64), window, num_std).items()}
     
     sma = prices.rolling(window=window).mean()
     std = prices.rolling(window=window).std()
@@ -88,17 +200,17 @@ def detect_price_pattern(data):
     low_52w = year_data['low'].min()
     
     # Current price
-    current_price = data['close'].iloc[-1]
+    current_price = data['close'].to_numpy()[-1]
     
     # Calculate proximity to 52-week high/low
     proximity_to_high = (current_price - low_52w) / (high_52w - low_52w) if (high_52w - low_52w) > 0 else 0
     
     # Check for higher lows pattern (uptrend)
-    lows = recent_data['low'].rolling(window=10).min()
+    lows = pd.Series(_rolling_min(recent_data['low'].to_numpy(), 10))
     higher_lows = lows.is_monotonic_increasing
     
     # Check for lower highs pattern (downtrend)
-    highs = recent_data['high'].rolling(window=10).max()
+    highs = pd.Series(_rolling_max(recent_data['high'].to_numpy(), 10))
     lower_highs = highs.is_monotonic_decreasing
     
     # Check if near 52-week high or low
@@ -118,32 +230,32 @@ def detect_price_pattern(data):
 
 def detect_breakout(data, window=20):
     """Detect price breakouts."""
-    # Calculate recent volatility
-    volatility = data['close'].pct_change().std() * np.sqrt(252)
-    
-    # Calculate upper and lower channel
-    upper_channel = data['high'].rolling(window=window).max()
-    lower_channel = data['low'].rolling(window=window).min()
-    
-    # Current price
-    current_price = data['close'].iloc[-1]
-    prev_price = data['close'].iloc[-2] if len(data) > 1 else current_price
-    
-    # Previous upper and lower channel values
-    prev_upper = upper_channel.iloc[-2] if len(upper_channel) > 1 else upper_channel.iloc[-1]
-    prev_lower = lower_channel.iloc[-2] if len(lower_channel) > 1 else lower_channel.iloc[-1]
+    # Current price (positional reads go through NumPy, not iloc)
+    close = data['close'].to_numpy()
+    current_price = close[-1]
+    prev_price = close[-2] if len(close) > 1 else current_price
+    
+    # Previous upper and lower channel values; only the channel window
+    # ending at the previous bar is needed, not the whole rolling series
+    high = data['high'].to_numpy(dtype=float)
+    low = data['low'].to_numpy(dtype=float)
+    prev_end = len(close) - 1 if len(close) > 1 else len(close)
+    prev_upper = _window_max(high, prev_end, window)
+    prev_lower = _window_min(low, prev_end, window)
     
     # Check for breakouts
     breakout_up = current_price > prev_upper and prev_price <= prev_upper
     breakout_down = current_price < prev_lower and prev_price >= prev_lower
     
     # Significant volume increase?
-    avg_volume = data['volume'].rolling(window=window).mean().iloc[-1]
-    current_volume = data['volume'].iloc[-1]
+    avg_volume = data['volume'].rolling(window=window).mean().to_numpy()[-1]
+    current_volume = data['volume'].to_numpy()[-1]
     volume_surge = current_volume > avg_volume * 1.5 if not pd.isna(avg_volume) and avg_volume > 0 else False
     
-    # Breakout strength based on volatility
+    # Breakout strength based on volatility; the annualized volatility of
+    # the whole series is only needed when there is a breakout
     if breakout_up or breakout_down:
+        volatility = data['close'].pct_change().std() * np.sqrt(252)
         channel_width = (prev_upper - prev_lower) / prev_lower
         strength = channel_width / volatility if volatility > 0 else 0
     else:
@@ -172,11 +284,10 @@ def calculate_52week_high_proximity(data):
     try:
         # Use up to 252 trading days (approximately one year)
         lookback = min(252, len(data))
-        year_data = data[-lookback:].copy()
         
         # Find 52-week high and current price
-        high_52w = year_data['high'].max()
-        current_price = data['close'].iloc[-1]
+        high_52w = data['high'].iloc[-lookback:].max()
+        current_price = data['close'].to_numpy()[-1]
         
         # Calculate proximity (0 = at high, 1 = far below)
         proximity = (high_52w - current_price) / high_52w if high_52w > 0 else 1.0
@@ -187,6 +298,26 @@ def calculate_52week_high_proximity(data):
         print(f"Error calculating 52-week high: {e}")
         return 0, 1.0
 
+def _close_indicator_arrays(data, sma_windows, ema_windows):
+    """
+    The close-based indicators of calculate_all_indicators (SMAs, EMAs, RSI,
+    MACD and Bollinger bands) as arrays, all computed from one read of the
+    close column.
+    None when the compiled kernels cannot stand in for pandas (see
+    _kernel_close and _kernel_close_no_gaps).
+    """
+    values = _kernel_close(data)
+    if values is None or np.isnan(values).any():
+        return None
+    close = values.astype(np.float64)
+    return {
+        'sma': {window: rolling_mean(close, window) for window in sma_windows},
+        'ema': {window: ewm_mean(close, window) for window in ema_windows},
+        'rsi': _rsi_array(values, DEFAULT_RSI_PERIOD),
+        'macd': _macd_arrays(close, DEFAULT_MACD_FAST, DEFAULT_MACD_SLOW, DEFAULT_MACD_SIGNAL),
+        'bollinger': _bollinger_arrays(close, 20, 2),
+    }
+
 def calculate_all_indicators(data):
     """Calculate all technical indicators for a dataset."""
     if data.empty:
@@ -200,34 +331,57 @@ def calculate_all_indicators(data):
         # Store original data for reference
         result = {'original_data': data}
         
+        # Each distinct SMA window is rolled over the close column once and
+        # shared by the keys that use it
+        sma_windows = {DEFAULT_SHORT_WINDOW, DEFAULT_MEDIUM_WINDOW, DEFAULT_LONG_WINDOW, 20, 200}
+        ema_windows = {DEFAULT_SHORT_WINDOW, DEFAULT_MEDIUM_WINDOW, DEFAULT_LONG_WINDOW}
+
+        # The close-based indicators come from one read of the close column
+        # and are wrapped in Series only at the end; otherwise (no Numba,
+        # gaps in the column) each calculate_* function reads it
+        arrays = _close_indicator_arrays(data, sma_windows, ema_windows)
+        if arrays is not None:
+            def series(values, name='close'):
+                return pd.Series(values, index=data.index, name=name)
+
+            sma = {window: series(values) for window, values in arrays['sma'].items()}
+            ema = {window: series(values) for window, values in arrays['ema'].items()}
+            rsi = series(arrays['rsi'])
+            macd_data = {name: series(values, name) for name, values in arrays['macd'].items()}
+            bollinger = {band: series(values) for band, values in arrays['bollinger'].items()}
+        else:
+            sma = {window: calculate_sma(data, window) for window in sma_windows}
+            ema = {window: calculate_ema(data, window) for window in ema_windows}
+            rsi = calculate_rsi(data)
+            macd_data = calculate_macd(data)
+            bollinger = calculate_bollinger_bands(data)
+
         # Standard technical indicators
-        result['sma_short'] = calculate_sma(data, DEFAULT_SHORT_WINDOW)
-        result['sma_medium'] = calculate_sma(data, DEFAULT_MEDIUM_WINDOW)
-        result['sma_long'] = calculate_sma(data, DEFAULT_LONG_WINDOW)
+        result['sma_short'] = sma[DEFAULT_SHORT_WINDOW]
+        result['sma_medium'] = sma[DEFAULT_MEDIUM_WINDOW]
+        result['sma_long'] = sma[DEFAULT_LONG_WINDOW]
         
         # Calculate EMAs
-        result['ema_short'] = calculate_ema(data, DEFAULT_SHORT_WINDOW)
-        result['ema_medium'] = calculate_ema(data, DEFAULT_MEDIUM_WINDOW)
-        result['ema_long'] = calculate_ema(data, DEFAULT_LONG_WINDOW)
+        result['ema_short'] = ema[DEFAULT_SHORT_WINDOW]
+        result['ema_medium'] = ema[DEFAULT_MEDIUM_WINDOW]
+        result['ema_long'] = ema[DEFAULT_LONG_WINDOW]
         
         # Value & Momentum Strategy specific indicators
         # MA4 (4-week moving average) for short-term momentum
-        result['ma4'] = calculate_sma(data, 20)  # Assuming 20 trading days = ~4 weeks
+        result['ma4'] = sma[20]  # Assuming 20 trading days = ~4 weeks
         
         # MA40 (40-week moving average) for primary trend
-        result['ma40'] = calculate_sma(data, 200)  # Assuming 200 trading days = ~40 weeks
+        result['ma40'] = sma[200]  # Assuming 200 trading days = ~40 weeks
         
         # Calculate RSI
-        result['rsi'] = calculate_rsi(data)
+        result['rsi'] = rsi
         
         # Calculate MACD
-        macd_data = calculate_macd(data)
         result['macd'] = macd_data['macd']
         result['macd_signal'] = macd_data['signal']
         result['macd_histogram'] = macd_data['histogram']
         
         # Calculate Bollinger Bands
-        bollinger = calculate_bollinger_bands(data)
         result['bollinger_middle'] = bollinger['middle']
         result['bollinger_upper'] = bollinger['upper']
         result['bollinger_lower'] = bollinger['lower']
@@ -328,28 +482,28 @@ def generate_technical_signals(indicators):
         if 'price_pattern' in indicators and indicators['price_pattern'] and 'current_price' in indicators['price_pattern']:
             latest_price = indicators['price_pattern'].get('current_price', 0)
         elif 'original_data' in indicators and not indicators['original_data'].empty:
-            latest_price = indicators['original_data']['close'].iloc[-1]
+            latest_price = indicators['original_data']['close'].to_numpy()[-1]
         else:
             latest_price = 0
 
         # Get standard technical indicators
-        latest_sma_short = indicators['sma_short'].iloc[-1] if (
+        latest_sma_short = indicators['sma_short'].to_numpy()[-1] if (
             'sma_short' in indicators and not indicators['sma_short'].empty) else 0
-        latest_sma_medium = indicators['sma_medium'].iloc[-1] if (
+        latest_sma_medium = indicators['sma_medium'].to_numpy()[-1] if (
             'sma_medium' in indicators and not indicators['sma_medium'].empty) else 0
-        latest_sma_long = indicators['sma_long'].iloc[-1] if (
+        latest_sma_long = indicators['sma_long'].to_numpy()[-1] if (
             'sma_long' in indicators and not indicators['sma_long'].empty) else 0
-        latest_rsi = indicators['rsi'].iloc[-1] if (
+        latest_rsi = indicators['rsi'].to_numpy()[-1] if (
             'rsi' in indicators and not indicators['rsi'].empty) else 0
-        latest_macd = indicators['macd'].iloc[-1] if (
+        latest_macd = indicators['macd'].to_numpy()[-1] if (
             'macd' in indicators and not indicators['macd'].empty) else 0
-        latest_macd_signal = indicators['macd_signal'].iloc[-1] if (
+        latest_macd_signal = indicators['macd_signal'].to_numpy()[-1] if (
             'macd_signal' in indicators and not indicators['macd_signal'].empty) else 0
 
         # Value & Momentum Strategy specific indicators
-        latest_ma4 = indicators['ma4'].iloc[-1] if (
+        latest_ma4 = indicators['ma4'].to_numpy()[-1] if (
             'ma4' in indicators and not indicators['ma4'].empty) else 0
-        latest_ma40 = indicators['ma40'].iloc[-1] if (
+        latest_ma40 = indicators['ma40'].to_numpy()[-1] if (
             'ma40' in indicators and not indicators['ma40'].empty) else 0
 
         # ------- Primary Value & Momentum Strategy Signals -------
@@ -377,8 +531,10 @@ def generate_technical_signals(indicators):
             pattern = indicators['price_pattern']
             signals['higher_lows'] = pattern.get('higher_lows', None)
 
-        # 5. Near 52-Week High
+        # 5. Near 52-Week High (and low, for the scanner's custom criteria)
         signals['near_52w_high'] = indicators.get('near_52w_high', None)
+        if 'price_pattern' in indicators:
+            signals['near_52w_low'] = indicators['price_pattern'].get('near_52w_low', None)
 
         # 6. Breakouts
         if 'breakout' in indicators:
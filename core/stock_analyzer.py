@@ -15,6 +15,7 @@ Flow:
 import logging
 from typing import Dict, Optional
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
 from core.technical_indicators import TechnicalIndicators, calculate_technical_score
@@ -340,15 +341,15 @@ class BatchAnalyzer:
             r.get('passed_all_filters', False)
         ]
 
-        # Sort by composite score (descending)
-        sorted_results = sorted(
-            valid_results,
-            key=lambda x: x.get('composite_score', 0),
-            reverse=True
-        )
+        # Sort by composite score (descending) on a score column; ties keep
+        # their input order
+        scores = np.fromiter(
+            (r.get('composite_score', 0) for r in valid_results),
+            dtype=float, count=len(valid_results))
+        order = np.argsort(-scores, kind='stable')
 
         # Take top N
-        top_results = sorted_results[:top_n]
+        top_results = [valid_results[i] for i in order[:top_n]]
 
         logger.info(
             f"{tier}: Selected {len(top_results)} stocks "
@@ -95,8 +95,8 @@ class TechnicalIndicators:
             )
 
             # Get current values
-            current_price = self.data['Close'].iloc[-1]
-            current_volume = self.data['Volume'].iloc[-1]
+            current_price = self.data['Close'].to_numpy()[-1]
+            current_volume = self.data['Volume'].to_numpy()[-1]
 
             # Calculate distances and percentages
             ma200_distance = ((current_price - ma200) / ma200 * 100) if ma200 else None
@@ -191,7 +191,7 @@ class TechnicalIndicators:
             rs = avg_gains / avg_losses
             rsi = 100 - (100 / (1 + rs))
 
-            return float(rsi.iloc[-1])
+            return float(rsi.to_numpy()[-1])
 
         except Exception as e:
             logger.warning(f"RSI calculation failed: {e}")
@@ -212,7 +212,7 @@ class TechnicalIndicators:
                 return None
 
             sma = self.data['Close'].rolling(window=period).mean()
-            return float(sma.iloc[-1])
+            return float(sma.to_numpy()[-1])
 
         except Exception as e:
             logger.warning(f"SMA calculation failed: {e}")
@@ -261,7 +261,7 @@ class TechnicalIndicators:
             for i in range(period + 1, len(close)):
                 kama.iloc[i] = kama.iloc[i-1] + sc.iloc[i] * (close.iloc[i] - kama.iloc[i-1])
 
-            return float(kama.iloc[-1])
+            return float(kama.to_numpy()[-1])
 
         except Exception as e:
             logger.warning(f"KAMA calculation failed: {e}")
@@ -304,9 +304,9 @@ class TechnicalIndicators:
             histogram = macd_line - signal_line
 
             return (
-                float(macd_line.iloc[-1]),
-                float(signal_line.iloc[-1]),
-                float(histogram.iloc[-1])
+                float(macd_line.to_numpy()[-1]),
+                float(signal_line.to_numpy()[-1]),
+                float(histogram.to_numpy()[-1])
             )
 
         except Exception as e:
@@ -345,9 +345,9 @@ class TechnicalIndicators:
             lower_band = middle_band - (std * std_dev)
 
             return (
-                float(upper_band.iloc[-1]),
-                float(middle_band.iloc[-1]),
-                float(lower_band.iloc[-1])
+                float(upper_band.to_numpy()[-1]),
+                float(middle_band.to_numpy()[-1]),
+                float(lower_band.to_numpy()[-1])
             )
 
         except Exception as e:
@@ -404,7 +404,7 @@ class TechnicalIndicators:
             avg_volume = self.data['Volume'].tail(lookback).mean()
 
             # Current volume
-            current_volume = self.data['Volume'].iloc[-1]
+            current_volume = self.data['Volume'].to_numpy()[-1]
 
             # Check if meets threshold
             return current_volume >= (avg_volume * multiplier)
@@ -10,9 +10,11 @@ from data.db_manager import (
     get_watchlist as get_sqlite_watchlist,
     cache_stock_data as cache_stock_data_sqlite,
     get_cached_stock_data as get_cached_stock_data_sqlite,
+    get_cached_stock_data_bulk as get_cached_stock_data_bulk_sqlite,
     cache_fundamentals as cache_fundamentals_sqlite,
     get_cached_fundamentals as get_cached_fundamentals_sqlite,
     get_all_cached_stocks as get_all_cached_stocks_sqlite,
+    get_recached_tickers as get_recached_tickers_sqlite,
     get_all_fundamentals as get_all_fundamentals_sqlite,
     initialize_database
 )
@@ -56,12 +58,9 @@ def add_to_watchlist(ticker, name, exchange="", sector=""):
         return False
 
 
-def store_analysis_result(ticker, analysis_data):
-    """Store analysis result in the database with prioritization."""
-    current_timestamp = int(time.time())
-
-    # Format the analysis data for storage
-    analysis_record = {
+def _analysis_record(ticker, analysis_data, timestamp):
+    """Format an analysis result as an analysis_results row."""
+    return {
         'ticker': ticker,
         'analysis_date': analysis_data.get('date', datetime.now().strftime("%Y-%m-%d")),
         'price': analysis_data.get('price'),
@@ -77,9 +76,36 @@ def store_analysis_result(ticker, analysis_data):
         'revenue_growth': analysis_data.get('revenue_growth'),
         'is_profitable': analysis_data.get('is_profitable'),
         'data_source': analysis_data.get('data_source', 'unknown'),
-        'last_updated': current_timestamp
+        'last_updated': timestamp
     }
 
+
+def _store_analysis_records_sqlite(session, analysis_records):
+    """Insert or update analysis_results rows in the session (no commit)."""
+    from data.db_models import AnalysisResults
+
+    for analysis_record in analysis_records:
+        # Check if record exists
+        existing = session.query(AnalysisResults).filter(
+            AnalysisResults.ticker == analysis_record['ticker'],
+            AnalysisResults.analysis_date == analysis_record['analysis_date']
+        ).first()
+
+        if existing:
+            # Update existing record
+            for key, value in analysis_record.items():
+                if hasattr(existing, key):
+                    setattr(existing, key, value)
+        else:
+            # Create new record
+            session.add(AnalysisResults(**analysis_record))
+
+
+def store_analysis_result(ticker, analysis_data):
+    """Store analysis result in the database with prioritization."""
+    # Format the analysis data for storage
+    analysis_record = _analysis_record(ticker, analysis_data, int(time.time()))
+
     # Try Supabase first if connected
     if USE_SUPABASE:
         try:
@@ -93,25 +119,9 @@ def store_analysis_result(ticker, analysis_data):
 
     # Fall back to SQLite
     try:
-        from data.db_models import AnalysisResults
         session = get_db_session()
         try:
-            # Check if record exists
-            existing = session.query(AnalysisResults).filter(
-                AnalysisResults.ticker == ticker,
-                AnalysisResults.analysis_date == analysis_record['analysis_date']
-            ).first()
-
-            if existing:
-                # Update existing record
-                for key, value in analysis_record.items():
-                    if hasattr(existing, key):
-                        setattr(existing, key, value)
-            else:
-                # Create new record
-                new_record = AnalysisResults(**analysis_record)
-                session.add(new_record)
-
+            _store_analysis_records_sqlite(session, [analysis_record])
             session.commit()
             logger.info(f"Stored analysis result for {ticker} in SQLite")
             return True
@@ -126,6 +136,93 @@ def store_analysis_result(ticker, analysis_data):
         return False
 
 
+def store_analysis_results_bulk(results):
+    """
+    Store many analysis results with database prioritization.
+
+    Args:
+        results (list): (ticker, analysis_data) pairs
+
+    Returns:
+        int: Number of results stored
+
+    Results not stored in Supabase are written to SQLite in one session and
+    one commit, instead of a transaction per ticker.
+    """
+    current_timestamp = int(time.time())
+    analysis_records = [_analysis_record(ticker, analysis_data, current_timestamp)
+                        for ticker, analysis_data in results]
+
+    # Try Supabase first if connected; it has no batch upsert, so records
+    # are stored one by one and the failures fall back to SQLite
+    stored = 0
+    if USE_SUPABASE:
+        pending = []
+        for analysis_record in analysis_records:
+            ticker = analysis_record['ticker']
+            try:
+                if supabase_db.store_analysis_result(ticker, analysis_record):
+                    stored += 1
+                    continue
+            except Exception as e:
+                logger.warning(f"Supabase store failed for {ticker}: {e}")
+            pending.append(analysis_record)
+        if stored:
+            logger.info(f"Stored {stored} analysis results in Supabase")
+        analysis_records = pending
+
+    if not analysis_records:
+        return stored
+
+    # Fall back to SQLite, all remaining records in a single transaction
+    try:
+        from data.db_models import AnalysisResults
+        session = get_db_session()
+        try:
+            # A record that cannot be bound would roll back the whole batch,
+            # so run the column type conversions first and skip the failures
+            dialect = session.get_bind().dialect
+            bind_processors = [(column.name, column.type.bind_processor(dialect))
+                               for column in AnalysisResults.__table__.columns]
+            valid_records = []
+            for analysis_record in analysis_records:
+                try:
+                    for name, process in bind_processors:
+                        if process and analysis_record.get(name) is not None:
+                            process(analysis_record[name])
+                except (TypeError, ValueError) as e:
+                    logger.error(f"SQLite store failed for {analysis_record['ticker']}: {e}")
+                    continue
+                valid_records.append(analysis_record)
+
+            _store_analysis_records_sqlite(session, valid_records)
+            session.commit()
+            logger.info(f"Stored {len(valid_records)} analysis results in SQLite")
+            return stored + len(valid_records)
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"SQLite bulk store failed, storing one by one: {e}")
+        finally:
+            session.close()
+    except Exception as e:
+        logger.error(f"Error storing analysis results: {e}")
+        return stored
+
+    # One transaction per record, so a bad record only fails itself
+    for analysis_record in analysis_records:
+        session = get_db_session()
+        try:
+            _store_analysis_records_sqlite(session, [analysis_record])
+            session.commit()
+            stored += 1
+        except Exception as e:
+            session.rollback()
+            logger.error(f"SQLite store failed for {analysis_record['ticker']}: {e}")
+        finally:
+            session.close()
+    return stored
+
+
 def get_analysis_results(ticker=None, days=30):
     """Get stored analysis results with database prioritization."""
     current_time = int(time.time())
@@ -278,6 +375,42 @@ def get_cached_stock_data(ticker, timeframe, period, source):
         return None
 
 
+def get_cached_stock_data_bulk(tickers, timeframe, period, sources):
+    """
+    Retrieve cached stock data for many tickers with database prioritization.
+
+    Supabase is queried first if connected; tickers it has no fresh data
+    for are looked up in SQLite. Within each database the first source in
+    preference order wins.
+
+    Returns:
+        dict: ticker -> DataFrame for every ticker with fresh cached data
+    """
+    result = {}
+
+    # Try Supabase first if connected
+    if USE_SUPABASE:
+        try:
+            result.update(supabase_db.get_cached_stock_data_bulk(
+                tickers, timeframe, period, sources))
+            logger.info(f"Retrieved cached data for {len(result)} stocks from Supabase")
+        except Exception as e:
+            logger.warning(f"Supabase bulk get cached data failed: {e}")
+
+    # Fall back to SQLite for the rest
+    remaining = [t for t in tickers if t not in result]
+    if remaining:
+        try:
+            sqlite_data = get_cached_stock_data_bulk_sqlite(
+                remaining, timeframe, period, sources)
+            result.update(sqlite_data)
+            logger.info(f"Retrieved cached data for {len(sqlite_data)} stocks from SQLite")
+        except Exception as e:
+            logger.warning(f"SQLite bulk get cached data failed: {e}")
+
+    return result
+
+
 def cache_fundamentals(ticker, fundamentals_data):
     """Cache fundamental data with database prioritization."""
     logger.info(f"Caching fundamentals for {ticker}")
@@ -355,17 +488,32 @@ def get_all_cached_stocks():
     return result
 
 
-def get_all_fundamentals():
-    """Get fundamental data for all stocks with database prioritization."""
-    all_fundamentals = {}
+def get_recached_tickers(since):
+    """
+    Get the tickers whose price data was cached at or after `since`.
+
+    cache_stock_data always writes SQLite as well, so SQLite is read.
+    """
+    try:
+        return get_recached_tickers_sqlite(since)
+    except Exception as e:
+        logger.warning(f"SQLite get recached tickers failed: {e}")
+        return []
+
+
+def get_all_fundamentals(tickers=None):
+    """
+    Get fundamental data for all stocks with database prioritization.
+
+    When tickers is given only those stocks are read from the databases.
+    """
+    sqlite_by_ticker = {}
+    supabase_by_ticker = {}
 
     # Try SQLite first for fundamentals (often more complete)
     try:
-        sqlite_fundamentals = get_all_fundamentals_sqlite()
-        for f in sqlite_fundamentals:
-            ticker = f.get('ticker')
-            if ticker:
-                all_fundamentals[ticker] = f
+        sqlite_fundamentals = get_all_fundamentals_sqlite(tickers)
+        sqlite_by_ticker = {f['ticker']: f for f in sqlite_fundamentals if f.get('ticker')}
         logger.info(
             f"Retrieved {len(sqlite_fundamentals)} fundamentals from SQLite")
     except Exception as e:
@@ -374,16 +522,16 @@ def get_all_fundamentals():
     # Try Supabase if connected (will overwrite SQLite data if available)
     if USE_SUPABASE:
         try:
-            supabase_fundamentals = supabase_db.get_all_fundamentals()
-            for f in supabase_fundamentals:
-                ticker = f.get('ticker')
-                if ticker:
-                    all_fundamentals[ticker] = f
+            supabase_fundamentals = supabase_db.get_all_fundamentals(tickers)
+            supabase_by_ticker = {f['ticker']: f for f in supabase_fundamentals if f.get('ticker')}
             logger.info(
                 f"Retrieved {len(supabase_fundamentals)} fundamentals from Supabase")
         except Exception as e:
             logger.warning(f"Supabase get all fundamentals failed: {e}")
 
+    # One merge; Supabase rows replace SQLite rows for the same ticker
+    all_fundamentals = {**sqlite_by_ticker, **supabase_by_ticker}
+
     result = list(all_fundamentals.values())
     logger.info(f"Total unique fundamentals: {len(result)}")
     return result
@@ -407,9 +407,74 @@ def get_cached_stock_data(ticker, timeframe, period, source):
     if data and not should_refresh_data(timestamp):
         # Convert JSON back to DataFrame
         return pd.read_json(io.StringIO(data))
-    
+
     return None
 
+# SQLite's default limit on bound parameters per statement is 999
+SQLITE_MAX_PARAMS = 900
+
+
+def get_cached_stock_data_bulk(tickers, timeframe, period, sources=('yahoo', 'alphavantage')):
+    """
+    Retrieve cached stock data for many tickers in as few queries as possible.
+
+    For each ticker the sources are tried in the order given, and the first
+    one with fresh data wins; an expired preferred source falls through to
+    the next one.
+
+    Returns:
+        dict: ticker -> DataFrame for every ticker with fresh cached data
+    """
+    sources = list(sources)
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return {}
+
+    rank = {source: i for i, source in enumerate(sources)}
+    records = []
+    supabase_url = os.getenv("SUPABASE_URL")
+    if supabase_url:
+        session = get_db_session()
+        try:
+            rows = session.query(StockDataCache).filter(
+                StockDataCache.ticker.in_(tickers),
+                StockDataCache.timeframe == timeframe,
+                StockDataCache.period == period,
+                StockDataCache.source.in_(sources)
+            ).all()
+            records = [(row.ticker, row.data, row.timestamp, row.source) for row in rows]
+        finally:
+            session.close()
+    else:
+        # Fallback to SQLite - chunk the IN list to stay under the parameter limit
+        source_placeholders = ", ".join("?" for _ in sources)
+        chunk_size = SQLITE_MAX_PARAMS - 2 - len(sources)
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        for start in range(0, len(tickers), chunk_size):
+            chunk = tickers[start:start + chunk_size]
+            ticker_placeholders = ", ".join("?" for _ in chunk)
+            cursor.execute(f"""
+                SELECT ticker, data, timestamp, source FROM stock_data_cache
+                WHERE ticker IN ({ticker_placeholders}) AND timeframe = ? AND period = ?
+                AND source IN ({source_placeholders})
+                """, (*chunk, timeframe, period, *sources))
+            records.extend((row['ticker'], row['data'], row['timestamp'], row['source'])
+                           for row in cursor.fetchall())
+        conn.close()
+
+    # Walk each ticker's rows in source preference order; an expired
+    # preferred source falls through to the next one
+    records.sort(key=lambda record: (record[0], rank[record[3]]))
+    result = {}
+    for ticker, data, timestamp, _source in records:
+        if ticker in result:
+            continue
+        if data and not should_refresh_data(timestamp):
+            result[ticker] = pd.read_json(io.StringIO(data))
+
+    return result
+
 def cache_fundamentals(ticker, fundamentals_data):
     """Cache fundamental data for a ticker."""
     current_timestamp = int(time.time())
@@ -553,14 +618,52 @@ def get_all_cached_stocks():
         conn.close()
         return tickers
 
-def get_all_fundamentals():
-    """Get fundamental data for all stocks in cache."""
+def get_recached_tickers(since):
+    """Get the tickers whose price data was cached at or after `since` (epoch seconds)."""
+    # Cache timestamps are whole seconds, so compare against the second `since` falls in
+    since = int(since)
     supabase_url = os.getenv("SUPABASE_URL")
     if supabase_url:
         # Use SQLAlchemy for PostgreSQL
         session = get_db_session()
         try:
-            records = session.query(FundamentalsCache).all()
+            tickers = session.query(StockDataCache.ticker).filter(
+                StockDataCache.timestamp >= since
+            ).distinct().all()
+            return [t[0] for t in tickers]
+        finally:
+            session.close()
+    else:
+        # Fallback to SQLite
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(
+            "SELECT DISTINCT ticker FROM stock_data_cache WHERE timestamp >= ?", (since,))
+        tickers = [row['ticker'] for row in cursor.fetchall()]
+
+        conn.close()
+        return tickers
+
+def get_all_fundamentals(tickers=None):
+    """
+    Get fundamental data for all stocks in cache, or only for the given
+    tickers (one IN query per chunk instead of reading the whole table).
+    """
+    if tickers is not None:
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return []
+
+    supabase_url = os.getenv("SUPABASE_URL")
+    if supabase_url:
+        # Use SQLAlchemy for PostgreSQL
+        session = get_db_session()
+        try:
+            query = session.query(FundamentalsCache)
+            if tickers is not None:
+                query = query.filter(FundamentalsCache.ticker.in_(tickers))
+            records = query.all()
             return [
                 {
                     'id': record.id,
@@ -583,8 +686,19 @@ def get_all_fundamentals():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        cursor.execute("SELECT * FROM fundamentals_cache")
-        fundamentals = [dict(row) for row in cursor.fetchall()]
+        if tickers is None:
+            cursor.execute("SELECT * FROM fundamentals_cache")
+            fundamentals = [dict(row) for row in cursor.fetchall()]
+        else:
+            # Chunk the IN list to stay under the parameter limit
+            fundamentals = []
+            for start in range(0, len(tickers), SQLITE_MAX_PARAMS):
+                chunk = tickers[start:start + SQLITE_MAX_PARAMS]
+                placeholders = ", ".join("?" for _ in chunk)
+                cursor.execute(
+                    f"SELECT * FROM fundamentals_cache WHERE ticker IN ({placeholders})",
+                    chunk)
+                fundamentals.extend(dict(row) for row in cursor.fetchall())
         
         conn.close()
         return fundamentals
@@ -6,6 +6,7 @@ from datetime import datetime
 import time
 import logging
 import os
+from functools import lru_cache
 
 from config import (
     ALPHA_VANTAGE_API_KEY,
@@ -31,6 +32,43 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Seconds a ticker's stock info (name, sector, exchange, ...) is reused
+STOCK_INFO_TTL = 86400
+
+
+@lru_cache(maxsize=4096)
+def _cached_stock_info(ticker, ts_bucket):
+    """
+    Stock info for a ticker, cached per STOCK_INFO_TTL time bucket.
+    Errors propagate, so failed lookups are not cached.
+    """
+    # First check if we have cached fundamentals
+    cached_fundamentals = get_cached_fundamentals(ticker)
+    if cached_fundamentals:
+        return {
+            'name': cached_fundamentals.get('name', ticker),
+            'sector': cached_fundamentals.get('sector', 'Unknown'),
+            'industry': cached_fundamentals.get('industry', 'Unknown'),
+            'exchange': cached_fundamentals.get('exchange', 'Unknown'),
+            'currency': cached_fundamentals.get('currency', 'Unknown'),
+            'country': cached_fundamentals.get('country', 'Unknown')
+        }
+
+    # Try Yahoo Finance for basic info
+    stock = yf.Ticker(ticker)
+    info = stock.info
+
+    # Extract relevant info
+    return {
+        'name': info.get('shortName', info.get('longName', ticker)),
+        'sector': info.get('sector', 'Unknown'),
+        'industry': info.get('industry', 'Unknown'),
+        'exchange': info.get('exchange', 'Unknown'),
+        'currency': info.get('currency', 'Unknown'),
+        'country': info.get('country', 'Unknown')
+    }
+
+
 class StockDataFetcher:
     def __init__(self):
         self.alpha_vantage_api_key = ALPHA_VANTAGE_API_KEY
@@ -46,7 +84,8 @@ class StockDataFetcher:
             logger.warning(
                 "Alpha Vantage API key not provided. Fallback source unavailable.")
 
-    def get_stock_data(self, ticker, timeframe='1d', period='1y', attempt_fallback=True):
+    def get_stock_data(self, ticker, timeframe='1d', period='1y', attempt_fallback=True,
+                       check_cache=True):
         """
         Get stock price data with priority: Database -> Alpha Vantage -> Yahoo Finance
         
@@ -55,6 +94,9 @@ class StockDataFetcher:
             timeframe (str): Timeframe for data (1d, 1wk, 1mo)
             period (str): Period to fetch (1mo, 3mo, 6mo, 1y, etc.)
             attempt_fallback (bool): Whether to try fallback sources
+            check_cache (bool): Whether to look in the database cache first;
+                bulk callers that already know the ticker is not cached skip
+                those two queries
             
         Returns:
             pandas.DataFrame: Stock price data
@@ -63,16 +105,17 @@ class StockDataFetcher:
             f"Fetching data for {ticker} (timeframe: {timeframe}, period: {period})")
 
         # Step 1: Check database cache first (both sources)
-        cached_data = get_cached_stock_data(
-            ticker, timeframe, period, "alphavantage")
-        if cached_data is not None and not cached_data.empty:
-            logger.info(f"Retrieved {ticker} from Alpha Vantage cache")
-            return cached_data
-
-        cached_data = get_cached_stock_data(ticker, timeframe, period, "yahoo")
-        if cached_data is not None and not cached_data.empty:
-            logger.info(f"Retrieved {ticker} from Yahoo cache")
-            return cached_data
+        if check_cache:
+            cached_data = get_cached_stock_data(
+                ticker, timeframe, period, "alphavantage")
+            if cached_data is not None and not cached_data.empty:
+                logger.info(f"Retrieved {ticker} from Alpha Vantage cache")
+                return cached_data
+
+            cached_data = get_cached_stock_data(ticker, timeframe, period, "yahoo")
+            if cached_data is not None and not cached_data.empty:
+                logger.info(f"Retrieved {ticker} from Yahoo cache")
+                return cached_data
 
         # Step 2: Try Alpha Vantage API if available
         if self.alpha_vantage_api_key and attempt_fallback:
@@ -238,34 +281,8 @@ class StockDataFetcher:
     def get_stock_info(self, ticker):
         """Get basic stock information with database-first approach."""
         try:
-            # First check if we have cached fundamentals
-            cached_fundamentals = get_cached_fundamentals(ticker)
-            if cached_fundamentals:
-                return {
-                    'name': cached_fundamentals.get('name', ticker),
-                    'sector': cached_fundamentals.get('sector', 'Unknown'),
-                    'industry': cached_fundamentals.get('industry', 'Unknown'),
-                    'exchange': cached_fundamentals.get('exchange', 'Unknown'),
-                    'currency': cached_fundamentals.get('currency', 'Unknown'),
-                    'country': cached_fundamentals.get('country', 'Unknown')
-                }
-
-            # Try Yahoo Finance for basic info
-            stock = yf.Ticker(ticker)
-            info = stock.info
-
-            # Extract relevant info
-            stock_info = {
-                'name': info.get('shortName', info.get('longName', ticker)),
-                'sector': info.get('sector', 'Unknown'),
-                'industry': info.get('industry', 'Unknown'),
-                'exchange': info.get('exchange', 'Unknown'),
-                'currency': info.get('currency', 'Unknown'),
-                'country': info.get('country', 'Unknown')
-            }
-
-            return stock_info
-
+            # Copy, so callers cannot change the cached entry
+            return dict(_cached_stock_info(ticker, int(time.time() // STOCK_INFO_TTL)))
         except Exception as e:
             logger.error(f"Error fetching stock info for {ticker}: {e}")
             # Try demo data as fallback
@@ -389,6 +389,48 @@ class SupabaseDB:
             print(f"Error getting cached stock data: {e}")
             return None
 
+    # Tickers per IN filter, keeping the request URL short
+    BULK_TICKER_CHUNK = 200
+
+    def get_cached_stock_data_bulk(self, tickers, timeframe, period, sources):
+        """
+        Retrieve cached stock data for many tickers with one request per chunk.
+
+        For each ticker the first source (in preference order) with fresh
+        data wins. Returns a dict of ticker -> DataFrame.
+        """
+        if not self.is_connected():
+            return {}
+
+        try:
+            import io
+            sources = list(sources)
+            tickers = list(dict.fromkeys(tickers))
+            rank = {source: i for i, source in enumerate(sources)}
+            current_timestamp = int(time.time())
+
+            records = []
+            for start in range(0, len(tickers), self.BULK_TICKER_CHUNK):
+                chunk = tickers[start:start + self.BULK_TICKER_CHUNK]
+                response = self.client.table("stock_data_cache").select(
+                    "ticker, data, timestamp, source").in_("ticker", chunk).eq(
+                    "timeframe", timeframe).eq("period", period).in_("source", sources).execute()
+                records.extend(response.data)
+
+            records.sort(key=lambda record: (record["ticker"], rank[record["source"]]))
+            result = {}
+            for record in records:
+                ticker = record["ticker"]
+                if ticker in result:
+                    continue
+                if (current_timestamp - record["timestamp"]) < CACHE_EXPIRATION:
+                    result[ticker] = pd.read_json(io.StringIO(record["data"]))
+
+            return result
+        except Exception as e:
+            print(f"Error getting cached stock data in bulk: {e}")
+            return {}
+
     # Fundamentals cache methods
     def cache_fundamentals(self, ticker, fundamentals_data):
         """Cache fundamental data for a ticker."""
@@ -457,14 +499,27 @@ class SupabaseDB:
             print(f"Error getting cached stocks: {str(e)}")
             return []
     
-    def get_all_fundamentals(self):
-        """Get fundamental data for all stocks in cache."""
+    def get_all_fundamentals(self, tickers=None):
+        """
+        Get fundamental data for all stocks in cache, or only for the given
+        tickers with one request per chunk.
+        """
         if not self.is_connected():
             return []
             
         try:
-            response = self.client.table("fundamentals_cache").select("*").execute()
-            return response.data
+            if tickers is None:
+                response = self.client.table("fundamentals_cache").select("*").execute()
+                return response.data
+
+            tickers = list(dict.fromkeys(tickers))
+            records = []
+            for start in range(0, len(tickers), self.BULK_TICKER_CHUNK):
+                chunk = tickers[start:start + self.BULK_TICKER_CHUNK]
+                response = self.client.table("fundamentals_cache").select(
+                    "*").in_("ticker", chunk).execute()
+                records.extend(response.data)
+            return records
         except Exception as e:
             print(f"Error getting all fundamentals: {str(e)}")
             return []
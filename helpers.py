@@ -456,6 +456,59 @@ def safe_compare(a, b, comparison="gt"):
         return None
 
 
+def _result_signal(result):
+    """A result's signal in the KÖP/HÅLL/SÄLJ format, from either scanner's fields"""
+    signal = result.get('signal', result.get('Signal', 'HÅLL'))
+
+    # Handle value_momentum_signal format
+    if not signal:
+        vm_signal = result.get('value_momentum_signal', 'HOLD')
+        if vm_signal == 'BUY':
+            signal = 'KÖP'
+        elif vm_signal == 'SELL':
+            signal = 'SÄLJ'
+        else:
+            signal = 'HÅLL'
+    return signal
+
+
+def _compile_result_filters(criteria):
+    """
+    The active filters of criteria as one check per filter, built once so
+    filtering does not re-inspect the criteria for every result
+    """
+    checks = []
+
+    # Signal filter - handle multiple signal formats
+    if 'signals' in criteria and criteria['signals']:
+        signals = criteria['signals']
+        checks.append(lambda result: _result_signal(result) in signals)
+
+    # Tech score filter
+    if 'min_tech_score' in criteria:
+        min_tech_score = criteria['min_tech_score']
+        checks.append(lambda result: not result.get(
+            'tech_score', result.get('Tech Score', 0)) < min_tech_score)
+
+    # Data source filter
+    if 'data_sources' in criteria and criteria['data_sources']:
+        data_sources = criteria['data_sources']
+        checks.append(lambda result: result.get(
+            'data_source', result.get('Data Source', 'unknown')) in data_sources)
+
+    # MA40 filter
+    if criteria.get('above_ma40_only', False):
+        checks.append(lambda result: bool(
+            result.get('above_ma40', result.get('Above MA40', False))))
+
+    # Profitable filter
+    if criteria.get('profitable_only', False):
+        checks.append(lambda result: bool(
+            result.get('is_profitable', result.get('Profitable', False))))
+
+    return checks
+
+
 def filter_results_by_criteria(results, criteria):
     """
     Filter analysis results based on criteria
@@ -467,56 +520,9 @@ def filter_results_by_criteria(results, criteria):
     Returns:
         list: Filtered results
     """
-    filtered = []
-
-    for result in results:
-        # Skip error results
-        if "error" in result and result.get("error") is not None:
-            continue
-
-        meets_criteria = True
-
-        # Signal filter - handle multiple signal formats
-        if 'signals' in criteria and criteria['signals']:
-            signal = result.get('signal', result.get('Signal', 'HÅLL'))
-
-            # Handle value_momentum_signal format
-            if not signal:
-                vm_signal = result.get('value_momentum_signal', 'HOLD')
-                if vm_signal == 'BUY':
-                    signal = 'KÖP'
-                elif vm_signal == 'SELL':
-                    signal = 'SÄLJ'
-                else:
-                    signal = 'HÅLL'
-
-            if signal not in criteria['signals']:
-                meets_criteria = False
-
-        # Tech score filter
-        if 'min_tech_score' in criteria:
-            tech_score = result.get('tech_score', result.get('Tech Score', 0))
-            if tech_score < criteria['min_tech_score']:
-                meets_criteria = False
-
-        # Data source filter
-        if 'data_sources' in criteria and criteria['data_sources']:
-            data_source = result.get(
-                'data_source', result.get('Data Source', 'unknown'))
-            if data_source not in criteria['data_sources']:
-                meets_criteria = False
-
-        # MA40 filter
-        if criteria.get('above_ma40_only', False):
-            if not result.get('above_ma40', result.get('Above MA40', False)):
-                meets_criteria = False
-
-        # Profitable filter
-        if criteria.get('profitable_only', False):
-            if not result.get('is_profitable', result.get('Profitable', False)):
-                meets_criteria = False
-
-        if meets_criteria:
-            filtered.append(result)
-
-    return filtered
+    checks = _compile_result_filters(criteria)
+
+    # Skip error results
+    return [result for result in results
+            if not ("error" in result and result.get("error") is not None)
+            and all(check(result) for check in checks)]
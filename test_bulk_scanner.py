@@ -0,0 +1,59 @@
+"""
+Bulk Scanner Tests
+
+Checks the signals OptimizedBulkScanner precomputes for a scan against the
+pandas path _evaluate_ticker falls back to, on synthetic price frames (see
+test_indicator_kernels).
+"""
+
+import logging
+
+import analysis.bulk_scanner as bulk_scanner
+from analysis.bulk_scanner import OptimizedBulkScanner
+from analysis.strategy import ValueMomentumStrategy
+from analysis.technical import calculate_all_indicators, generate_technical_signals
+from test_indicator_kernels import synthetic_frames
+from utils.numba_compat import NUMBA_AVAILABLE
+
+logging.disable(logging.CRITICAL)
+
+# Signals _evaluate_ticker copies into a scan result
+RESULT_SIGNALS = ('above_ma40', 'above_ma4', 'rsi_above_50', 'near_52w_high')
+
+
+def test_precomputed_signals_match_pandas_path():
+    """_precompute_signals gives the tech score and flags of the pandas path"""
+    bulk_scanner._SIGNALS_CACHE.clear()
+    frames = {f"T{i:03d}": frame for i, frame in enumerate(synthetic_frames())}
+    strategy = ValueMomentumStrategy()
+
+    precomputed = OptimizedBulkScanner()._precompute_signals(frames, list(frames))
+    # Without Numba a scan this small leaves the signals to _evaluate_ticker
+    assert len(precomputed) == len(frames) or not NUMBA_AVAILABLE
+    for ticker, signals in precomputed.items():
+        expected = generate_technical_signals(calculate_all_indicators(frames[ticker]))
+        assert strategy.calculate_tech_score(signals) == strategy.calculate_tech_score(expected), ticker
+        for name in RESULT_SIGNALS:
+            assert signals.get(name, False) == expected.get(name, False), (ticker, name)
+
+
+def test_evaluation_leaves_shared_signals_unchanged():
+    """_evaluate_ticker does not write into the signals it is handed"""
+    scanner = OptimizedBulkScanner()
+    scanner._strategy = ValueMomentumStrategy()
+    # Cached P/E, so the evaluation does not call the APIs
+    scanner.db_loader.fundamentals_by_ticker = {'T000': {'pe_ratio': 12.0, 'profit_margin': 0.1}}
+    frame = next(f for f in synthetic_frames() if len(f) >= 200)
+    signals = generate_technical_signals(calculate_all_indicators(frame))
+    shared = dict(signals)
+
+    result = scanner._evaluate_ticker('T000', frame, None, {'T000': 'Test'}, signals)
+    assert 'error' not in result
+    assert result['tech_score'] == scanner._strategy.calculate_tech_score(shared)
+    assert signals == shared
+
+
+if __name__ == "__main__":
+    test_precomputed_signals_match_pandas_path()
+    test_evaluation_leaves_shared_signals_unchanged()
+    print("✓ Bulk scanner tests PASSED")
@@ -0,0 +1,111 @@
+"""
+Scanner Criteria Tests
+
+Checks the vectorized custom-criteria masks in analysis.criteria against
+per-stock evaluation of the same criteria.
+"""
+
+import numpy as np
+import pandas as pd
+
+import analysis.criteria as criteria_module
+from analysis.criteria import (
+    FLAG_CRITERIA, NUMERIC_CRITERIA, SMA_SIGNALS, compile_fundamental_criteria, criteria_columns,
+    criteria_mask, fundamental_mask
+)
+
+FUNDAMENTAL_COLUMNS = ('pe_ratio', 'profit_margin', 'revenue_growth')
+
+
+def random_fundamentals(n=200, seed=0):
+    """Fundamentals rows with some values missing"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n):
+        row = {'ticker': f"T{i:03d}",
+               'pe_ratio': float(rng.uniform(-10, 60)),
+               'profit_margin': float(rng.uniform(-0.2, 0.4)),
+               'revenue_growth': float(rng.uniform(-0.3, 0.5))}
+        for column in FUNDAMENTAL_COLUMNS:
+            if rng.random() < 0.1:
+                row[column] = None
+        rows.append(row)
+    return rows
+
+
+def test_fundamental_mask_matches_per_stock_checks():
+    """fundamental_mask agrees with compile_fundamental_criteria, string thresholds included"""
+    rows = random_fundamentals()
+    frame = pd.DataFrame(rows).set_index('ticker')
+    for criteria in (
+        {'pe_below': 20},
+        {'pe_above': '5', 'pe_below': '25.5'},
+        {'profit_margin_above': 0.1, 'revenue_growth_above': '0'},
+        {'strategy': 'custom', 'pe_below': 15.0, 'profit_margin_above': '0.05'},
+    ):
+        checks = compile_fundamental_criteria(criteria)
+        expected = [all(check(row) for check in checks) for row in rows]
+        assert fundamental_mask(frame, criteria).tolist() == expected, criteria
+
+
+def meets_criteria(row, criteria):
+    """Per-stock evaluation of the custom criteria; missing values never match"""
+    for name, value in criteria.items():
+        if name in NUMERIC_CRITERIA:
+            column, compare = NUMERIC_CRITERIA[name]
+            if row[column] is None or not compare(float(row[column]), float(value)):
+                return False
+        elif name in FLAG_CRITERIA:
+            if row[FLAG_CRITERIA[name]] is not True:
+                return False
+        elif name in ('price_above_sma', 'price_below_sma'):
+            if value not in SMA_SIGNALS:
+                return False
+            above = row[SMA_SIGNALS[value]]
+            if above is None or above != (name == 'price_above_sma'):
+                return False
+    return True
+
+
+def random_criteria(rng):
+    """A random mix of numeric, flag and SMA criteria"""
+    criteria = {}
+    for name in NUMERIC_CRITERIA:
+        if rng.random() < 0.3:
+            threshold = round(float(rng.uniform(-0.1, 30)), 2)
+            criteria[name] = str(threshold) if rng.random() < 0.3 else threshold
+    for name in FLAG_CRITERIA:
+        if rng.random() < 0.2:
+            criteria[name] = True
+    if rng.random() < 0.4:
+        sma = 'price_above_sma' if rng.random() < 0.5 else 'price_below_sma'
+        criteria[sma] = int(rng.choice(list(SMA_SIGNALS) + [7]))
+    return criteria
+
+
+def test_criteria_mask_matches_per_row_checks():
+    """criteria_mask agrees with per-stock evaluation, with and without Numba"""
+    rng = np.random.default_rng(3)
+    rows = random_fundamentals(300, seed=4)
+    signals = list(FLAG_CRITERIA.values()) + list(SMA_SIGNALS.values())
+    for row in rows:
+        for name in signals:
+            row[name] = (None, False, True)[rng.integers(3)]
+
+    numba_available = criteria_module.NUMBA_AVAILABLE
+    try:
+        for use_numba in {numba_available, False}:
+            criteria_module.NUMBA_AVAILABLE = use_numba
+            for _ in range(200):
+                criteria = random_criteria(rng)
+                columns = {name: [row[name] for row in rows] for name in criteria_columns(criteria)}
+                expected = [meets_criteria(row, criteria) for row in rows]
+                assert criteria_mask(columns, len(rows), criteria).tolist() == expected, criteria
+    finally:
+        criteria_module.NUMBA_AVAILABLE = numba_available
+
+
+if __name__ == "__main__":
+    test_fundamental_mask_matches_per_stock_checks()
+    test_criteria_mask_matches_per_row_checks()
+    print("✓ Scanner criteria tests PASSED")
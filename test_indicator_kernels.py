@@ -0,0 +1,156 @@
+"""
+Indicator Kernel Tests
+
+Checks the kernels in analysis.indicator_kernels against the pandas code
+they replace: the rolling and EWM kernels against Series.rolling/ewm, and
+the batch signals against calculate_all_indicators +
+generate_technical_signals (scored by
+ValueMomentumStrategy.calculate_tech_score) on synthetic prices, including
+the flat closes where rounding decides the MA comparisons.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from analysis.indicator_kernels import (
+    CRITERIA_SIGNAL_NAMES, compute_criteria_signals_for_frames, compute_signals_for_frames,
+    ewm_mean, rolling_mean, rolling_std
+)
+from analysis.strategy import ValueMomentumStrategy
+from analysis.technical import calculate_all_indicators, generate_technical_signals
+
+logging.disable(logging.CRITICAL)
+
+KERNEL_SIGNALS = ('above_ma40', 'above_ma4', 'rsi_above_50', 'near_52w_high',
+                  'breakout', 'higher_lows')
+
+
+def synthetic_frames(count=240, seed=0):
+    """Price frames of assorted lengths and shapes, flat stretches included"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for k in range(count):
+        n = int(rng.choice([50, 199, 200, 201, 252, 253, 300]))
+        walk = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+        kind = k % 6
+        if kind == 0:
+            close = walk
+        elif kind == 1:
+            # Ticks of 0.5, often unchanged from one day to the next
+            close = np.round(50 + np.cumsum(rng.choice([-0.5, 0, 0.5], n)), 2)
+        elif kind == 2:
+            # Flat at a price with no exact binary representation
+            close = np.full(n, round(float(rng.uniform(1, 500)), 3))
+        elif kind == 3:
+            # Trading, then flat for the last few weeks
+            close = np.round(walk, 2)
+            close[-int(rng.integers(20, 40)):] = round(float(rng.uniform(1, 500)), 2)
+        elif kind == 4:
+            close = walk
+            close[rng.integers(0, n, 3)] = np.nan
+        else:
+            # Breaking out to a new high on the last day
+            close = walk
+            close[-1] = close.max() * 1.1
+        high = close * (1 + np.abs(rng.normal(0, 0.01, n)))
+        low = close * (1 - np.abs(rng.normal(0, 0.01, n)))
+        frames.append(pd.DataFrame({
+            'open': close, 'high': high, 'low': low, 'close': close,
+            'volume': rng.integers(100_000, 1_000_000, n),
+        }))
+    return frames
+
+
+def random_arrays(count=300, seed=1):
+    """Float arrays with gaps, signed zeros, equal runs and large magnitudes"""
+    rng = np.random.default_rng(seed)
+    arrays = []
+    for k in range(count):
+        n = int(rng.integers(1, 120))
+        kind = k % 5
+        if kind == 0:
+            values = rng.normal(0, 1, n)
+        elif kind == 1:
+            values = np.round(rng.normal(100, 5, n), 2)
+            values[rng.random(n) < 0.15] = np.nan
+        elif kind == 2:
+            values = rng.choice([-0.0, 0.0, 0.1, 0.3, -0.2], n)
+        elif kind == 3:
+            values = 1e9 + rng.normal(0, 1, n)
+        else:
+            values = np.repeat(rng.uniform(1, 500, n // 10 + 1), 10)[:n]
+        arrays.append(values.astype(np.float64))
+    return arrays
+
+
+def test_rolling_mean_matches_pandas():
+    """rolling_mean is bit-identical to Series.rolling(window).mean()"""
+    for values in random_arrays():
+        for window in (1, 3, 14, 20):
+            expected = pd.Series(values).rolling(window).mean().to_numpy()
+            np.testing.assert_array_equal(rolling_mean(values, window), expected)
+
+
+def test_ewm_mean_matches_pandas():
+    """ewm_mean is bit-identical to Series.ewm(span, adjust=False).mean() without gaps"""
+    for values in random_arrays():
+        values = values[~np.isnan(values)]
+        for span in (3, 9, 12, 26):
+            expected = pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy()
+            np.testing.assert_array_equal(ewm_mean(values, span), expected)
+
+
+def test_rolling_std_matches_pandas():
+    """rolling_std agrees with Series.rolling(window).std(), exactly 0 on flat windows"""
+    for values in random_arrays():
+        for window in (2, 5, 20):
+            actual = rolling_std(values, window)
+            expected = pd.Series(values).rolling(window).std().to_numpy()
+            np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+            scale = np.nanmax(np.abs(values), initial=1.0)
+            np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-12 * scale)
+            if len(values) >= window:
+                windows = np.lib.stride_tricks.sliding_window_view(values, window)
+                flat = (windows == windows[:, :1]).all(axis=1)
+                assert (actual[window - 1:][flat] == 0).all()
+
+
+def pandas_signals(frame, strategy):
+    """Kernel-comparable signals and tech score from the pandas path"""
+    signals = generate_technical_signals(calculate_all_indicators(frame))
+    expected = {'tech_score': strategy.calculate_tech_score(signals)}
+    for name in KERNEL_SIGNALS:
+        if name in signals:
+            expected[name] = None if signals[name] is None else bool(signals[name])
+    return expected
+
+
+def test_kernel_signals_match_pandas_path():
+    """compute_signals_for_frames gives the pandas path's signals and score"""
+    strategy = ValueMomentumStrategy()
+    frames = synthetic_frames()
+
+    for i, (frame, signals) in enumerate(zip(frames, compute_signals_for_frames(frames))):
+        assert signals == pandas_signals(frame, strategy), f"frame {i} ({len(frame)} rows)"
+
+
+def test_criteria_signals_match_pandas_path():
+    """compute_criteria_signals_for_frames gives generate_technical_signals' criteria signals"""
+    frames = synthetic_frames()
+
+    for i, (frame, signals) in enumerate(zip(frames, compute_criteria_signals_for_frames(frames))):
+        expected = generate_technical_signals(calculate_all_indicators(frame))
+        expected = {name: None if expected.get(name) is None else bool(expected[name])
+                    for name in CRITERIA_SIGNAL_NAMES}
+        assert signals == expected, f"frame {i} ({len(frame)} rows)"
+
+
+if __name__ == "__main__":
+    test_rolling_mean_matches_pandas()
+    test_ewm_mean_matches_pandas()
+    test_rolling_std_matches_pandas()
+    test_kernel_signals_match_pandas_path()
+    test_criteria_signals_match_pandas_path()
+    print("✓ Indicator kernel tests PASSED")
@@ -0,0 +1,73 @@
+"""
+Scanner Tests
+
+Checks the scanner's batch shortcuts against the per-stock code they stand
+in for, on synthetic price frames (see test_indicator_kernels).
+"""
+
+import logging
+
+import numpy as np
+
+from analysis.scanner import BatchDataLoader, ScanRow, _filter_and_rank
+from analysis.technical import calculate_all_indicators, generate_technical_signals
+from test_indicator_kernels import synthetic_frames
+
+logging.disable(logging.CRITICAL)
+
+
+def test_loader_frames_keep_signals_exact():
+    """Compacting frames in BatchDataLoader does not change any signal"""
+    frames = {f"T{i:03d}": frame for i, frame in enumerate(synthetic_frames(120))}
+    loader = BatchDataLoader()
+    loader._store_stock_data(list(frames), frames)
+
+    for ticker, frame in frames.items():
+        stored = loader.get_stock_data(ticker)
+        expected = generate_technical_signals(calculate_all_indicators(frame))
+        actual = generate_technical_signals(calculate_all_indicators(stored))
+        assert actual == expected, ticker
+
+
+def random_rows(n=150, seed=5):
+    """Scan rows with many tied tech scores, some errored or filtered"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n):
+        ticker = f"T{i:03d}"
+        kind = rng.random()
+        if kind < 0.05:
+            rows.append(ScanRow(ticker, error="No stock data available"))
+        elif kind < 0.15:
+            rows.append(ScanRow(ticker, tech_score=int(rng.integers(0, 70)), filtered=True))
+        else:
+            rows.append(ScanRow(
+                ticker, last_price=float(rng.uniform(1, 500)),
+                pe_ratio=float(rng.uniform(0, 40)), profit_margin=float(rng.uniform(-0.1, 0.3)),
+                tech_score=int(rng.choice([0, 24, 41, 53, 71, 85, 100])),
+                value_momentum_signal=str(rng.choice(['BUY', 'HOLD', 'SELL'])),
+                price_above_sma_short=bool(rng.random() < 0.5)))
+    return rows
+
+
+def test_top_k_matches_head_of_full_ranking():
+    """_filter_and_rank ranks like a stable full sort, and top_k is its head"""
+    rows = random_rows()
+    for criteria, keep in (
+        (None, lambda row: True),
+        ({'strategy': 'value_momentum'}, lambda row: row.value_momentum_signal == 'BUY'),
+        ({'pe_below': 25, 'price_above_sma': 20},
+         lambda row: row.pe_ratio is not None and row.pe_ratio < 25
+         and row.price_above_sma_short is True),
+    ):
+        ranked = _filter_and_rank(rows, criteria)
+        full_sort = sorted(filter(keep, rows), key=lambda row: -row.tech_score)
+        assert ranked == [row.to_dict() for row in full_sort]
+        for top_k in (0, 1, 5, 17, len(ranked) - 1, len(ranked), len(ranked) + 3):
+            assert _filter_and_rank(rows, criteria, top_k=top_k) == ranked[:top_k], (criteria, top_k)
+
+
+if __name__ == "__main__":
+    test_loader_frames_keep_signals_exact()
+    test_top_k_matches_head_of_full_ranking()
+    print("✓ Scanner tests PASSED")
@@ -0,0 +1,157 @@
+"""
+Technical Indicator Tests
+
+Checks analysis.technical, whose indicators take compiled paths when Numba
+is available, against the plain pandas formulas they stand in for, and the
+strategy's tech score and higher-lows helper against their straightforward
+versions.
+"""
+
+import itertools
+import logging
+
+import numpy as np
+import pandas as pd
+
+from analysis.indicator_kernels import TECH_WEIGHTS
+from analysis.strategy import ValueMomentumStrategy
+from analysis.technical import (
+    calculate_all_indicators, calculate_bollinger_bands, calculate_ema, calculate_macd,
+    calculate_rsi, calculate_sma
+)
+from config import (
+    DEFAULT_LONG_WINDOW, DEFAULT_MACD_FAST, DEFAULT_MACD_SIGNAL, DEFAULT_MACD_SLOW,
+    DEFAULT_MEDIUM_WINDOW, DEFAULT_RSI_PERIOD, DEFAULT_SHORT_WINDOW
+)
+from test_indicator_kernels import synthetic_frames
+
+logging.disable(logging.CRITICAL)
+
+
+def pandas_rsi(close, period=DEFAULT_RSI_PERIOD):
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    return 100 - (100 / (1 + gain.rolling(window=period).mean() / loss.rolling(window=period).mean()))
+
+
+def pandas_macd(close):
+    macd_line = (close.ewm(span=DEFAULT_MACD_FAST, adjust=False).mean()
+                 - close.ewm(span=DEFAULT_MACD_SLOW, adjust=False).mean())
+    signal_line = macd_line.ewm(span=DEFAULT_MACD_SIGNAL, adjust=False).mean()
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def pandas_bollinger(close, window=20, num_std=2):
+    sma = close.rolling(window=window).mean()
+    std = close.rolling(window=window).std()
+    return sma + std * num_std, sma, sma - std * num_std
+
+
+def assert_same(actual, expected, exact=True):
+    pd.testing.assert_series_equal(actual, expected, check_names=False,
+                                   check_exact=exact, rtol=1e-9)
+
+
+def test_indicator_functions_match_pandas():
+    """calculate_sma/ema/rsi/macd are exact, Bollinger bands within rounding"""
+    for frame in synthetic_frames(120):
+        close = frame['close']
+        for window in (DEFAULT_SHORT_WINDOW, DEFAULT_MEDIUM_WINDOW, DEFAULT_LONG_WINDOW):
+            assert_same(calculate_sma(frame, window), close.rolling(window=window).mean())
+            assert_same(calculate_ema(frame, window), close.ewm(span=window, adjust=False).mean())
+        assert_same(calculate_rsi(frame), pandas_rsi(close))
+
+        macd = calculate_macd(frame)
+        for column, expected in zip(('macd', 'signal', 'histogram'), pandas_macd(close)):
+            assert_same(macd[column], expected)
+
+        bands = calculate_bollinger_bands(frame)
+        for band, expected in zip(('upper', 'middle', 'lower'), pandas_bollinger(close)):
+            assert_same(bands[band], expected, exact=band == 'middle')
+
+
+def test_all_indicators_match_pandas():
+    """calculate_all_indicators' close-based series match the pandas formulas"""
+    for frame in synthetic_frames(120):
+        indicators = calculate_all_indicators(frame)
+        if len(frame) < DEFAULT_LONG_WINDOW:
+            assert indicators == {}
+            continue
+
+        close = frame['close']
+        expected = {
+            'sma_short': close.rolling(window=DEFAULT_SHORT_WINDOW).mean(),
+            'sma_medium': close.rolling(window=DEFAULT_MEDIUM_WINDOW).mean(),
+            'sma_long': close.rolling(window=DEFAULT_LONG_WINDOW).mean(),
+            'ema_short': close.ewm(span=DEFAULT_SHORT_WINDOW, adjust=False).mean(),
+            'ema_medium': close.ewm(span=DEFAULT_MEDIUM_WINDOW, adjust=False).mean(),
+            'ema_long': close.ewm(span=DEFAULT_LONG_WINDOW, adjust=False).mean(),
+            'ma4': close.rolling(window=20).mean(),
+            'ma40': close.rolling(window=200).mean(),
+            'rsi': pandas_rsi(close),
+            'bollinger_middle': close.rolling(window=20).mean(),
+        }
+        expected.update(zip(('macd', 'macd_signal', 'macd_histogram'), pandas_macd(close)))
+        for name, series in expected.items():
+            assert_same(indicators[name], series)
+
+        upper, _, lower = pandas_bollinger(close)
+        assert_same(indicators['bollinger_upper'], upper, exact=False)
+        assert_same(indicators['bollinger_lower'], lower, exact=False)
+
+
+def weighted_tech_score(tech_analysis):
+    """Tech score as a normalized weighted sum of the valid factors"""
+    score = 0
+    total_weight = 0
+    for factor, weight in TECH_WEIGHTS:
+        value = tech_analysis.get(factor)
+        if value is not None:
+            score += weight * (100 if value else 0)
+            total_weight += weight
+    return round(score / total_weight) if total_weight > 0 else 0
+
+
+def test_tech_score_table_matches_weighted_sum():
+    """calculate_tech_score agrees with the weighted sum for every factor combination"""
+    strategy = ValueMomentumStrategy()
+    missing = object()
+    for values in itertools.product((missing, None, False, True), repeat=len(TECH_WEIGHTS)):
+        tech_analysis = {factor: value for (factor, _), value in zip(TECH_WEIGHTS, values)
+                         if value is not missing}
+        assert strategy.calculate_tech_score(tech_analysis) == weighted_tech_score(tech_analysis)
+
+
+def windowed_higher_lows(data, lookback=10):
+    """Higher-lows flags computed window by window"""
+    rolling_min = data['low'].rolling(window=lookback, center=True).min()
+    higher_lows = np.zeros(len(data))
+    for i in range(lookback * 2, len(data)):
+        min_values = rolling_min.iloc[i - lookback:i].dropna()
+        if len(min_values) >= 2:
+            diffs = min_values.diff().dropna()
+            if len(diffs) > 0 and (diffs > 0).all():
+                higher_lows[i] = 1
+    return higher_lows
+
+
+def test_higher_lows_matches_windowed_version():
+    """_calculate_higher_lows flags the same bars as the per-window loop, gaps included"""
+    strategy = ValueMomentumStrategy()
+    rng = np.random.default_rng(2)
+    for k in range(60):
+        n = int(rng.integers(5, 120))
+        low = np.cumsum(rng.normal(0.2 if k % 2 else 0, 1, n)) + 100
+        low[rng.random(n) < 0.1 * (k % 3)] = np.nan
+        data = pd.DataFrame({'low': low})
+        actual = strategy._calculate_higher_lows(data).to_numpy()
+        np.testing.assert_array_equal(actual, windowed_higher_lows(data))
+
+
+if __name__ == "__main__":
+    test_indicator_functions_match_pandas()
+    test_all_indicators_match_pandas()
+    test_tech_score_table_matches_weighted_sum()
+    test_higher_lows_matches_windowed_version()
+    print("✓ Technical indicator tests PASSED")
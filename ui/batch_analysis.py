@@ -190,14 +190,12 @@ def apply_filters_and_sort(df, signal_filter, min_score, sort_by):
     if df.empty:
         return df
 
-    filtered_df = df.copy()
-
-    # Apply signal filter
+    # Apply minimum score and signal filters as one mask, selecting (and
+    # copying) only the matching rows
+    mask = df['Score'] >= min_score
     if signal_filter:
-        filtered_df = filtered_df[filtered_df['Signal'].isin(signal_filter)]
-
-    # Apply minimum score filter
-    filtered_df = filtered_df[filtered_df['Score'] >= min_score]
+        mask &= df['Signal'].isin(signal_filter)
+    filtered_df = df[mask].copy()
 
     # Apply sorting
     if sort_by == "Score":
@@ -213,8 +211,8 @@ def apply_filters_and_sort(df, signal_filter, min_score, sort_by):
         filtered_df = filtered_df.sort_values('Ticker')
     elif sort_by == "P/E":
         # Sort by P/E, putting N/A at the end
-        filtered_df['_pe_sort'] = filtered_df['P/E'].apply(
-            lambda x: 999 if x == 'N/A' else float(x))
+        filtered_df['_pe_sort'] = pd.to_numeric(
+            filtered_df['P/E'].replace('N/A', 999))
         filtered_df = filtered_df.sort_values('_pe_sort')
         filtered_df = filtered_df.drop('_pe_sort', axis=1)
 
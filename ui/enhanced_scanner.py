@@ -17,12 +17,73 @@ from analysis.technical import calculate_all_indicators, generate_technical_sign
 from data.db_integration import get_watchlist, get_all_cached_stocks, add_to_watchlist
 from helpers import get_index_constituents
 from ui.performance_overview import display_performance_metrics
+from utils.numba_compat import njit
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('enhanced_scanner')
 
 
+# Fields of the analysis dicts scored as flags (truthiness) by
+# EnhancedStockScorer, in the column order of _comprehensive_scores
+_SCORE_FLAGS = ('is_profitable', 'above_ma40', 'above_ma4', 'rsi_above_50',
+                'higher_lows', 'near_52w_high', 'breakout')
+
+
+@njit(cache=True)
+def _comprehensive_scores(tech_score, pe_ratio, revenue_growth, profit_margin,
+                          flags, earnings_increasing, quality_sources, has_error):
+    """
+    EnhancedStockScorer.calculate_comprehensive_score over arrays of stocks
+
+    Missing pe_ratio, revenue_growth and profit_margin are 0.0 (they score
+    like falsy values); flags holds the _SCORE_FLAGS columns as 0/1.
+    """
+    n = tech_score.shape[0]
+    out = np.zeros(n)
+    for i in range(n):
+        if has_error[i]:
+            continue
+
+        # Fundamental score
+        fund = 0
+        if flags[i, 0]:
+            fund += 20
+        pe = pe_ratio[i]
+        if pe != 0 and 5 <= pe <= 25:
+            fund += 20
+        elif pe != 0 and pe < 5:
+            fund += 10
+        if revenue_growth[i] != 0 and revenue_growth[i] > 0.1:
+            fund += 15
+        elif revenue_growth[i] != 0 and revenue_growth[i] > 0.05:
+            fund += 10
+        if profit_margin[i] != 0 and profit_margin[i] > 0.15:
+            fund += 15
+        elif profit_margin[i] != 0 and profit_margin[i] > 0.05:
+            fund += 10
+        if earnings_increasing[i]:
+            fund += 30
+        fund = min(100, fund)
+
+        # Momentum score
+        momentum = 25 * (flags[i, 1] + flags[i, 2] + flags[i, 3])
+        momentum += 10 * (flags[i, 4] + flags[i, 5]) + 5 * flags[i, 6]
+        momentum = min(100, momentum)
+
+        # Quality score (the P/E and revenue growth points are for present
+        # values, including zeros, so they come precomputed)
+        quality = min(100, 50 + quality_sources[i])
+
+        score = 0.0
+        score += (tech_score[i] / 100) * 40
+        score += (fund / 100) * 30
+        score += (momentum / 100) * 20
+        score += (quality / 100) * 10
+        out[i] = min(100.0, max(0.0, score))
+    return out
+
+
 class EnhancedStockScorer:
     """
     Comprehensive stock scoring system that combines multiple factors
@@ -58,6 +119,34 @@ class EnhancedStockScorer:
 
         return min(100, max(0, score))
 
+    def calculate_comprehensive_scores(self, analysis_results) -> np.ndarray:
+        """
+        calculate_comprehensive_score for many analysis results at once
+
+        The fields are packed into arrays and scored by one compiled loop.
+        """
+        n = len(analysis_results)
+
+        def _number(name, default=0):
+            return np.fromiter(
+                (r.get(name, default) or 0 for r in analysis_results), dtype=float, count=n)
+
+        flags = np.array([[1 if r.get(name, False) else 0 for name in _SCORE_FLAGS]
+                          for r in analysis_results], dtype=np.int64).reshape(n, len(_SCORE_FLAGS))
+        earnings_increasing = np.fromiter(
+            ('ökande' in r.get('earnings_trend', '').lower() for r in analysis_results),
+            dtype=bool, count=n)
+        quality_sources = np.fromiter(
+            ((20 if r.get('data_source', 'unknown') in ['yahoo', 'alphavantage'] else 0)
+             + (15 if r.get('pe_ratio') is not None else 0)
+             + (15 if r.get('revenue_growth') is not None else 0)
+             for r in analysis_results), dtype=np.int64, count=n)
+        has_error = np.fromiter(("error" in r for r in analysis_results), dtype=bool, count=n)
+
+        return _comprehensive_scores(
+            _number('tech_score'), _number('pe_ratio', None), _number('revenue_growth'),
+            _number('profit_margin'), flags, earnings_increasing, quality_sources, has_error)
+
     def _calculate_fundamental_score(self, analysis):
         """Calculate fundamental score based on financial metrics"""
         score = 0
@@ -289,7 +378,8 @@ def start_enhanced_scan(scanner, universe_file, limit_stocks, batch_size):
         results = []
         failed_analyses = []
 
-        # Process each analysis result
+        # Calculate comprehensive scores using EnhancedStockScorer, for
+        # all successful analyses in one batch
         for analysis in scan_results:
             if "error" in analysis and analysis["error"]:
                 failed_analyses.append({
@@ -297,21 +387,27 @@ def start_enhanced_scan(scanner, universe_file, limit_stocks, batch_size):
                     "error": analysis["error"],
                     "error_message": analysis.get("error_message", "Unknown error")
                 })
-                continue
+        analyzed = [a for a in scan_results if not ("error" in a and a["error"])]
+        scorer = EnhancedStockScorer(st.session_state.get('strategy'))
+        comprehensive_scores = scorer.calculate_comprehensive_scores(analyzed)
+        display_scores = np.array([round(float(score), 1) for score in comprehensive_scores])
 
-            # Calculate comprehensive score using EnhancedStockScorer
-            scorer = EnhancedStockScorer(st.session_state.get('strategy'))
-            comprehensive_score = scorer.calculate_comprehensive_score(
-                analysis)
+        # Sort by comprehensive score on the score column (ties keep scan
+        # order), so each result is built once, already ranked
+        order = np.argsort(-display_scores, kind='stable')
+
+        # Process each analysis result
+        for rank, i in enumerate(order, start=1):
+            analysis = analyzed[i]
 
             # Create enhanced result
             result = {
-                "Rank": 0,  # Will be set after sorting
+                "Rank": rank,
                 "Ticker": analysis["ticker"],
                 "Name": analysis.get("name", analysis["ticker"]),
                 # Note: different field name from bulk scanner
                 "Price": analysis.get("last_price", 0),
-                "Score": round(comprehensive_score, 1),
+                "Score": float(display_scores[i]),
                 "Tech Score": analysis.get("tech_score", 0),
                 # Note: different field name
                 "Signal": analysis.get("value_momentum_signal", "HOLD"),
@@ -327,11 +423,6 @@ def start_enhanced_scan(scanner, universe_file, limit_stocks, batch_size):
 
             results.append(result)
 
-        # Sort by comprehensive score and assign ranks
-        results.sort(key=lambda x: x["Score"], reverse=True)
-        for i, result in enumerate(results):
-            result["Rank"] = i + 1
-
         # Store failed analyses
         st.session_state.failed_analyses = failed_analyses
 
@@ -9,6 +9,10 @@ from config import SCANNER_CRITERIA
 from data.db_integration import add_to_watchlist
 import time
 
+# Boolean fields of the scanner's result dicts
+RESULT_FLAG_COLUMNS = ['above_ma40', 'above_ma4', 'rsi_above_50', 'near_52w_high',
+                       'is_profitable', 'reasonable_pe', 'fundamental_pass']
+
 
 def render_scanner_results_with_icons(results):
     """
@@ -349,6 +353,12 @@ def display_scanner():
             # Convert results to DataFrame for traditional view
             results_df = pd.DataFrame(results)
 
+            # Flags as nullable boolean columns (one byte per value plus a
+            # mask) rather than object columns of Python bools; missing
+            # flags, e.g. on error rows, become <NA>
+            flag_columns = [col for col in RESULT_FLAG_COLUMNS if col in results_df]
+            results_df = results_df.astype({col: 'boolean' for col in flag_columns})
+
             # Format columns for display
             display_df = results_df.copy()
 
@@ -387,13 +397,10 @@ def display_scanner():
                     )
 
                 # Format boolean columns with symbols for better readability
-                boolean_columns = ['above_ma40', 'above_ma4', 'rsi_above_50',
-                                   'near_52w_high', 'is_profitable', 'reasonable_pe', 'fundamental_pass']
-                for col in boolean_columns:
-                    if col in display_df:
-                        display_df[col] = display_df[col].apply(
-                            lambda x: "✓" if x is True else "✗" if x is False else "—"
-                        )
+                for col in flag_columns:
+                    flags = display_df[col]
+                    display_df[col] = np.where(
+                        flags.isna(), "—", np.where(flags.fillna(False), "✓", "✗"))
 
                 # Format the Value & Momentum Signal with color highlighting
                 if 'value_momentum_signal' in display_df:
@@ -159,8 +159,9 @@ def display_single_stock_analysis():
                     st.info(f"{ticker} is already in your watchlist")
 
         # Get current price and change
-        current_price = stock_data['close'].iloc[-1]
-        prev_close = stock_data['close'].iloc[-2] if len(stock_data) > 1 else None
+        close_prices = stock_data['close'].to_numpy()
+        current_price = close_prices[-1]
+        prev_close = close_prices[-2] if len(close_prices) > 1 else None
 
         if prev_close:
             price_change = current_price - prev_close
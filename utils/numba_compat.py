@@ -0,0 +1,26 @@
+# utils/numba_compat.py
+"""
+Optional Numba support.
+
+Numba is not a hard requirement of the app. Import njit/prange from here:
+when Numba is installed they compile as usual, otherwise njit is a no-op
+decorator and prange is range. Callers check NUMBA_AVAILABLE to decide
+whether a compiled kernel is worth using over their pandas code path.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit, with or without arguments"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator